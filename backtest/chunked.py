@@ -0,0 +1,129 @@
+"""
+Out-of-core backtests.
+
+Bars are read in fixed-size blocks (CSV via pandas' chunked reader, or
+raw binary records via np.memmap). Signals come from
+engine.chunked.ChunkedEvaluator, and the open position plus partial
+metrics are carried from one block to the next, so peak memory is
+bounded by the chunk size. Trades and metrics equal run_backtest on the
+full series.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+from engine.chunked import ChunkedEvaluator
+from backtest.simulator import trade_indices
+
+
+def iter_csv_chunks(path: str, chunksize: int = 1_000_000, **read_csv_kwargs) -> Iterator[pd.DataFrame]:
+    """Yield DataFrames of at most `chunksize` rows from a CSV file."""
+
+    with pd.read_csv(path, chunksize=chunksize, **read_csv_kwargs) as reader:
+        for chunk in reader:
+            yield chunk
+
+
+def iter_binary_chunks(path: str,
+                       fields: Sequence[str],
+                       chunksize: int = 1_000_000,
+                       dtype: str = "<f8") -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Yield column dicts from a raw binary file of fixed-size records,
+    one `dtype` value per field in `fields` order.
+    """
+
+    records = np.memmap(path, dtype=[(name, dtype) for name in fields], mode="r")
+
+    for start in range(0, len(records), chunksize):
+        block = records[start:start + chunksize]
+        yield {name: np.array(block[name]) for name in fields}
+
+
+def run_chunked_backtest(strategy, chunks: Iterable[Mapping[str, Any]],
+                         exact: bool = True) -> Tuple[List[Dict], Dict]:
+    """
+    Backtest a StrategyNode over an iterable of bar chunks (DataFrames or
+    column mappings with a 'close' column). Returns (trades, metrics)
+    like run_backtest, with indices counted from the first bar. `exact`
+    is passed to ChunkedEvaluator.
+    """
+
+    evaluator = ChunkedEvaluator(strategy, exact=exact)
+
+    trades: List[Dict] = []
+    total_pnl = 0.0
+    wins = 0
+    losses = 0
+
+    offset = 0
+    position_open = False
+    entry_idx = None
+    entry_price = None
+    last_close = None
+
+    for chunk in chunks:
+
+        close = np.asarray(chunk["close"])
+        n = len(close)
+        if n == 0:
+            continue
+
+        signals = evaluator.evaluate(chunk)
+        opened, closed = trade_indices(signals["entry"], signals["exit"], initial=position_open)
+
+        entry_bars = [entry_idx] if position_open else []
+        entry_prices = [entry_price] if position_open else []
+        entry_bars = np.concatenate((entry_bars, opened + offset)).astype(np.int64)
+        entry_prices = np.concatenate((entry_prices, close[opened]))
+
+        # Still long at the end of this chunk: carry the last entry forward
+        position_open = len(entry_bars) > len(closed)
+        if position_open:
+            entry_idx, entry_price = int(entry_bars[-1]), entry_prices[-1]
+            entry_bars, entry_prices = entry_bars[:-1], entry_prices[:-1]
+
+        exit_prices = close[closed]
+        pnl = (exit_prices - entry_prices).astype(float)
+
+        for e, x, ep, xp, p in zip(entry_bars.tolist(), (closed + offset).tolist(),
+                                   entry_prices.tolist(), exit_prices.tolist(), pnl.tolist()):
+            trades.append({
+                "entry_index": e,
+                "exit_index": x,
+                "entry_price": float(ep),
+                "exit_price": float(xp),
+                "pnl": p,
+            })
+
+        # Running sum stays left to right, as in run_backtest
+        total_pnl = float(np.cumsum(np.concatenate(([total_pnl], pnl)))[-1])
+        wins += int(np.count_nonzero(pnl > 0))
+        losses += int(np.count_nonzero(pnl <= 0))
+
+        offset += n
+        last_close = close[-1]
+
+    # At the end of the data, if still in a trade, then exit on last bar
+    if position_open:
+        pnl = float(last_close - entry_price)
+        trades.append({
+            "entry_index": entry_idx,
+            "exit_index": offset - 1,
+            "entry_price": float(entry_price),
+            "exit_price": float(last_close),
+            "pnl": pnl,
+        })
+        total_pnl = float(np.cumsum([total_pnl, pnl])[-1])
+        wins += pnl > 0
+        losses += pnl <= 0
+
+    metrics = {
+        "total_pnl": float(total_pnl),
+        "num_trades": len(trades),
+        "wins": int(wins),
+        "losses": int(losses),
+    }
+
+    return trades, metrics
@@ -0,0 +1,173 @@
+"""
+Vectorized performance metrics from a columnar trade log.
+
+    trades, _ = run_backtest(df, entry, exit, columnar=True)
+    report = performance_metrics(df["close"], trades)
+
+Every function works on whole arrays (the TRADE_DTYPE table from
+backtest.simulator, or a DataFrame with the same columns); nothing loops
+over trades in Python.
+
+The strategy holds one unit while long, so the equity curve is in price
+units: realized pnl of closed trades plus the open trade marked to the
+close. A trade is held on the bars after its entry bar up to and
+including its exit bar. Returns are that pnl per bar divided by
+`capital` (default: the first finite close, i.e. the cost of one unit).
+
+A NaN close has no price: positions are marked at the last finite close
+instead, so the curve is flat across a gap and the move over it lands on
+the next finite bar (bars before the first finite close add nothing).
+Trades with a NaN pnl (priced on a NaN close) are left out of win_rate.
+"""
+
+from typing import Any, Dict, Optional
+import numpy as np
+
+
+def _column(trades, name: str) -> np.ndarray:
+    """One field of a trade table or DataFrame as an array."""
+
+    return np.asarray(trades[name])
+
+
+def _last_finite(close: np.ndarray) -> np.ndarray:
+    """Each non-finite close replaced by the last finite one before it (leading ones stay NaN)."""
+
+    positions = np.where(np.isfinite(close), np.arange(len(close)), -1)
+    last = np.maximum.accumulate(positions) if len(close) else positions
+
+    return np.where(last >= 0, close[np.maximum(last, 0)], np.nan)
+
+
+def holdings(trades, n_bars: int) -> np.ndarray:
+    """
+    Bool array: long at the close of each bar. True from a trade's entry
+    bar up to the bar before its exit (the exit bar closes it).
+    """
+
+    entries = _column(trades, "entry_index")
+    exits = _column(trades, "exit_index")
+
+    steps = np.zeros(n_bars + 1, dtype=np.int64)
+    np.add.at(steps, entries, 1)
+    np.add.at(steps, exits, -1)
+
+    return np.cumsum(steps[:-1]) > 0
+
+
+def equity_curve(close, trades) -> np.ndarray:
+    """Cumulative pnl after each bar, open trades marked to market."""
+
+    close = _last_finite(np.asarray(close, dtype=float))
+    held = holdings(trades, len(close))
+
+    # Price change of each bar earned by the position held into it
+    moves = np.diff(close)
+    changes = np.zeros(len(close))
+    changes[1:] = np.where(held[:-1] & np.isfinite(moves), moves, 0.0)
+
+    return np.cumsum(changes)
+
+
+def drawdown(equity: np.ndarray) -> np.ndarray:
+    """Distance below the running peak of the equity curve (<= 0)."""
+
+    equity = np.asarray(equity, dtype=float)
+    peak = np.maximum.accumulate(np.maximum(equity, 0.0)) if len(equity) else equity
+
+    return equity - peak
+
+
+def max_drawdown(equity: np.ndarray) -> float:
+    """Largest peak-to-trough fall of the equity curve, as a positive amount."""
+
+    dd = drawdown(equity)
+
+    return float(-dd.min()) if len(dd) else 0.0
+
+
+def bar_returns(equity: np.ndarray, capital: float) -> np.ndarray:
+    """Per-bar pnl as a fraction of `capital`."""
+
+    equity = np.asarray(equity, dtype=float)
+
+    return np.diff(equity, prepend=0.0) / capital
+
+
+def sharpe_ratio(returns: np.ndarray, periods_per_year: int = 252, risk_free: float = 0.0) -> float:
+    """Annualized mean excess return over its standard deviation (NaN if flat)."""
+
+    excess = np.asarray(returns, dtype=float) - risk_free / periods_per_year
+    std = excess.std() if len(excess) else 0.0
+
+    if std == 0:
+        return float("nan")
+
+    return float(excess.mean() / std * np.sqrt(periods_per_year))
+
+
+def sortino_ratio(returns: np.ndarray, periods_per_year: int = 252, risk_free: float = 0.0) -> float:
+    """Like sharpe_ratio, over the downside deviation (NaN without losing bars)."""
+
+    excess = np.asarray(returns, dtype=float) - risk_free / periods_per_year
+    downside = np.sqrt(np.mean(np.minimum(excess, 0.0) ** 2)) if len(excess) else 0.0
+
+    if downside == 0:
+        return float("nan")
+
+    return float(excess.mean() / downside * np.sqrt(periods_per_year))
+
+
+def exposure(trades, n_bars: int) -> float:
+    """Fraction of bars with a position open at the close."""
+
+    if n_bars == 0:
+        return 0.0
+
+    return float(np.count_nonzero(holdings(trades, n_bars)) / n_bars)
+
+
+def average_holding_period(trades) -> float:
+    """Mean bars from entry to exit (NaN without trades)."""
+
+    bars = _column(trades, "exit_index") - _column(trades, "entry_index")
+
+    return float(bars.mean()) if len(bars) else float("nan")
+
+
+def win_rate(trades) -> float:
+    """Share of trades with positive pnl, among those with a known pnl (NaN without any)."""
+
+    pnl = _column(trades, "pnl")
+    pnl = pnl[~np.isnan(pnl)]
+
+    return float(np.count_nonzero(pnl > 0) / len(pnl)) if len(pnl) else float("nan")
+
+
+def performance_metrics(close, trades,
+                        capital: Optional[float] = None,
+                        periods_per_year: int = 252,
+                        risk_free: float = 0.0) -> Dict[str, Any]:
+    """All of the above for one backtest, as a flat dict."""
+
+    close = np.asarray(close, dtype=float)
+    n = len(close)
+
+    equity = equity_curve(close, trades)
+
+    if capital is None:
+        finite = close[np.isfinite(close)]
+        capital = float(finite[0]) if len(finite) else 1.0
+
+    returns = bar_returns(equity, capital)
+
+    return {
+        "final_equity": float(equity[-1]) if n else 0.0,
+        "max_drawdown": max_drawdown(equity),
+        "sharpe": sharpe_ratio(returns, periods_per_year, risk_free),
+        "sortino": sortino_ratio(returns, periods_per_year, risk_free),
+        "exposure": exposure(trades, n),
+        "avg_holding_period": average_holding_period(trades),
+        "win_rate": win_rate(trades),
+        "num_trades": int(len(_column(trades, "pnl"))),
+    }
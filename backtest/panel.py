@@ -0,0 +1,157 @@
+"""
+Panel backtests: one strategy over many symbols in a single call.
+
+A panel is a wide DataFrame indexed by time whose columns are a
+(field, symbol) MultiIndex. `panel["close"]` is then a time x symbol
+frame, so a generated `evaluate_strategy` runs on every symbol at once
+without any change to the generated code.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+from backtest.simulator import long_positions
+
+
+def to_panel(data: Any,
+             symbols: Optional[Sequence[str]] = None,
+             index: Optional[Sequence] = None) -> pd.DataFrame:
+    """
+    Build a wide (field, symbol) panel from:
+        - a mapping field -> 2-D array shaped (symbol x time)
+        - a long DataFrame with a (symbol, time) row MultiIndex
+        - an already wide DataFrame (returned unchanged)
+    """
+
+    if isinstance(data, pd.DataFrame):
+
+        if isinstance(data.columns, pd.MultiIndex):
+            return data
+
+        if isinstance(data.index, pd.MultiIndex):
+            return data.unstack(level=0)
+
+        raise ValueError("DataFrame panels need a (symbol, time) index or (field, symbol) columns")
+
+    frames = {}
+
+    for field, values in data.items():
+
+        values = np.asarray(values)
+
+        if values.ndim != 2:
+            raise ValueError(f"Field {field!r} must be a 2-D (symbol x time) array")
+
+        names = list(symbols) if symbols is not None else list(range(values.shape[0]))
+        frames[field] = pd.DataFrame(values.T, columns=names, index=index)
+
+    return pd.concat(frames, axis=1)
+
+
+def _signal_matrix(signal, symbols, n_bars) -> np.ndarray:
+    """Signal (DataFrame per symbol, or one Series for all) → (symbol x time) bools."""
+
+    if isinstance(signal, pd.DataFrame):
+        signal = signal.reindex(columns=symbols).fillna(False)
+        return signal.to_numpy(dtype=bool).T
+
+    values = np.asarray(signal, dtype=bool)
+
+    if values.ndim == 1:
+        return np.broadcast_to(values, (len(symbols), n_bars))
+
+    return values
+
+
+def run_panel_backtest(panel: pd.DataFrame,
+                       entry_signal,
+                       exit_signal) -> Dict[Any, Tuple[List[Dict], Dict]]:
+    """
+    Backtest every symbol of a panel at once.
+
+    Returns {symbol: (trades, metrics)} with the same per-symbol output
+    as `run_backtest` on that symbol's own frame.
+    """
+
+    close_frame = panel["close"]
+    symbols = list(close_frame.columns)
+    close = close_frame.to_numpy().T
+    n_symbols, n_bars = close.shape
+
+    results: Dict[Any, Tuple[List[Dict], Dict]] = {}
+
+    if n_bars == 0:
+        for sym in symbols:
+            results[sym] = ([], _metrics(0.0, 0, 0, 0))
+        return results
+
+    entry = _signal_matrix(entry_signal, symbols, n_bars)
+    exit = _signal_matrix(exit_signal, symbols, n_bars)
+
+    position = long_positions(entry, exit)
+    before = np.zeros_like(position)
+    before[:, 1:] = position[:, :-1]
+
+    open_sym, open_bar = np.nonzero(position & ~before)
+    close_sym, close_bar = np.nonzero(before & ~position)
+
+    # Positions still open at the end exit on the last bar
+    still_open = np.flatnonzero(position[:, -1])
+    close_sym = np.concatenate((close_sym, still_open))
+    close_bar = np.concatenate((close_bar, np.full(len(still_open), n_bars - 1)))
+
+    order = np.lexsort((close_bar, close_sym))
+    close_sym, close_bar = close_sym[order], close_bar[order]
+
+    entry_prices = close[open_sym, open_bar]
+    exit_prices = close[close_sym, close_bar]
+    pnl = (exit_prices - entry_prices).astype(float)
+
+    # bincount accumulates in trade order, so totals match per-symbol sums
+    total = np.bincount(open_sym, weights=pnl, minlength=n_symbols)
+    counts = np.bincount(open_sym, minlength=n_symbols)
+    wins = np.bincount(open_sym, weights=pnl > 0, minlength=n_symbols).astype(int)
+    losses = np.bincount(open_sym, weights=pnl <= 0, minlength=n_symbols).astype(int)
+
+    bounds = np.concatenate(([0], np.cumsum(counts)))
+
+    rows = zip(open_bar.tolist(), close_bar.tolist(),
+               entry_prices.tolist(), exit_prices.tolist(), pnl.tolist())
+    trades = [
+        {
+            "entry_index": e,
+            "exit_index": x,
+            "entry_price": float(ep),
+            "exit_price": float(xp),
+            "pnl": p,
+        }
+        for e, x, ep, xp, p in rows
+    ]
+
+    for k, sym in enumerate(symbols):
+        results[sym] = (
+            trades[bounds[k]:bounds[k + 1]],
+            _metrics(total[k], counts[k], wins[k], losses[k]),
+        )
+
+    return results
+
+
+def _metrics(total_pnl, num_trades, wins, losses) -> Dict:
+
+    return {
+        "total_pnl": float(total_pnl),
+        "num_trades": int(num_trades),
+        "wins": int(wins),
+        "losses": int(losses),
+    }
+
+
+def run_panel(evaluate, data: Any, **panel_kwargs) -> Dict[Any, Tuple[List[Dict], Dict]]:
+    """Evaluate a generated `evaluate_strategy` once over the whole panel and backtest it."""
+
+    panel = to_panel(data, **panel_kwargs)
+    signals = evaluate(panel)
+
+    return run_panel_backtest(panel, signals["entry"], signals["exit"])
@@ -1,10 +1,23 @@
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Union
+import numpy as np
 import pandas as pd
 
 
+# Columnar trade log: one record per trade, same fields as the trade dicts
+TRADE_DTYPE = np.dtype([
+    ("entry_index", np.int64),
+    ("exit_index", np.int64),
+    ("entry_price", np.float64),
+    ("exit_price", np.float64),
+    ("pnl", np.float64),
+])
+
+
 def run_backtest(df: pd.DataFrame,
                  entry_signal: pd.Series,
-                 exit_signal: pd.Series) -> Tuple[List[Dict], Dict]:
+                 exit_signal: pd.Series,
+                 mode: str = "vectorized",
+                 columnar: bool = False) -> Tuple[Union[List[Dict], np.ndarray], Dict]:
     """
     Parameters:
     df : pandas.DataFrame
@@ -13,10 +26,16 @@ def run_backtest(df: pd.DataFrame,
         True when we should open a long position.
     exit_signal : pandas.Series(bool)
         True when we should close the position.
+    mode : str
+        "vectorized" (default) works on NumPy buffers,
+        "loop" is the bar-by-bar reference implementation.
+    columnar : bool
+        Return the trades as a TRADE_DTYPE structured array instead of
+        a list of dicts (pd.DataFrame(trades) gives a frame).
 
     Returns:
     -------
-    trades : list of dicts
+    trades : list of dicts (or TRADE_DTYPE array)
         One entry per trade with:
             entry_index
             exit_index
@@ -31,6 +50,39 @@ def run_backtest(df: pd.DataFrame,
             losses
     """
 
+    if mode == "vectorized":
+        table, metrics = _run_backtest_vectorized(df, entry_signal, exit_signal)
+        return (table if columnar else trade_records(table)), metrics
+
+    if mode == "loop":
+        trades, metrics = _run_backtest_loop(df, entry_signal, exit_signal)
+        return (trade_table(trades) if columnar else trades), metrics
+
+    raise ValueError(f"Unknown backtest mode {mode!r}")
+
+
+def trade_table(trades: List[Dict]) -> np.ndarray:
+    """TRADE_DTYPE array from a list of trade dicts."""
+
+    table = np.empty(len(trades), dtype=TRADE_DTYPE)
+
+    for name in TRADE_DTYPE.names:
+        table[name] = [t[name] for t in trades]
+
+    return table
+
+
+def trade_records(table: np.ndarray) -> List[Dict]:
+    """List of trade dicts (plain Python scalars) from a TRADE_DTYPE array."""
+
+    columns = [table[name].tolist() for name in TRADE_DTYPE.names]
+
+    return [dict(zip(TRADE_DTYPE.names, row)) for row in zip(*columns)]
+
+
+def _run_backtest_loop(df, entry_signal, exit_signal):
+    """Reference engine: walks every bar in Python."""
+
     trades = []
     position_open = False
 
@@ -49,7 +101,7 @@ def run_backtest(df: pd.DataFrame,
 
         #EXIT LOGIC
         elif position_open and exit_signal.iloc[i]:
-            
+
             exit_price = df["close"].iloc[i]
             pnl = exit_price - entry_price
 
@@ -66,7 +118,7 @@ def run_backtest(df: pd.DataFrame,
             entry_idx = None
             entry_price = None
 
-  
+
     # At the end of the data, if still in a trade, then exit on last bar
 
     if position_open:
@@ -96,3 +148,87 @@ def run_backtest(df: pd.DataFrame,
     }
 
     return trades, metrics
+
+
+def long_positions(entry: np.ndarray, exit: np.ndarray, initial=False) -> np.ndarray:
+    """
+    Long/flat state after each bar, computed along the last axis.
+
+    Flat + entry opens, long + exit closes. A bar with both signals
+    toggles the state, so the state after a bar is the last bar that
+    had only one signal (or `initial`) XOR the parity of the
+    "both" bars seen since then.
+    """
+
+    entry = np.asarray(entry, dtype=bool)
+    exit = np.asarray(exit, dtype=bool)
+
+    both = entry & exit
+    sets = entry ^ exit
+
+    n = entry.shape[-1]
+    steps = np.arange(n)
+
+    # Index of the last single-signal bar at or before each bar (-1 = none)
+    last_set = np.maximum.accumulate(np.where(sets, steps, -1), axis=-1)
+
+    toggles = np.cumsum(both, axis=-1)
+    toggles_at_set = np.take_along_axis(toggles, np.maximum(last_set, 0), axis=-1)
+    toggles_since = np.where(last_set >= 0, toggles - toggles_at_set, toggles)
+
+    base = np.take_along_axis(entry, np.maximum(last_set, 0), axis=-1)
+    base = np.where(last_set >= 0, base, np.asarray(initial, dtype=bool)[..., None])
+
+    return base ^ (toggles_since % 2 == 1)
+
+
+def trade_indices(entry: np.ndarray, exit: np.ndarray, initial=False):
+    """Return (entry_bars, exit_bars) where the long state flips, for 1-D signals."""
+
+    position = long_positions(entry, exit, initial)
+    before = np.concatenate(([bool(initial)], position[:-1]))
+
+    opened = np.flatnonzero(position & ~before)
+    closed = np.flatnonzero(before & ~position)
+
+    return opened, closed
+
+
+def _run_backtest_vectorized(df, entry_signal, exit_signal):
+    """NumPy engine: same trades and metrics as the loop engine."""
+
+    close = np.asarray(df["close"])
+    n = len(close)
+
+    if n == 0:
+        return np.empty(0, dtype=TRADE_DTYPE), _summarize(np.empty(0))
+
+    opened, closed = trade_indices(np.asarray(entry_signal), np.asarray(exit_signal))
+
+    # At the end of the data, if still in a trade, then exit on last bar
+    if len(opened) > len(closed):
+        closed = np.append(closed, n - 1)
+
+    table = np.empty(len(opened), dtype=TRADE_DTYPE)
+    table["entry_index"] = opened
+    table["exit_index"] = closed
+    table["entry_price"] = close[opened]
+    table["exit_price"] = close[closed]
+    table["pnl"] = close[closed] - close[opened]
+
+    return table, _summarize(table["pnl"])
+
+
+def _summarize(pnl: np.ndarray) -> Dict:
+    """Metrics dict from an array of per-trade pnl."""
+
+    # cumsum adds left to right, matching the loop engine's sum() bit for bit
+    total_pnl = np.cumsum(pnl)[-1] if len(pnl) else 0.0
+    wins = int(np.count_nonzero(pnl > 0))
+
+    return {
+        "total_pnl": float(total_pnl),
+        "num_trades": int(len(pnl)),
+        "wins": wins,
+        "losses": int(np.count_nonzero(pnl <= 0)),
+    }
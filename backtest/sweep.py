@@ -0,0 +1,140 @@
+"""
+Parameter sweeps over a DSL strategy template.
+
+The template is DSL text with str.format placeholders, e.g.
+
+    ENTRY:
+    close > SMA(close, {fast})
+    EXIT:
+    RSI(close, {rsi_period}) < 30
+
+Every grid point is parsed once (cheap) and evaluated through one
+shared interpreter cache, so each distinct indicator call is computed
+once for the whole grid. Different periods share no work: indicator
+cost is linear in the number of distinct periods (one rolling mean per
+SMA period), except that RSIs of every period are computed together
+from the same up/down moves. Each point is then backtested with the
+vectorized engine, so its metrics equal those of running the generated
+evaluator at that point.
+"""
+
+import itertools
+from typing import Any, Dict, Iterable, List, Mapping
+import pandas as pd
+
+from engine import kernels
+from engine.interpreter import Interpreter
+from parser.parser import parse_strategy_text
+from parser.ast_nodes import (
+    CompareNode,
+    LogicalOpNode,
+    CrossNode,
+    IndicatorCallNode,
+    NumberNode,
+    node_key,
+)
+from backtest.simulator import run_backtest
+
+
+def expand_grid(grid: Mapping[str, Iterable]) -> List[Dict[str, Any]]:
+    """Cartesian product of parameter ranges as a list of dicts."""
+
+    names = list(grid)
+    values = [list(grid[name]) for name in names]
+
+    return [dict(zip(names, combo)) for combo in itertools.product(*values)]
+
+
+def _walk(node):
+    """Yield every node of an expression tree."""
+
+    yield node
+
+    if isinstance(node, (CompareNode, LogicalOpNode, CrossNode)):
+        yield from _walk(node.left)
+        yield from _walk(node.right)
+
+    elif isinstance(node, IndicatorCallNode):
+        for arg in node.args:
+            yield from _walk(arg)
+
+
+def _strategy_rules(strategy):
+
+    rules = []
+    if strategy.entry:
+        rules.extend(strategy.entry.rules)
+    if strategy.exit:
+        rules.extend(strategy.exit.rules)
+    return rules
+
+
+def _precompute_rsi(strategies, interpreter: Interpreter) -> None:
+    """Fill the interpreter cache with every RSI call of the grid, one pass per input series."""
+
+    # series key -> {period: call node}
+    groups: Dict[Any, Dict[int, IndicatorCallNode]] = {}
+
+    for strategy in strategies:
+        for rule in _strategy_rules(strategy):
+            for node in _walk(rule):
+
+                if not isinstance(node, IndicatorCallNode):
+                    continue
+
+                if node.name.upper() != "RSI" or len(node.args) != 2:
+                    continue
+
+                series, period = node.args
+                if not isinstance(period, NumberNode):
+                    continue
+
+                group = groups.setdefault(node_key(series), {})
+                group[int(period.value)] = node
+
+    for calls in groups.values():
+
+        series = interpreter.value(next(iter(calls.values())).args[0])
+        results = kernels.rsi_family(series, calls.keys())
+
+        for period, call in calls.items():
+            interpreter.cache[node_key(call)] = results[period]
+
+
+def run_sweep(template: str,
+              grid: Mapping[str, Iterable],
+              df: pd.DataFrame,
+              indicators=None) -> pd.DataFrame:
+    """
+    Backtest every parameter set of `grid` applied to `template`.
+    With `indicators` (an IndicatorCache), indicator values are read
+    through it instead of the in-run RSI precomputation.
+
+    Returns one row per parameter set: the parameters followed by the
+    run_backtest metrics (total_pnl, num_trades, wins, losses).
+    """
+
+    points = expand_grid(grid)
+
+    parsed: Dict[str, Any] = {}
+    strategies = []
+
+    for params in points:
+        text = template.format(**params)
+        if text not in parsed:
+            parsed[text] = parse_strategy_text(text)
+        strategies.append(parsed[text])
+
+    interpreter = Interpreter(df, indicators=indicators)
+    if indicators is None:
+        _precompute_rsi(parsed.values(), interpreter)
+
+    rows = []
+
+    for params, strategy in zip(points, strategies):
+
+        signals = interpreter.signals(strategy)
+        _, metrics = run_backtest(df, signals["entry"], signals["exit"])
+        rows.append({**params, **metrics})
+
+    return pd.DataFrame(rows, columns=list(grid) + ["total_pnl", "num_trades", "wins", "losses"])
@@ -0,0 +1,171 @@
+"""
+Walk-forward analysis over shared memory.
+
+    table = run_walk_forward(strategy, df, train_bars=750, test_bars=250)
+
+Bars are split into overlapping windows (train followed by test,
+advanced by `step`). Each window is evaluated once with the strategy's
+generated evaluator, so the test bars' indicators are warmed up by the
+train bars, then the train and test bars are backtested separately
+with run_backtest. The result is one row per window with train_* and
+test_* metrics (run_backtest's plus backtest.metrics.performance_metrics).
+
+The columns are copied once into multiprocessing.shared_memory blocks.
+Workers attach to them at start-up and slice zero-copy views per window,
+so a task is just four integers instead of a pickled DataFrame slice.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+from backtest.metrics import performance_metrics
+from backtest.simulator import run_backtest
+from codegen.cache import EvaluatorCache
+from engine.chunked import referenced_columns
+from store.shared_columns import SharedColumns, attach_columns
+
+
+# (train_start, train_end, test_start, test_end), ends exclusive
+Window = Tuple[int, int, int, int]
+
+# Below this many windows per worker a pool costs more than it saves
+_MIN_PER_WORKER = 4
+
+
+def walk_forward_windows(n_bars: int, train_bars: int, test_bars: int,
+                         step: Optional[int] = None, anchored: bool = False) -> List[Window]:
+    """
+    Consecutive train/test windows over `n_bars`. `step` defaults to
+    `test_bars` (back-to-back test periods); anchored=True grows the
+    train period from bar 0 instead of rolling it.
+    """
+
+    if train_bars <= 0 or test_bars <= 0:
+        raise ValueError("train_bars and test_bars must be positive")
+
+    step = step or test_bars
+    windows = []
+
+    start = 0
+    while start + train_bars + test_bars <= n_bars:
+        train_start = 0 if anchored else start
+        test_start = start + train_bars
+        windows.append((train_start, test_start, test_start, test_start + test_bars))
+        start += step
+
+    return windows
+
+
+def run_walk_forward(strategy,
+                     data: Mapping[str, Any],
+                     train_bars: int,
+                     test_bars: int,
+                     step: Optional[int] = None,
+                     anchored: bool = False,
+                     workers: Optional[int] = None,
+                     periods_per_year: int = 252) -> pd.DataFrame:
+    """
+    Walk-forward backtest of a StrategyNode over a DataFrame or column
+    mapping (e.g. BarStore.load). `workers` caps the process pool
+    (default: CPU count; 1 runs in this process).
+    """
+
+    names = sorted(referenced_columns(strategy) | {"close"})
+    columns = {name: np.ascontiguousarray(data[name]) for name in names}
+    n_bars = len(columns["close"])
+
+    windows = walk_forward_windows(n_bars, train_bars, test_bars, step, anchored)
+
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, max(len(windows) // _MIN_PER_WORKER, 1))
+
+    if workers <= 1:
+        runner = _WindowRunner(strategy, columns, periods_per_year)
+        rows = [runner(window) for window in windows]
+    else:
+        rows = _run_shared(strategy, columns, windows, workers, periods_per_year)
+
+    table = pd.DataFrame(rows)
+    table.index.name = "window"
+
+    return table
+
+
+def _run_shared(strategy, columns, windows, workers, periods_per_year) -> List[Dict]:
+    """Run the windows in a pool whose workers attach to shared copies of `columns`."""
+
+    chunksize = max(len(windows) // (workers * 4), 1)
+
+    with SharedColumns(columns) as shared:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_worker,
+                                 initargs=(strategy, shared.layout, periods_per_year)) as pool:
+            return list(pool.map(_run_window, windows, chunksize=chunksize))
+
+
+class _WindowRunner:
+    """Evaluates and backtests windows of one strategy over one set of columns."""
+
+    def __init__(self, strategy, columns: Mapping[str, np.ndarray], periods_per_year: int):
+        self.evaluate = EvaluatorCache(maxsize=1).get(strategy)
+        self.columns = columns
+        self.periods_per_year = periods_per_year
+
+
+    def __call__(self, window: Window) -> Dict[str, Any]:
+
+        train_start, train_end, test_start, test_end = window
+
+        frame = pd.DataFrame({name: values[train_start:test_end] for name, values in self.columns.items()},
+                             copy=False)
+        signals = self.evaluate(frame)
+
+        entry = np.asarray(signals["entry"], dtype=bool)
+        exit = np.asarray(signals["exit"], dtype=bool)
+        close = frame["close"].to_numpy()
+
+        row = {
+            "train_start": train_start,
+            "train_end": train_end,
+            "test_start": test_start,
+            "test_end": test_end,
+        }
+
+        for prefix, start, end in (("train", train_start, train_end), ("test", test_start, test_end)):
+            segment = slice(start - train_start, end - train_start)
+            metrics = self.segment_metrics(close[segment], entry[segment], exit[segment])
+            row.update({f"{prefix}_{k}": v for k, v in metrics.items()})
+
+        return row
+
+
+    def segment_metrics(self, close, entry, exit) -> Dict[str, Any]:
+
+        trades, metrics = run_backtest({"close": close}, entry, exit, columnar=True)
+        extra = performance_metrics(close, trades, periods_per_year=self.periods_per_year)
+
+        # num_trades is in both
+        extra.pop("num_trades")
+
+        return {**metrics, **extra}
+
+
+# -- pool workers -----------------------------------------------------------
+
+# Set once per worker process by _attach_worker: (runner, shared blocks)
+_WORKER: Optional[Tuple[_WindowRunner, list]] = None
+
+
+def _attach_worker(strategy, layout, periods_per_year) -> None:
+
+    global _WORKER
+
+    blocks, columns = attach_columns(layout)
+    _WORKER = (_WindowRunner(strategy, columns, periods_per_year), blocks)
+
+
+def _run_window(window: Window) -> Dict[str, Any]:
+
+    return _WORKER[0](window)
@@ -0,0 +1,94 @@
+"""
+Benchmark: generate-and-exec evaluators vs the direct AST interpreter.
+
+    python -m benchmarks.bench_interpreter [n_bars] [repeats]
+
+"one-off" times DSL text → signals for a strategy seen for the first
+time (parse + generate + exec + evaluate vs parse + interpret).
+"repeated" times evaluating an already prepared strategy again.
+"""
+
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+from parser.parser import parse_strategy_text
+from codegen.generator import generate_python
+from engine.interpreter import evaluate_strategy_ast, load_interpreter
+
+
+STRATEGY = """
+ENTRY:
+CROSS(close, "ABOVE", SMA(close,20)) AND volume > 1000000
+close > SMA(close,50) AND RSI(close,14) < 40
+EXIT:
+CROSS(close, "BELOW", SMA(close,20))
+RSI(close,14) > 70
+"""
+
+
+def make_data(n_bars: int) -> pd.DataFrame:
+
+    rng = np.random.default_rng(0)
+    close = 100 + rng.standard_normal(n_bars).cumsum()
+
+    return pd.DataFrame({
+        "open": close,
+        "high": close + 1,
+        "low": close - 1,
+        "close": close,
+        "volume": rng.integers(100_000, 3_000_000, n_bars),
+    })
+
+
+def exec_evaluator(text: str):
+
+    namespace = {}
+    exec(generate_python(parse_strategy_text(text)), namespace)
+    return namespace["evaluate_strategy"]
+
+
+def best_of(fn, repeats: int) -> float:
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(n_bars: int = 100_000, repeats: int = 20) -> None:
+
+    df = make_data(n_bars)
+
+    # Sanity check: both backends agree
+    ast = parse_strategy_text(STRATEGY)
+    a = exec_evaluator(STRATEGY)(df)
+    b = evaluate_strategy_ast(ast, df)
+    assert a["entry"].equals(b["entry"]) and a["exit"].equals(b["exit"])
+
+    one_off_exec = best_of(lambda: exec_evaluator(STRATEGY)(df), repeats)
+    one_off_interp = best_of(lambda: evaluate_strategy_ast(parse_strategy_text(STRATEGY), df), repeats)
+
+    evaluate = exec_evaluator(STRATEGY)
+    interpret = load_interpreter(ast)
+    repeated_exec = best_of(lambda: evaluate(df), repeats)
+    repeated_interp = best_of(lambda: interpret(df), repeats)
+
+    # Short-lived strategies on small data: compile overhead dominates
+    small = make_data(500)
+    tiny_exec = best_of(lambda: exec_evaluator(STRATEGY)(small), repeats)
+    tiny_interp = best_of(lambda: evaluate_strategy_ast(parse_strategy_text(STRATEGY), small), repeats)
+
+    print(f"bars={n_bars} repeats={repeats} (best time, ms)")
+    print(f"{'case':<22}{'exec':>10}{'interpreter':>14}")
+    print(f"{'one-off':<22}{one_off_exec * 1e3:>10.2f}{one_off_interp * 1e3:>14.2f}")
+    print(f"{'repeated':<22}{repeated_exec * 1e3:>10.2f}{repeated_interp * 1e3:>14.2f}")
+    print(f"{'one-off, 500 bars':<22}{tiny_exec * 1e3:>10.2f}{tiny_interp * 1e3:>14.2f}")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    main(*args)
@@ -0,0 +1,53 @@
+"""
+Benchmark: cost-ordered, short-circuiting evaluation vs the interpreter.
+
+    python -m benchmarks.bench_planner [n_bars] [repeats]
+
+Each strategy gates expensive indicators behind a cheap volume filter
+that passes all, a few, or none of the bars.
+"""
+
+import sys
+import numpy as np
+
+from parser.parser import parse_strategy_text
+from engine.interpreter import evaluate_ast
+from engine.planner import evaluate_planned
+from benchmarks.bench_interpreter import make_data, best_of
+
+
+STRATEGY = """
+ENTRY:
+RSI(close,14) < 30 AND close > SMA(close,50) AND volume > {threshold}
+CROSS(close, "ABOVE", EMA(close,20)) AND volume > {threshold}
+EXIT:
+RSI(close,14) > 70 AND volume > {threshold}
+"""
+
+CASES = [("filter passes all", 0), ("filter passes ~2%", 2_940_000), ("filter passes none", 10_000_000)]
+
+
+def main(n_bars: int = 1_000_000, repeats: int = 5) -> None:
+
+    df = make_data(n_bars)
+    columns = {name: df[name].to_numpy() for name in df.columns}
+
+    print(f"bars={n_bars} repeats={repeats} (best time, ms)")
+    print(f"{'case':<22}{'interpreter':>14}{'planned':>10}")
+
+    for label, threshold in CASES:
+        ast = parse_strategy_text(STRATEGY.format(threshold=threshold))
+
+        a = evaluate_ast(ast, columns)
+        b = evaluate_planned(ast, columns)
+        assert all(np.array_equal(a[k], b[k]) for k in a)
+
+        full = best_of(lambda: evaluate_ast(ast, columns), repeats)
+        planned = best_of(lambda: evaluate_planned(ast, columns), repeats)
+
+        print(f"{label:<22}{full * 1e3:>14.2f}{planned * 1e3:>10.2f}")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    main(*args)
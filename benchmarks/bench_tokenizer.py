@@ -0,0 +1,66 @@
+"""
+Benchmark: DSL tokenizer throughput.
+
+    python -m benchmarks.bench_tokenizer [n_files] [repeats]
+
+Tokenizes a synthetic strategy library (`n_files` DSL texts) with the
+line-by-line tokenize_text and the single-pass tokenize_fast, and
+reports tokens per second for each. Track the numbers across releases.
+"""
+
+import sys
+import time
+
+from dsl.tokenizer import tokenize_text, tokenize_fast
+
+
+TEMPLATE = """# strategy {i}
+ENTRY:
+CROSS(close, "ABOVE", SMA(close,{fast})) AND volume > {volume}
+close > SMA(close,{slow}) AND RSI(close,{rsi}) < 40   # trend filter
+close[1] < open[1] OR close > HIGHEST(high, {slow})
+EXIT:
+CROSS(close, "BELOW", SMA(close,{fast}))
+RSI(close,{rsi}) > 70
+"""
+
+
+def make_library(n_files: int):
+
+    return [
+        TEMPLATE.format(i=i, fast=5 + i % 20, slow=30 + i % 50, rsi=7 + i % 14, volume=1_000_000 + i)
+        for i in range(n_files)
+    ]
+
+
+def best_of(fn, repeats: int) -> float:
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(n_files: int = 10_000, repeats: int = 5) -> None:
+
+    library = make_library(n_files)
+    n_tokens = sum(len(tokenize_fast(text)) for text in library)
+
+    # Sanity check: both modes produce the same tokens
+    for text in library[:100]:
+        assert [repr(t) for t in tokenize_text(text)] == [repr(t) for t in tokenize_fast(text)]
+
+    line_time = best_of(lambda: [tokenize_text(text) for text in library], repeats)
+    fast_time = best_of(lambda: [tokenize_fast(text) for text in library], repeats)
+
+    print(f"files={n_files} tokens={n_tokens} repeats={repeats} (best time)")
+    print(f"{'tokenizer':<16}{'seconds':>10}{'tokens/s':>14}")
+    print(f"{'tokenize_text':<16}{line_time:>10.3f}{n_tokens / line_time:>14,.0f}")
+    print(f"{'tokenize_fast':<16}{fast_time:>10.3f}{n_tokens / fast_time:>14,.0f}")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    main(*args)
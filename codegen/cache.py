@@ -0,0 +1,143 @@
+"""
+Compiled-evaluator cache.
+
+Evaluators are keyed by a canonical hash of the strategy AST. Compiled
+functions live in an in-memory LRU; with a `cache_dir`, the compiled
+code objects are also marshalled to disk (pyc-style, stamped with the
+interpreter's magic number) so a fresh process skips generate+compile.
+"""
+
+import hashlib
+import importlib.util
+import marshal
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from codegen.generator import generate_python
+from parser.ast_nodes import node_key
+
+
+# Bump whenever generate_python changes the code it emits
+GENERATOR_VERSION = 4
+
+
+def strategy_hash(strategy, fused: bool = False) -> str:
+    """Stable hex digest of a StrategyNode's structure (and of the code flavour)."""
+
+    flavour = "fused:" if fused else ""
+    canonical = f"v{GENERATOR_VERSION}:{flavour}{node_key(strategy)!r}"
+
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class EvaluatorCache:
+    """LRU of compiled `evaluate_strategy` functions, optionally backed by a cache directory."""
+
+    def __init__(self, maxsize: int = 512, cache_dir: Optional[str] = None, fused: bool = False):
+        self.maxsize = maxsize
+        self.cache_dir = cache_dir
+        self.fused = fused
+        self._evaluators: "OrderedDict[str, Callable]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+
+    def get(self, strategy, source: Optional[str] = None) -> Callable:
+        """
+        Return the evaluator for a StrategyNode, compiling it only on a
+        miss. `source` is generate_python output the caller already has
+        (it must match this cache's flavour); it saves generating it again.
+        """
+
+        key = strategy_hash(strategy, self.fused)
+
+        with self._lock:
+            evaluate = self._evaluators.get(key)
+            if evaluate is not None:
+                self._evaluators.move_to_end(key)
+                return evaluate
+
+        code = self._load_code(key)
+
+        if code is None:
+            if source is None:
+                source = generate_python(strategy, self.fused)
+            code = compile(source, f"<strategy {key[:12]}>", "exec")
+            self._store_code(key, code)
+
+        namespace = {}
+        exec(code, namespace)
+        evaluate = namespace["evaluate_strategy"]
+
+        with self._lock:
+            self._evaluators[key] = evaluate
+            self._evaluators.move_to_end(key)
+            while len(self._evaluators) > self.maxsize:
+                self._evaluators.popitem(last=False)
+
+        return evaluate
+
+
+    def clear(self) -> None:
+        """Drop the in-memory tier (files in cache_dir are kept)."""
+
+        with self._lock:
+            self._evaluators.clear()
+
+
+    def __len__(self) -> int:
+        return len(self._evaluators)
+
+
+    def __contains__(self, strategy) -> bool:
+        return strategy_hash(strategy, self.fused) in self._evaluators
+
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.evc")
+
+
+    def _load_code(self, key: str):
+        """Read a marshalled code object, ignoring stale or unreadable files."""
+
+        if not self.cache_dir:
+            return None
+
+        try:
+            with open(self._path(key), "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+
+        magic = importlib.util.MAGIC_NUMBER
+
+        if not data.startswith(magic):
+            return None
+
+        try:
+            return marshal.loads(data[len(magic):])
+        except (EOFError, ValueError, TypeError):
+            return None
+
+
+    def _store_code(self, key: str, code) -> None:
+        """Write atomically so concurrent workers never read a partial file."""
+
+        if not self.cache_dir:
+            return
+
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(importlib.util.MAGIC_NUMBER)
+                f.write(marshal.dumps(code))
+            os.replace(tmp, self._path(key))
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
@@ -0,0 +1,290 @@
+"""
+Fused, memory-bounded code generation.
+
+    source = generate_python(strategy, fused=True)
+
+emits an `evaluate_strategy(df)` with the same contract as the default
+generator (bool Series 'entry'/'exit' on df.index), written against
+NumPy arrays and in-place ufuncs:
+
+    - each block's mask is one preallocated bool buffer; every rule is
+      evaluated into a scratch buffer and OR'd into it with out=
+    - comparisons and AND/OR/NOT write straight into scratch buffers
+      from a small pool that is reused across rules (its size is the
+      nesting depth, not the rule count)
+    - indicator and lookback arrays are computed right before their
+      first use and deleted after their last one; indicators go through
+      codegen.runtime.indicator_values, so an active indicator cache
+      applies here too
+
+Peak memory is the two masks, the scratch pool and whatever indicator
+arrays are shared between rules, instead of one Series per rule and
+per sub-expression.
+"""
+
+from dsl.indicators import get_indicator_spec, split_args
+from parser.ast_nodes import (
+    IdentifierNode,
+    NumberNode,
+    BooleanNode,
+    LookbackNode,
+    IndicatorCallNode,
+    CompareNode,
+    LogicalOpNode,
+    CrossNode,
+    node_key,
+    call_key,
+)
+
+
+_UFUNCS = {
+    ">": "np.greater",
+    "<": "np.less",
+    ">=": "np.greater_equal",
+    "<=": "np.less_equal",
+    "==": "np.equal",
+}
+
+
+class _FusedEmitter:
+    """
+    Statements of one fused function, in evaluation order. Each statement
+    records the names it reads, so `del` lines can be placed after the
+    last use of every temporary.
+    """
+
+    def __init__(self):
+        self.statements = []        # (code, names read)
+        self.names = {}             # structural key -> array name
+        self.free = []              # scratch buffers not in use
+        self.scratch = 0
+        self.temps = 0
+
+
+    def emit(self, code, *reads):
+        self.statements.append((code, {r for r in reads if r.isidentifier()}))
+
+
+    # -- operands: return a name or a literal --------------------------
+
+    def operand(self, node) -> str:
+
+        if isinstance(node, NumberNode):
+            return repr(float(node.value))
+
+        if isinstance(node, IdentifierNode):
+            return self._bind(("id", node.name), f'np.asarray(df["{node.name}"], dtype=float)')
+
+        if isinstance(node, LookbackNode):
+            column = self.operand(IdentifierNode(node.name))
+            key = ("shift", ("id", node.name), int(node.offset))
+            return self._bind(key, f"kernels.shift({column}, {int(node.offset)})", column)
+
+        if isinstance(node, IndicatorCallNode):
+            series, params = split_args(node.name, node.args)
+            keys = [node_key(arg) for arg in series]
+            names = [self.operand(arg) for arg in series]
+            return self._call(node.name.upper(), keys, names, [p.value for p in params])
+
+        # A condition used as a value: its own bool buffer
+        self.temps += 1
+        name = f"b{self.temps}"
+        self.emit(f"{name} = np.empty(n, dtype=bool)")
+        self.condition(node, name)
+        return name
+
+
+    def previous(self, node) -> str:
+        """Operand one bar earlier (numbers are constant)."""
+
+        value = self.operand(node)
+
+        if isinstance(node, NumberNode):
+            return value
+
+        return self._bind(("shift", node_key(node), 1), f"kernels.shift({value}, 1)", value)
+
+
+    def _call(self, name, keys, names, params) -> str:
+
+        key = call_key(name, keys, params)
+        if key in self.names:
+            return self.names[key]
+
+        spec = get_indicator_spec(name)
+        args = f"[{', '.join(names)}], [{', '.join(str(p) for p in params)}]"
+        reads = list(names)
+
+        if spec.parts is not None:
+            parts, part_keys = [], []
+
+            for part, source, part_params in spec.parts(*params):
+                if source is None:
+                    src_keys, src_names = keys, names
+                else:
+                    src_keys, src_names = [part_keys[source]], [parts[source]]
+
+                parts.append(self._call(part, src_keys, src_names, part_params))
+                part_keys.append(call_key(part, src_keys, part_params))
+
+            args += f", parts=[{', '.join(parts)}]"
+            reads += parts
+
+        return self._bind(key, f"indicator_values({name!r}, {args})", *reads)
+
+
+    def _bind(self, key, code, *reads) -> str:
+
+        name = self.names.get(key)
+
+        if name is None:
+            self.temps += 1
+            name = f"t{self.temps}"
+            self.names[key] = name
+            self.emit(f"{name} = {code}", *reads)
+
+        return name
+
+
+    # -- conditions: write into the bool buffer `out` -------------------
+
+    def condition(self, node, out: str) -> None:
+
+        if isinstance(node, CompareNode):
+            left = self.operand(node.left)
+            right = self.operand(node.right)
+            self.emit(f"{_UFUNCS[node.op]}({left}, {right}, out={out})", left, right, out)
+            return
+
+        if isinstance(node, BooleanNode):
+            self.emit(f"{out}.fill({bool(node.value)})", out)
+            return
+
+        if isinstance(node, LogicalOpNode):
+
+            if node.op == "NOT":
+                self.condition(node.right, out)
+                self.emit(f"np.logical_not({out}, out={out})", out)
+                return
+
+            ufunc = "np.logical_and" if node.op == "AND" else "np.logical_or"
+            first, *rest = _flatten(node, node.op)
+
+            self.condition(first, out)
+            for term in rest:
+                self.combine(ufunc, term, out)
+            return
+
+        if isinstance(node, CrossNode):
+            left = self.operand(node.left)
+            right = self.operand(node.right)
+            prev_left = self.previous(node.left)
+            prev_right = self.previous(node.right)
+
+            if node.direction.upper() == "ABOVE":
+                before, after = "np.less", "np.greater_equal"
+            else:
+                before, after = "np.greater", "np.less_equal"
+
+            self.emit(f"{before}({prev_left}, {prev_right}, out={out})", prev_left, prev_right, out)
+
+            buffer = self.acquire()
+            self.emit(f"{after}({left}, {right}, out={buffer})", left, right, buffer)
+            self.emit(f"np.logical_and({out}, {buffer}, out={out})", out, buffer)
+            self.release(buffer)
+            return
+
+        raise TypeError(f"Unsupported AST node: {type(node).__name__}")
+
+
+    def combine(self, ufunc: str, node, out: str) -> None:
+        """out = ufunc(out, node), through a scratch buffer."""
+
+        buffer = self.acquire()
+        self.condition(node, buffer)
+        self.emit(f"{ufunc}({out}, {buffer}, out={out})", out, buffer)
+        self.release(buffer)
+
+
+    def block(self, rules, out: str) -> None:
+        """OR of a rule list into a new buffer `out`."""
+
+        if not rules:
+            self.emit(f"{out} = np.zeros(n, dtype=bool)")
+            return
+
+        self.emit(f"{out} = np.empty(n, dtype=bool)")
+
+        first, *rest = rules
+        self.condition(first, out)
+        for rule in rest:
+            self.combine("np.logical_or", rule, out)
+
+
+    def acquire(self) -> str:
+
+        if self.free:
+            return self.free.pop()
+
+        self.scratch += 1
+        name = f"s{self.scratch}"
+        self.emit(f"{name} = np.empty(n, dtype=bool)")
+        return name
+
+
+    def release(self, name: str) -> None:
+        self.free.append(name)
+
+
+    def body(self, keep) -> list:
+        """Statements with `del` after the last read of each name not in `keep`."""
+
+        last = {}
+        for i, (_, reads) in enumerate(self.statements):
+            for name in reads:
+                last[name] = i
+
+        lines = []
+        for i, (code, _) in enumerate(self.statements):
+            lines.append(code)
+            done = sorted(name for name, at in last.items() if at == i and name not in keep)
+            if done:
+                lines.append(f"del {', '.join(done)}")
+
+        return lines
+
+
+def _flatten(node, op: str) -> list:
+    """Operands of a chain of the same AND/OR."""
+
+    if isinstance(node, LogicalOpNode) and node.op == op:
+        return _flatten(node.left, op) + _flatten(node.right, op)
+    return [node]
+
+
+def generate_fused_python(strategy) -> str:
+    """Fused, in-place variant of codegen.generator.generate_python."""
+
+    emitter = _FusedEmitter()
+
+    emitter.block(strategy.entry.rules if strategy.entry else [], "entry_signal")
+    emitter.block(strategy.exit.rules if strategy.exit else [], "exit_signal")
+
+    lines = [
+        "import numpy as np",
+        "import pandas as pd",
+        "from engine import kernels",
+        "from codegen.runtime import indicator_values",
+        "",
+        "def evaluate_strategy(df):",
+        "    n = len(df)",
+    ]
+
+    for line in emitter.body(keep={"entry_signal", "exit_signal"}):
+        lines.append("    " + line)
+
+    lines.append("    return {'entry': pd.Series(entry_signal, index=df.index, copy=False),")
+    lines.append("            'exit': pd.Series(exit_signal, index=df.index, copy=False)}")
+    lines.append("")
+
+    return "\n".join(lines)
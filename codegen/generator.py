@@ -1,40 +1,60 @@
 import pandas as pd
 
+from codegen.fused import generate_fused_python
+from dsl.indicators import get_indicator_spec, split_args
 from parser.ast_nodes import (
     IdentifierNode,
     NumberNode,
+    BooleanNode,
     LookbackNode,
     IndicatorCallNode,
     CompareNode,
     LogicalOpNode,
     CrossNode,
+    node_key,
+    call_key,
 )
 
 
-def sma(series, period):
-    """Compute Simple Moving Average."""
+class _Temporaries:
+    """
+    Deduplicated expression DAG for one generated function.
 
-    period = int(period)
+    Each distinct indicator call, lookback and shift is bound once to a
+    temporary (t1, t2, ...); later references reuse the name.
+    """
 
-    return series.rolling(window=period, min_periods=period).mean()
+    def __init__(self):
+        self.names = {}
+        self.lines = []
+        self.functions = set()
 
+    def bind(self, key, code):
+        """Return the temporary holding `code`, creating it on first use."""
 
-def rsi(series, period):
-    """Compute RSI using a standard Wilder-like formula."""
+        name = self.names.get(key)
 
-    period = int(period)
-    delta = series.diff()
-    up = delta.clip(lower=0)
-    down = -delta.clip(upper=0)
-    roll_up = up.ewm(alpha=1/period, adjust=False).mean()
-    roll_down = down.ewm(alpha=1/period, adjust=False).mean()
-    rs = roll_up / (roll_down.replace(0, 1e-9))
+        if name is None:
+            name = f"t{len(self.names) + 1}"
+            self.names[key] = name
+            self.lines.append(f"{name} = {code}")
 
-    return 100 - (100 / (1 + rs))
+        return name
 
 
-def _expr_to_code(node):
-    """Converts AST expression node → Python code string."""
+def _bind(temps, key, code):
+
+    if temps is None:
+        return code
+
+    return temps.bind(key, code)
+
+
+def _expr_to_code(node, temps=None):
+    """
+    Converts AST expression node → Python code string.
+    With a _Temporaries table, repeated subexpressions become shared temporaries.
+    """
 
     if isinstance(node, IdentifierNode):
         return f'df["{node.name}"]'
@@ -42,25 +62,31 @@ def _expr_to_code(node):
     if isinstance(node, NumberNode):
         return str(node.value)
 
+    if isinstance(node, BooleanNode):
+        return f"pd.Series({bool(node.value)}, index=df.index)"
+
     if isinstance(node, LookbackNode):
-        return f'df["{node.name}"].shift({node.offset})'
+        key = ("shift", ("id", node.name), int(node.offset))
+        return _bind(temps, key, f'df["{node.name}"].shift({node.offset})')
 
     if isinstance(node, IndicatorCallNode):
-        args = [_expr_to_code(arg) for arg in node.args]
-        return f'{node.name.lower()}({", ".join(args)})'
+        series, params = split_args(node.name, node.args)
+        keys = [node_key(arg) for arg in series]
+        codes = [_expr_to_code(arg, temps) for arg in series]
+        return _call_code(temps, node.name.upper(), keys, codes, [p.value for p in params])
 
     if isinstance(node, CompareNode):
-        left = _expr_to_code(node.left)
-        right = _expr_to_code(node.right)
-        return f'({left} {node.op} {right})'
+        left = _expr_to_code(node.left, temps)
+        right = _expr_to_code(node.right, temps)
+        return _as_series(node, f'({left} {node.op} {right})')
 
     if isinstance(node, LogicalOpNode):
         if node.op == "NOT":
-            right = _expr_to_code(node.right)
+            right = _expr_to_code(node.right, temps)
             return f'(~({right}))'
 
-        left = _expr_to_code(node.left)
-        right = _expr_to_code(node.right)
+        left = _expr_to_code(node.left, temps)
+        right = _expr_to_code(node.right, temps)
 
         if node.op == "AND":
             return f'(({left}) & ({right}))'
@@ -68,23 +94,79 @@ def _expr_to_code(node):
             return f'(({left}) | ({right}))'
 
     if isinstance(node, CrossNode):
-        left = _expr_to_code(node.left)
-        right = _expr_to_code(node.right)
+        left = _expr_to_code(node.left, temps)
+        right = _expr_to_code(node.right, temps)
+        prev_left = _previous_code(temps, node.left, left)
+        prev_right = _previous_code(temps, node.right, right)
+
         if node.direction.upper() == "ABOVE":
-            return (
-                f"(({left}.shift(1) < {right}.shift(1)) & "
+            return _as_series(node, (
+                f"(({prev_left} < {prev_right}) & "
                 f"({left} >= {right}))"
-            )
+            ))
         else:
-            return (
-                f"(({left}.shift(1) > {right}.shift(1)) & "
+            return _as_series(node, (
+                f"(({prev_left} > {prev_right}) & "
                 f"({left} <= {right}))"
-            )
+            ))
 
     raise TypeError(f"Unsupported AST node: {type(node).__name__}")
 
 
-def _gen_rule_series_code(rules, series_name):
+def _previous_code(temps, node, code):
+    """Operand one bar earlier (numbers are constant)."""
+
+    if isinstance(node, NumberNode):
+        return code
+
+    return _bind(temps, ("shift", node_key(node), 1), f"{code}.shift(1)")
+
+
+def _as_series(node, code):
+    """
+    A comparison or CROSS of two numbers is a plain Python bool; make it a
+    Series so NOT (~), fillna and the rule OR behave as on any other rule.
+    """
+
+    if isinstance(node.left, NumberNode) and isinstance(node.right, NumberNode):
+        return f"pd.Series({code}, index=df.index)"
+
+    return code
+
+
+def _call_code(temps, name, keys, codes, params):
+    """
+    Code for indicator `name` over series `codes`. With temporaries, the
+    parts of a composite indicator are bound first and passed in, so an
+    EMA or SMA they share with other calls is computed once.
+    """
+
+    args = ", ".join(codes + [str(p) for p in params])
+
+    if temps is None:
+        return f"{name.lower()}({args})"
+
+    temps.functions.add(name.lower())
+    spec = get_indicator_spec(name)
+
+    if spec.parts is not None:
+        parts, part_keys = [], []
+
+        for part, source, part_params in spec.parts(*params):
+            if source is None:
+                src_keys, src_codes = keys, codes
+            else:
+                src_keys, src_codes = [part_keys[source]], [parts[source]]
+
+            parts.append(_call_code(temps, part, src_keys, src_codes, part_params))
+            part_keys.append(call_key(part, src_keys, part_params))
+
+        args += f", parts=[{', '.join(parts)}]"
+
+    return temps.bind(call_key(name, keys, params), f"{name.lower()}({args})")
+
+
+def _gen_rule_series_code(rules, series_name, temps=None):
     """Converts rule list → Python code lines."""
     
     lines = []
@@ -96,7 +178,7 @@ def _gen_rule_series_code(rules, series_name):
     temp_vars = []
 
     for i, rule in enumerate(rules, start=1):
-        expr = _expr_to_code(rule)
+        expr = _expr_to_code(rule, temps)
         var = f"r{i}"
         temp_vars.append(var)
         lines.append(f"{var} = ({expr})")
@@ -105,44 +187,43 @@ def _gen_rule_series_code(rules, series_name):
     return lines
 
 
-def generate_python(strategy):
-    """Main python code generator"""
+def generate_python(strategy, fused: bool = False):
+    """
+    Main python code generator. fused=True emits the in-place NumPy
+    variant (see codegen.fused) with bounded peak memory.
+    """
 
-    lines = []
-    lines.append("import pandas as pd")
-    lines.append("")
+    if fused:
+        return generate_fused_python(strategy)
 
-    # Indicators
-    lines.append("def sma(series, period):")
-    lines.append("    return series.rolling(window=int(period), min_periods=1).mean()")
-    lines.append("")
-    lines.append("def rsi(series, period):")
-    lines.append("    period = int(period)")
-    lines.append("    delta = series.diff()")
-    lines.append("    up = delta.clip(lower=0)")
-    lines.append("    down = -1 * delta.clip(upper=0)")
-    lines.append("    ma_up = up.ewm(alpha=1/period, adjust=False).mean()")
-    lines.append("    ma_down = down.ewm(alpha=1/period, adjust=False).mean()")
-    lines.append("    rs = ma_up / (ma_down.replace(0, 1e-9))")
-    lines.append("    return 100 - (100 / (1 + rs))")
-    lines.append("")
+    lines = []
 
-    # Strategy evaluation function
-    lines.append("def evaluate_strategy(df):")
+    # Shared subexpressions of ENTRY and EXIT are bound to temporaries first
+    temps = _Temporaries()
+    body = []
 
     # ENTRY BLOCK
     if strategy.entry:
-        for l in _gen_rule_series_code(strategy.entry.rules, "entry_signal"):
-            lines.append("    " + l)
+        body.extend(_gen_rule_series_code(strategy.entry.rules, "entry_signal", temps))
     else:
-        lines.append("    entry_signal = pd.Series(False, index=df.index)")
+        body.append("entry_signal = pd.Series(False, index=df.index)")
 
     # EXIT BLOCK
     if strategy.exit:
-        for l in _gen_rule_series_code(strategy.exit.rules, "exit_signal"):
-            lines.append("    " + l)
+        body.extend(_gen_rule_series_code(strategy.exit.rules, "exit_signal", temps))
     else:
-        lines.append("    exit_signal = pd.Series(False, index=df.index)")
+        body.append("exit_signal = pd.Series(False, index=df.index)")
+
+    lines.append("import pandas as pd")
+    if temps.functions:
+        lines.append(f"from codegen.runtime import {', '.join(sorted(temps.functions))}")
+    lines.append("")
+
+    # Strategy evaluation function
+    lines.append("def evaluate_strategy(df):")
+
+    for l in temps.lines + body:
+        lines.append("    " + l)
 
     lines.append("    entry_signal = entry_signal.fillna(False)")
     lines.append("    exit_signal = exit_signal.fillna(False)")
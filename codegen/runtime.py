@@ -0,0 +1,87 @@
+"""
+Indicator helpers imported by generated evaluators.
+
+Generated modules do `from codegen.runtime import sma, rsi` instead of
+re-declaring these functions, so every exec'd strategy shares one copy.
+There is one helper per entry of dsl.indicators.INDICATOR_KERNELS, each
+a thin pandas wrapper around the NumPy kernel. Works on Series and, for
+panel backtests, on time x symbol DataFrames.
+
+Inside `with indicator_cache(cache):` the helpers read through a
+store.indicator_cache.IndicatorCache, so generated evaluators reuse
+indicator values across runs without being regenerated.
+"""
+
+import contextlib
+import contextvars
+import numpy as np
+import pandas as pd
+
+from dsl.indicators import INDICATOR_KERNELS, get_indicator_signature
+
+
+def _wrap(values, like):
+    """Put a kernel result back on the index (and columns) of `like`."""
+
+    if isinstance(like, pd.DataFrame):
+        return pd.DataFrame(values, index=like.index, columns=like.columns)
+
+    return pd.Series(values, index=like.index)
+
+
+_ACTIVE_CACHE = contextvars.ContextVar("indicator_cache", default=None)
+
+
+@contextlib.contextmanager
+def indicator_cache(cache):
+    """Route the indicator helpers through `cache` within the block."""
+
+    token = _ACTIVE_CACHE.set(cache)
+    try:
+        yield cache
+    finally:
+        _ACTIVE_CACHE.reset(token)
+
+
+def indicator_values(name: str, series, params, parts=None) -> np.ndarray:
+    """Array-level indicator call, through the active indicator cache if any."""
+
+    series = [np.asarray(s, dtype=float) for s in series]
+
+    if parts is not None:
+        parts = [np.asarray(p, dtype=float) for p in parts]
+
+    cache = _ACTIVE_CACHE.get()
+    if cache is not None:
+        return cache.compute(name, series, params, parts=parts)
+
+    kernel = INDICATOR_KERNELS[name].kernel
+
+    if parts is None:
+        return kernel(*series, *params)
+
+    return kernel(*series, *params, parts=parts)
+
+
+def indicator_function(name: str):
+    """pandas-level helper for indicator `name`: f(*series, *params, parts=None)."""
+
+    kernel = INDICATOR_KERNELS[name].kernel
+    _, arg_types = get_indicator_signature(name)
+    n_series = arg_types.count("series")
+
+    def indicator(*args, parts=None):
+
+        values = indicator_values(name, args[:n_series], args[n_series:], parts)
+
+        return _wrap(values, args[0])
+
+    indicator.__name__ = name.lower()
+    indicator.__doc__ = f"{name} indicator (see engine.kernels.{kernel.__name__})."
+
+    return indicator
+
+
+RUNTIME_FUNCTIONS = {name.lower(): indicator_function(name) for name in INDICATOR_KERNELS}
+
+globals().update(RUNTIME_FUNCTIONS)
@@ -1,11 +1,112 @@
-from typing import Dict, Tuple, List, Any
+from dataclasses import dataclass
+from typing import Callable, Dict, Tuple, List, Any, Optional
+
+from engine import kernels
 
 
 SUPPORTED_INDICATORS: Dict[str, Tuple[List[str], List[str]]] = {
 
     "SMA": (["series", "period"], ["series", "int"]),
 
-    "RSI": (["series", "period"], ["series", "int"])
+    "RSI": (["series", "period"], ["series", "int"]),
+
+    "EMA": (["series", "period"], ["series", "int"]),
+
+    "STDDEV": (["series", "period"], ["series", "int"]),
+
+    "HIGHEST": (["series", "period"], ["series", "int"]),
+
+    "LOWEST": (["series", "period"], ["series", "int"]),
+
+    "ATR": (["high", "low", "close", "period"], ["series", "series", "series", "int"]),
+
+    "MACD": (["series", "fast", "slow"], ["series", "int", "int"]),
+
+    "MACD_SIGNAL": (["series", "fast", "slow", "signal"], ["series", "int", "int", "int"]),
+
+    "MACD_HIST": (["series", "fast", "slow", "signal"], ["series", "int", "int", "int"]),
+
+    "BB_MIDDLE": (["series", "period"], ["series", "int"]),
+
+    "BB_UPPER": (["series", "period", "width"], ["series", "int", "float"]),
+
+    "BB_LOWER": (["series", "period", "width"], ["series", "int", "float"])
+
+}
+
+
+@dataclass(frozen=True)
+class IndicatorSpec:
+    """
+    How an indicator is computed.
+
+    kernel     engine.kernels function, called as kernel(*series, *params)
+    warmup     params -> bars before the value is meaningful
+    history    params -> bars of input an output row depends on (0 for
+               recursive indicators, whose state is carried instead)
+    parts      params -> intermediates [(name, source, params)], where
+               source is None for the call's own series or the index of
+               an earlier part; passed to the kernel as `parts=`
+    smoothing  kernels.Smoothing for recursive (ewm based) indicators
+    """
+
+    kernel: Callable
+    warmup: Callable
+    history: Callable
+    parts: Optional[Callable] = None
+    smoothing: Optional[kernels.Smoothing] = None
+
+
+def _window(period, *rest):
+    return max(int(period) - 1, 0)
+
+
+def _macd_warmup(fast, slow, signal=1):
+    return max(int(fast), int(slow)) + int(signal) - 2
+
+
+def _macd_line_parts(fast, slow, signal):
+    return [("MACD", None, (fast, slow)), ("EMA", 0, (signal,))]
+
+
+def _bollinger_parts(period, width):
+    return [("SMA", None, (period,)), ("STDDEV", None, (period,))]
+
+
+INDICATOR_KERNELS: Dict[str, IndicatorSpec] = {
+
+    "SMA": IndicatorSpec(kernels.sma, _window, _window),
+
+    "RSI": IndicatorSpec(kernels.rsi, lambda period: int(period), lambda period: 1,
+                         smoothing=kernels.RSI_SMOOTHING),
+
+    "EMA": IndicatorSpec(kernels.ema, _window, lambda period: 0,
+                         smoothing=kernels.EMA_SMOOTHING),
+
+    "STDDEV": IndicatorSpec(kernels.stddev, _window, _window),
+
+    "HIGHEST": IndicatorSpec(kernels.highest, _window, _window),
+
+    "LOWEST": IndicatorSpec(kernels.lowest, _window, _window),
+
+    "ATR": IndicatorSpec(kernels.atr, lambda period: int(period), lambda period: 1,
+                         smoothing=kernels.ATR_SMOOTHING),
+
+    "MACD": IndicatorSpec(kernels.macd, _macd_warmup, lambda fast, slow: 0,
+                          parts=lambda fast, slow: [("EMA", None, (fast,)), ("EMA", None, (slow,))]),
+
+    "MACD_SIGNAL": IndicatorSpec(kernels.macd_signal, _macd_warmup, lambda *params: 0,
+                                 parts=_macd_line_parts),
+
+    "MACD_HIST": IndicatorSpec(kernels.macd_hist, _macd_warmup, lambda *params: 0,
+                               parts=_macd_line_parts),
+
+    "BB_MIDDLE": IndicatorSpec(kernels.bb_middle, _window, _window,
+                               parts=lambda period: [("SMA", None, (period,))]),
+
+    "BB_UPPER": IndicatorSpec(kernels.bb_upper, _window, _window, parts=_bollinger_parts),
+
+    "BB_LOWER": IndicatorSpec(kernels.bb_lower, _window, _window, parts=_bollinger_parts),
 
 }
 
@@ -48,4 +149,21 @@ def get_indicator_signature(name: str) -> Tuple[List[str], List[str]]:
 
     canonical = canonicalize_name(name)  
     
-    return SUPPORTED_INDICATORS[canonical]
\ No newline at end of file
+    return SUPPORTED_INDICATORS[canonical]
+
+
+def get_indicator_spec(name: str) -> IndicatorSpec:
+    "Get the kernel spec for a given indicator"
+
+    return INDICATOR_KERNELS[canonicalize_name(name)]
+
+
+def split_args(name: str, args: List[Any]) -> Tuple[List[Any], List[Any]]:
+    "Split indicator call args into (series args, parameter args)"
+
+    _, arg_types = get_indicator_signature(name)
+
+    series = [arg for arg, kind in zip(args, arg_types) if kind == "series"]
+    params = [arg for arg, kind in zip(args, arg_types) if kind != "series"]
+
+    return series, params
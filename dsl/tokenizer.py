@@ -1,4 +1,5 @@
 import re 
+from bisect import bisect_right
 from dataclasses import dataclass  
 from typing import List, Iterator
 
@@ -92,4 +93,143 @@ def tokenize_text(text: str) -> List[Token]:
 TOKEN_TYPES = {
     "NUMBER", "STRING", "IDENT", "OP",
     "COMMA", "LPAREN", "RPAREN", "LBRACK", "RBRACK", "COLON"
-}
\ No newline at end of file
+}
+
+
+# Fast mode: one compiled pattern over the whole buffer. Blanks, line
+# breaks (the ones str.splitlines() honours) and comments are consumed
+# as a prefix of every match, so each match is exactly one token. Strings
+# and comments stop at line breaks and strings can't hold '#', which keeps
+# tokens (and errors) the same as tokenize_text's.
+
+_BREAK_CHARS = "\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029"
+_LINE_BREAK = re.compile(f"\r\n|[{_BREAK_CHARS}]")
+
+_FAST_SKIP = f"(?:[ \t{_BREAK_CHARS}]+|#[^{_BREAK_CHARS}]*)*"
+_FAST_SPEC = [("STRING", f"\"[^\"#{_BREAK_CHARS}]*\"")] + [
+    (name, pattern) for name, pattern in _TOKEN_SPEC if name not in ("SKIP", "STRING")
+]
+
+# One group per kind; an empty match at the end of the text has no group
+_fast_pat = re.compile(_FAST_SKIP + "(?:" + "|".join(f"({pattern})" for _, pattern in _FAST_SPEC) + "|\\Z)")
+_FAST_KINDS = [None] + [name for name, _ in _FAST_SPEC]      # group number -> kind
+
+
+class _LineIndex:
+    """Offsets where each line starts, built on first line/col lookup."""
+
+    __slots__ = ("text", "starts")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.starts = None
+
+    def position(self, offset: int):
+        """(line, col), both 1-based, of a character offset."""
+
+        if self.starts is None:
+            self.starts = [0] + [mo.end() for mo in _LINE_BREAK.finditer(self.text)]
+
+        line = bisect_right(self.starts, offset)
+
+        return line, offset - self.starts[line - 1] + 1
+
+
+class CompactToken:
+    """Token handed out by TokenArrays; line/col are computed on demand."""
+
+    __slots__ = ("type", "value", "offset", "_lines")
+
+    def __init__(self, type: str, value: str, offset: int, lines: _LineIndex):
+        self.type = type
+        self.value = value
+        self.offset = offset
+        self._lines = lines
+
+    @property
+    def line(self) -> int:
+        return self._lines.position(self.offset)[0]
+
+    @property
+    def col(self) -> int:
+        return self._lines.position(self.offset)[1]
+
+    def __repr__(self) -> str:
+
+        return f"Token({self.type!r}, {self.value!r}, line={self.line}, col={self.col})"
+
+
+class TokenArrays:
+    """
+    Tokens of one text as parallel lists (types, values, offsets).
+    Indexing builds a CompactToken on first access, so it can stand in
+    for the list returned by tokenize_text.
+    """
+
+    __slots__ = ("types", "values", "offsets", "_lines", "_tokens")
+
+    def __init__(self, text: str):
+        self.types: List[str] = []
+        self.values: List[str] = []
+        self.offsets: List[int] = []
+        self._lines = _LineIndex(text)
+        self._tokens = None
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def __getitem__(self, i: int) -> CompactToken:
+
+        if self._tokens is None:
+            self._tokens = [None] * len(self.types)
+
+        tok = self._tokens[i]
+        if tok is None:
+            tok = CompactToken(self.types[i], self.values[i], self.offsets[i], self._lines)
+            self._tokens[i] = tok
+
+        return tok
+
+    def __iter__(self) -> Iterator[CompactToken]:
+        return iter(self.tokens())
+
+    def tokens(self) -> List[CompactToken]:
+        """All tokens as a list."""
+
+        if self._tokens is None or None in self._tokens:
+            lines = self._lines
+            self._tokens = [CompactToken(kind, value, offset, lines)
+                            for kind, value, offset in zip(self.types, self.values, self.offsets)]
+
+        return self._tokens
+
+    def position(self, i: int):
+        """(line, col) of token i."""
+
+        return self._lines.position(self.offsets[i])
+
+
+def tokenize_fast(text: str) -> TokenArrays:
+    "Tokenize DSL text in a single pass over the whole buffer"
+
+    tokens = TokenArrays(text)
+    types, values, offsets = tokens.types, tokens.values, tokens.offsets
+    kinds = _FAST_KINDS
+
+    for mo in _fast_pat.finditer(text):
+
+        group = mo.lastindex
+        if group is None:
+            continue
+
+        kind = kinds[group]
+
+        if kind == "MISMATCH":
+            line, col = tokens._lines.position(mo.start(group))
+            raise SyntaxError(f"Unexpected character {mo.group(group)!r} at line {line}, col {col}")
+
+        types.append(kind)
+        values.append(mo.group(group))
+        offsets.append(mo.start(group))
+
+    return tokens
@@ -0,0 +1,201 @@
+"""
+Many strategies, one dataset.
+
+    signals = evaluate_many(strategies, df)      # one dict per strategy
+
+All strategies are merged into one plan keyed by structural node keys,
+so every distinct indicator call, lookback, CROSS and comparison is
+evaluated once per call, however many strategies contain it. Indicator
+work therefore scales with the number of distinct indicators, not of
+strategies.
+
+The plan also counts how many places consume each distinct node; a
+result is dropped from the shared cache once its last consumer has been
+evaluated, so memory stays bounded by what is still needed rather than
+by everything the strategies ever referenced. Data columns and the
+intermediates of composite indicators (the EMAs of a MACD, ...) are
+kept for the whole call.
+"""
+
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Mapping
+import numpy as np
+import pandas as pd
+
+from dsl.indicators import get_indicator_spec, split_args
+from engine.interpreter import Interpreter
+from parser.ast_nodes import (
+    IdentifierNode,
+    LookbackNode,
+    IndicatorCallNode,
+    CompareNode,
+    LogicalOpNode,
+    CrossNode,
+    node_key,
+    call_key,
+)
+
+
+def _children(node) -> List:
+    """Operands a node's value is computed from."""
+
+    if isinstance(node, (CompareNode, CrossNode)):
+        return [node.left, node.right]
+
+    if isinstance(node, LogicalOpNode):
+        return [node.right] if node.op == "NOT" else [node.left, node.right]
+
+    if isinstance(node, IndicatorCallNode):
+        return split_args(node.name, node.args)[0]
+
+    return []
+
+
+def part_keys(name: str, keys, params) -> List[tuple]:
+    """
+    Cache keys of the intermediates a composite indicator is built from
+    (the EMAs of a MACD, ...), including those of nested composites.
+    """
+
+    spec = get_indicator_spec(name)
+    if spec.parts is None:
+        return []
+
+    found, own = [], []
+    for part, source, part_params in spec.parts(*params):
+        src_keys = keys if source is None else [own[source]]
+        own.append(call_key(part, src_keys, part_params))
+        found += part_keys(part, src_keys, part_params)
+
+    return own + found
+
+
+class StrategyPlan:
+    """Deduplicated expression DAG of a set of strategies, with consumer counts."""
+
+    def __init__(self, strategies: Iterable):
+        self.strategies = list(strategies)
+        self.nodes: Dict[tuple, Any] = {}
+        self.uses: Counter = Counter()
+        self.parts: set = set()
+        self._keys: Dict[int, tuple] = {}
+
+        for strategy in self.strategies:
+            for block in (strategy.entry, strategy.exit):
+                for rule in (block.rules if block else []):
+                    self.uses[self._add(rule)] += 1
+
+
+    def key(self, node) -> tuple:
+        """
+        Structural key of a node, computed once per node object (the plan
+        holds the strategies, so the ids stay valid).
+        """
+
+        key = self._keys.get(id(node))
+
+        if key is None:
+            key = node_key(node)
+            self._keys[id(node)] = key
+
+        return key
+
+
+    def count(self, kind) -> int:
+        """Distinct nodes of one AST class (e.g. IndicatorCallNode)."""
+
+        return sum(1 for node in self.nodes.values() if isinstance(node, kind))
+
+
+    def _add(self, node) -> tuple:
+
+        key = self.key(node)
+
+        if key not in self.nodes:
+            self.nodes[key] = node
+            for child in _children(node):
+                self.uses[self._add(child)] += 1
+
+            if isinstance(node, IndicatorCallNode):
+                series, params = split_args(node.name, node.args)
+                self.parts.update(part_keys(node.name.upper(), [self.key(arg) for arg in series],
+                                            [arg.value for arg in params]))
+
+        return key
+
+
+class BatchInterpreter(Interpreter):
+    """Interpreter that memoizes every plan node and frees it after its last use."""
+
+    def __init__(self, plan: StrategyPlan, columns: Mapping[str, Any], indicators=None):
+        super().__init__(columns, indicators=indicators)
+        self.plan = plan
+        self.remaining = Counter(plan.uses)
+        self.evaluated = set()
+
+
+    def value(self, node):
+
+        key = self.plan.key(node)
+        result = self.cache.get(key)
+
+        if result is None:
+            result = super().value(node)
+
+        # First evaluation of a plan node (composite parts may have put it in the cache already)
+        if key in self.remaining and key not in self.evaluated:
+            self.evaluated.add(key)
+            self.cache[key] = result
+            for child in _children(node):
+                self.release(child)
+
+        return result
+
+
+    def release(self, node) -> None:
+        """One consumer of `node` is done; drop its value after the last one."""
+
+        key = self.plan.key(node)
+        self.remaining[key] -= 1
+
+        if self.remaining[key] <= 0:
+            self.cache.pop(("shift", key, 1), None)
+
+            # Data columns are views, and composite parts may be needed
+            # again by another composite: both are kept for the whole run
+            if not isinstance(node, IdentifierNode) and key not in self.plan.parts:
+                self.cache.pop(key, None)
+
+            # Interpreter.value memoizes lookbacks under their shift key
+            if isinstance(node, LookbackNode):
+                self.cache.pop(("shift", ("id", node.name), int(node.offset)), None)
+
+
+    def mask(self, rules) -> np.ndarray:
+
+        combined = super().mask(rules)
+
+        for rule in rules:
+            self.release(rule)
+
+        return combined
+
+
+def evaluate_many(strategies: Iterable, columns: Mapping[str, Any],
+                  indicators=None) -> List[Dict[str, Any]]:
+    """
+    Entry/exit signals of every strategy over one dataset, in input
+    order. DataFrames give bool Series on df.index, column mappings
+    give bool arrays (as engine.interpreter.evaluate_strategy_ast).
+    """
+
+    plan = StrategyPlan(strategies)
+    interpreter = BatchInterpreter(plan, columns, indicators)
+
+    results = [interpreter.signals(strategy) for strategy in plan.strategies]
+
+    if isinstance(columns, pd.DataFrame):
+        return [{name: pd.Series(mask, index=columns.index) for name, mask in signals.items()}
+                for signals in results]
+
+    return results
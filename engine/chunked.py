@@ -0,0 +1,193 @@
+"""
+Chunk-by-chunk signal evaluation for series larger than memory.
+
+Each chunk is evaluated together with exactly the history the AST needs
+(see engine.interpreter.required_history), taken from the tail of the
+previous chunk. Two kinds of indicator can't be rebuilt from a short
+history, so their state and their recent outputs are carried across
+chunks instead:
+
+    RSI, EMA, ATR, ...   last smoothed values (see kernels.ewm_continue)
+    SMA, STDDEV          pandas' running sums, stepped bar by bar with
+                         the engine.streaming ops
+
+Signals then equal a single full-length run bit for bit. Stepping the
+running sums is a Python loop, tens of times slower per bar than the
+vectorized kernels; exact=False restarts them from the tail instead (as
+IndicatorCache(exact=False) does), at the cost of last-bit differences
+that can flip a comparison between two mathematically equal values.
+"""
+
+from typing import Any, Dict, Mapping, Optional
+import numpy as np
+
+from engine import kernels, streaming
+from engine.interpreter import Interpreter, required_history
+from parser.ast_nodes import (
+    IdentifierNode,
+    LookbackNode,
+    IndicatorCallNode,
+    CompareNode,
+    LogicalOpNode,
+    CrossNode,
+)
+
+
+def referenced_columns(strategy) -> set:
+    """Names of all data columns a strategy reads."""
+
+    names = set()
+
+    def visit(node):
+
+        if isinstance(node, IdentifierNode):
+            names.add(node.name)
+        elif isinstance(node, LookbackNode):
+            names.add(node.name)
+        elif isinstance(node, IndicatorCallNode):
+            for arg in node.args:
+                visit(arg)
+        elif isinstance(node, (CompareNode, LogicalOpNode, CrossNode)):
+            visit(node.left)
+            visit(node.right)
+
+    for block in (strategy.entry, strategy.exit):
+        if block:
+            for rule in block.rules:
+                visit(rule)
+
+    return names
+
+
+class _CarryInterpreter(Interpreter):
+    """Interpreter whose first `history` rows repeat the previous chunk's tail."""
+
+    def __init__(self, columns, history: int, carry: Dict, keep: int, exact: bool = True):
+        super().__init__(columns)
+        self.history = history
+        self.carry = carry
+        self.keep = keep
+        self.exact = exact
+
+    def smooth(self, key, smoothing: kernels.Smoothing, inputs, params) -> np.ndarray:
+
+        state = self.carry.get(key)
+        h = self.history if state is not None else 0
+
+        # Smoother inputs for the rows this chunk computes (row h onwards)
+        start = max(h - smoothing.history, 0)
+        streams = [s[h - start:] for s in smoothing.pre(*(x[start:] for x in inputs))]
+
+        alpha = smoothing.alpha(*params)
+        seeds = state["seeds"] if state else [None] * len(streams)
+        smoothed = [kernels.ewm_continue(s, alpha, seed) for s, seed in zip(streams, seeds)]
+
+        out = np.empty(len(inputs[0]))
+        out[h:] = smoothing.post(*smoothed)
+        if h:
+            out[:h] = state["tail"][len(state["tail"]) - h:]
+
+        self.carry[key] = {
+            "seeds": [kernels.ewm_seed(s, m, seed) for s, m, seed in zip(streams, smoothed, seeds)],
+            "tail": out[len(out) - min(self.keep, len(out)):].copy(),
+        }
+
+        return out
+
+
+    def rolling(self, key, name: str, inputs, params) -> np.ndarray:
+
+        if not self.exact:
+            return super().rolling(key, name, inputs, params)
+
+        state = self.carry.get(key)
+        h = self.history if state is not None else 0
+        op = state["op"] if state else _ROLLING_OPS[name](0, *params)
+
+        out = np.empty(len(inputs[0]))
+        out[h:] = _replay(op, inputs[0][h:])
+        if h:
+            out[:h] = state["tail"][len(state["tail"]) - h:]
+
+        self.carry[key] = {
+            "op": op,
+            "tail": out[len(out) - min(self.keep, len(out)):].copy(),
+        }
+
+        return out
+
+
+class ChunkedEvaluator:
+    """
+    Evaluate one strategy over consecutive chunks of bars.
+
+        evaluator = ChunkedEvaluator(ast)
+        for chunk in chunks:                 # DataFrame or column mapping
+            signals = evaluator.evaluate(chunk)
+
+    exact=False restarts SMA/STDDEV from each chunk's tail (faster, not
+    bit-identical to a full run; see the module docstring).
+    """
+
+    def __init__(self, strategy, exact: bool = True):
+        self.strategy = strategy
+        self.exact = exact
+        self.history = required_history(strategy)
+        self.columns = sorted(referenced_columns(strategy))
+        self.rows_seen = 0
+        self._tail: Optional[Dict[str, np.ndarray]] = None
+        self._carry: Dict = {}
+
+
+    def evaluate(self, chunk: Mapping[str, Any]) -> Dict[str, np.ndarray]:
+        """Entry/exit bool arrays for the rows of `chunk` only."""
+
+        current = {name: kernels.as_float(chunk[name]) for name in self.columns}
+
+        if self._tail is None:
+            h = 0
+            buffer = current
+        else:
+            h = len(next(iter(self._tail.values()), ()))
+            buffer = {name: np.concatenate((self._tail[name], current[name])) for name in self.columns}
+
+        interpreter = _CarryInterpreter(buffer, h, self._carry, self.history, self.exact)
+        if not self.columns:
+            interpreter.length = h + _chunk_length(chunk)
+
+        signals = interpreter.signals(self.strategy)
+
+        keep = self.history
+        self._tail = {name: values[len(values) - min(keep, len(values)):].copy()
+                      for name, values in buffer.items()}
+        self.rows_seen += interpreter.length - h
+
+        return {"entry": signals["entry"][h:], "exit": signals["exit"][h:]}
+
+
+_ROLLING_OPS = {"SMA": streaming._Sma, "STDDEV": streaming._Stddev}
+
+
+def _replay(op, values: np.ndarray) -> np.ndarray:
+    """Outputs of a streaming op (reading slot 0) stepped over `values`."""
+
+    out = np.empty(len(values))
+    slot = [0.0]
+    step = op.step
+
+    for i, value in enumerate(values.tolist()):
+        slot[0] = value
+        out[i] = step(None, slot)
+
+    return out
+
+
+def _chunk_length(chunk) -> int:
+
+    if hasattr(chunk, "index"):
+        return len(chunk.index)
+
+    for values in chunk.values():
+        return len(values)
+
+    return 0
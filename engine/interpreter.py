@@ -0,0 +1,324 @@
+"""
+Evaluates parser.ast_nodes trees directly against NumPy column arrays.
+
+Gives the same entry/exit masks as the generated `evaluate_strategy`,
+without producing or exec'ing Python source. Indicator and lookback
+results are memoized by structural key, so a shared `cache` dict lets
+several strategies (or grid points) reuse each other's work. An
+`indicators` store (store.indicator_cache.IndicatorCache) carries
+indicator results across runs.
+"""
+
+from typing import Any, Dict, Mapping, Optional
+import numpy as np
+import pandas as pd
+
+from dsl.indicators import get_indicator_spec, split_args
+from engine import kernels
+from parser.ast_nodes import (
+    IdentifierNode,
+    NumberNode,
+    BooleanNode,
+    LookbackNode,
+    IndicatorCallNode,
+    CompareNode,
+    LogicalOpNode,
+    CrossNode,
+    node_key,
+    call_key,
+)
+
+
+# Kernels whose values depend, in the last bits, on every bar before the
+# window: pandas keeps one compensated running sum over the whole series
+ROLLING_SUMS = frozenset({"SMA", "STDDEV"})
+
+
+_COMPARE = {
+    ">": np.greater,
+    "<": np.less,
+    ">=": np.greater_equal,
+    "<=": np.less_equal,
+    "==": np.equal,
+}
+
+
+def column_length(columns: Mapping[str, Any]) -> int:
+    """Number of bars in a DataFrame or a mapping of column arrays."""
+
+    if isinstance(columns, pd.DataFrame):
+        return len(columns)
+
+    for values in columns.values():
+        return len(values)
+
+    return 0
+
+
+class Interpreter:
+    """Walks AST nodes and returns float arrays (operands) or bool arrays (conditions)."""
+
+    def __init__(self, columns: Mapping[str, Any], cache: Optional[Dict] = None, indicators=None):
+        self.columns = columns
+        self.cache = {} if cache is None else cache
+        self.indicators = indicators
+        self.length = column_length(columns)
+
+
+    def column(self, name: str) -> np.ndarray:
+        """Float array for a data column."""
+
+        key = ("id", name)
+        values = self.cache.get(key)
+
+        if values is None:
+            values = kernels.as_float(self.columns[name])
+            self.cache[key] = values
+
+        return values
+
+
+    def value(self, node):
+        """Evaluate any expression node."""
+
+        if isinstance(node, IdentifierNode):
+            return self.column(node.name)
+
+        if isinstance(node, NumberNode):
+            return float(node.value)
+
+        if isinstance(node, BooleanNode):
+            return np.full(self.length, bool(node.value))
+
+        if isinstance(node, LookbackNode):
+            key = ("shift", ("id", node.name), int(node.offset))
+            return self._memo(key, lambda: kernels.shift(self.column(node.name), node.offset))
+
+        if isinstance(node, IndicatorCallNode):
+            return self._memo(node_key(node), lambda: self.indicator(node))
+
+        if isinstance(node, CompareNode):
+            left = self.value(node.left)
+            right = self.value(node.right)
+            return _COMPARE[node.op](left, right)
+
+        if isinstance(node, LogicalOpNode):
+            if node.op == "NOT":
+                return np.logical_not(self.value(node.right))
+
+            left = self.value(node.left)
+            right = self.value(node.right)
+
+            if node.op == "AND":
+                return left & right
+            if node.op == "OR":
+                return left | right
+
+        if isinstance(node, CrossNode):
+            left = self.value(node.left)
+            right = self.value(node.right)
+            prev_left = self._previous(node.left, left)
+            prev_right = self._previous(node.right, right)
+
+            if node.direction.upper() == "ABOVE":
+                return (prev_left < prev_right) & (left >= right)
+            return (prev_left > prev_right) & (left <= right)
+
+        raise TypeError(f"Unsupported AST node: {type(node).__name__}")
+
+
+    def indicator(self, node: IndicatorCallNode) -> np.ndarray:
+        """Run the kernel for an indicator call."""
+
+        series, params = split_args(node.name, node.args)
+
+        keys = [node_key(arg) for arg in series]
+        inputs = [self.value(arg) for arg in series]
+        params = [self.value(arg) for arg in params]
+
+        return self.call(node.name.upper(), keys, inputs, params)
+
+
+    def call(self, name: str, keys, inputs, params) -> np.ndarray:
+        """
+        Indicator `name` over `inputs` (whose structural keys are `keys`),
+        memoized under the same key as the equivalent IndicatorCallNode.
+        Composite indicators compute their parts through here too, so an
+        EMA inside a MACD is shared with the same EMA used elsewhere.
+        """
+
+        key = call_key(name, keys, params)
+
+        return self._memo(key, lambda: self._compute(name, key, keys, inputs, params))
+
+
+    def _compute(self, name, key, keys, inputs, params):
+
+        spec = get_indicator_spec(name)
+        parts = None
+
+        if spec.parts is not None:
+            parts, part_keys = [], []
+
+            for part, source, part_params in spec.parts(*params):
+                if source is None:
+                    src_keys, src_inputs = keys, inputs
+                else:
+                    src_keys, src_inputs = [part_keys[source]], [parts[source]]
+
+                parts.append(self.call(part, src_keys, src_inputs, part_params))
+                part_keys.append(call_key(part, src_keys, part_params))
+
+        if self.indicators is not None:
+            return self.indicators.compute(name, inputs, params, parts=parts)
+
+        if parts is not None:
+            return spec.kernel(*inputs, *params, parts=parts)
+
+        if spec.smoothing is not None:
+            return self.smooth(key, spec.smoothing, inputs, params)
+
+        if name in ROLLING_SUMS:
+            return self.rolling(key, name, inputs, params)
+
+        return spec.kernel(*inputs, *params)
+
+
+    def smooth(self, key, smoothing: kernels.Smoothing, inputs, params) -> np.ndarray:
+        """Recursive indicators; engine.chunked overrides this to carry state."""
+
+        return kernels.smooth(smoothing, inputs, params)
+
+
+    def rolling(self, key, name: str, inputs, params) -> np.ndarray:
+        """Rolling sums (ROLLING_SUMS); engine.chunked overrides this to carry their running state."""
+
+        return get_indicator_spec(name).kernel(*inputs, *params)
+
+
+    def mask(self, rules) -> np.ndarray:
+        """OR of a rule list as a bool array (all False when empty)."""
+
+        combined = np.zeros(self.length, dtype=bool)
+
+        for rule in rules:
+            combined |= np.broadcast_to(self.value(rule), self.length)
+
+        return combined
+
+
+    def signals(self, strategy) -> Dict[str, np.ndarray]:
+        """Entry/exit masks for a StrategyNode."""
+
+        entry_rules = strategy.entry.rules if strategy.entry else []
+        exit_rules = strategy.exit.rules if strategy.exit else []
+
+        return {"entry": self.mask(entry_rules), "exit": self.mask(exit_rules)}
+
+
+    def _memo(self, key, compute):
+
+        values = self.cache.get(key)
+
+        if values is None:
+            values = compute()
+            self.cache[key] = values
+
+        return values
+
+
+    def _previous(self, node, values):
+        """Operand value one bar earlier (scalars are constant)."""
+
+        if not isinstance(values, np.ndarray):
+            return values
+
+        return self._memo(("shift", node_key(node), 1), lambda: kernels.shift(values, 1))
+
+
+def required_history(node) -> int:
+    """
+    Bars of history a node needs so that its value on a bar equals the
+    full-history value: the indicator's `history` from dsl.indicators
+    (SMA period - 1, one bar for RSI's diff, ...), lookback offset, one
+    bar for a CROSS. Smoothing state of recursive indicators is carried
+    separately.
+    """
+
+    if isinstance(node, (IdentifierNode, NumberNode, BooleanNode)) or node is None:
+        return 0
+
+    if isinstance(node, LookbackNode):
+        return int(node.offset)
+
+    if isinstance(node, IndicatorCallNode):
+        series, params = split_args(node.name, node.args)
+        base = max((required_history(arg) for arg in series), default=0)
+        params = [arg.value for arg in params]
+
+        return base + _spec_history(node.name.upper(), params)
+
+    if isinstance(node, (CompareNode, LogicalOpNode)):
+        return max(required_history(node.left), required_history(node.right))
+
+    if isinstance(node, CrossNode):
+        return max(required_history(node.left), required_history(node.right)) + 1
+
+    if hasattr(node, "rules"):
+        return max((required_history(rule) for rule in node.rules), default=0)
+
+    if hasattr(node, "entry"):
+        return max(required_history(node.entry), required_history(node.exit))
+
+    return 0
+
+
+def _spec_history(name: str, params) -> int:
+    """History of an indicator including that of its parts."""
+
+    spec = get_indicator_spec(name)
+    own = spec.history(*params)
+
+    if spec.parts is None:
+        return own
+
+    parts = []
+    for part, source, part_params in spec.parts(*params):
+        base = 0 if source is None else parts[source]
+        parts.append(base + _spec_history(part, part_params))
+
+    return max([own] + parts)
+
+
+def evaluate_ast(strategy, columns: Mapping[str, Any],
+                 cache: Optional[Dict] = None, indicators=None) -> Dict[str, np.ndarray]:
+    """Entry/exit bool arrays for a StrategyNode over column arrays."""
+
+    return Interpreter(columns, cache, indicators).signals(strategy)
+
+
+def evaluate_strategy_ast(strategy, df, indicators=None) -> Dict[str, Any]:
+    """
+    Drop-in for a generated `evaluate_strategy(df)`: walks the AST instead
+    of exec'ing source. DataFrames give bool Series on df.index, plain
+    column mappings give bool arrays.
+    """
+
+    signals = evaluate_ast(strategy, df, indicators=indicators)
+
+    if isinstance(df, pd.DataFrame):
+        return {
+            "entry": pd.Series(signals["entry"], index=df.index),
+            "exit": pd.Series(signals["exit"], index=df.index),
+        }
+
+    return signals
+
+
+def load_interpreter(strategy, indicators=None):
+    """Same contract as codegen.cache.EvaluatorCache.get, without generating Python source."""
+
+    def evaluate_strategy(df):
+        return evaluate_strategy_ast(strategy, df, indicators)
+
+    return evaluate_strategy
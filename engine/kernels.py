@@ -0,0 +1,311 @@
+"""
+NumPy indicator kernels.
+
+Every kernel takes float arrays with time along axis 0 (1-D, or 2-D
+time x symbol) and returns a float array of the same shape, in O(n).
+codegen.runtime wraps the same kernels for generated evaluators, and
+dsl.indicators maps indicator names to them.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Tuple
+import numpy as np
+import pandas as pd
+
+
+def as_float(values) -> np.ndarray:
+    """View/convert any column to a float64 array."""
+
+    return np.asarray(values, dtype=float)
+
+
+def shift(x: np.ndarray, offset: int) -> np.ndarray:
+    """Equivalent of Series.shift(offset) for a float array."""
+
+    offset = int(offset)
+    out = np.empty_like(x)
+
+    if offset <= 0:
+        out[:] = x
+        return out
+
+    out[:offset] = np.nan
+    out[offset:] = x[:-offset] if offset < len(x) else x[:0]
+    return out
+
+
+def _frame(x: np.ndarray):
+    """pandas view of an array, time along axis 0."""
+
+    return pd.DataFrame(x) if x.ndim == 2 else pd.Series(x)
+
+
+def sma(x: np.ndarray, period) -> np.ndarray:
+    """Simple Moving Average (rolling mean, min_periods=1)."""
+
+    period = int(period)
+
+    return _frame(x).rolling(window=period, min_periods=1).mean().to_numpy()
+
+
+def stddev(x: np.ndarray, period) -> np.ndarray:
+    """Rolling population standard deviation (ddof=0, min_periods=1)."""
+
+    period = int(period)
+
+    return _frame(x).rolling(window=period, min_periods=1).std(ddof=0).to_numpy()
+
+
+def _rolling_extreme(x: np.ndarray, period, ufunc) -> np.ndarray:
+    """
+    Rolling max/min (min_periods=1) in O(n) regardless of the period,
+    van Herk/Gil-Werman style: per-block prefix and suffix extremes,
+    two lookups per window. NaNs are skipped like pandas does.
+    """
+
+    period = int(period)
+    n = len(x)
+
+    if period <= 1 or n == 0:
+        return np.array(x, dtype=float)
+
+    rest = x.shape[1:]
+    padded = np.concatenate((np.full((period - 1,) + rest, np.nan), x))
+
+    blocks = -(-len(padded) // period)
+    tail = np.full((blocks * period - len(padded),) + rest, np.nan)
+    grid = np.concatenate((padded, tail)).reshape((blocks, period) + rest)
+
+    prefix = ufunc.accumulate(grid, axis=1).reshape((-1,) + rest)
+    suffix = ufunc.accumulate(grid[:, ::-1], axis=1)[:, ::-1].reshape((-1,) + rest)
+
+    # Window of output i is padded[i : i + period]
+    return ufunc(suffix[:n], prefix[period - 1:period - 1 + n])
+
+
+def highest(x: np.ndarray, period) -> np.ndarray:
+    """Highest value over the last `period` bars."""
+
+    return _rolling_extreme(x, period, np.fmax)
+
+
+def lowest(x: np.ndarray, period) -> np.ndarray:
+    """Lowest value over the last `period` bars."""
+
+    return _rolling_extreme(x, period, np.fmin)
+
+
+def gains_losses(x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-bar up and down moves used by RSI."""
+
+    delta = x - shift(x, 1)
+    up = np.maximum(delta, 0.0)
+    down = -np.minimum(delta, 0.0)
+
+    return up, down
+
+
+def ewm_mean(values: np.ndarray, alpha: float) -> np.ndarray:
+    """ewm(alpha=alpha, adjust=False).mean()."""
+
+    return _frame(values).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+
+
+def wilder(values: np.ndarray, period) -> np.ndarray:
+    """Wilder smoothing, i.e. ewm(alpha=1/period, adjust=False).mean()."""
+
+    return ewm_mean(values, 1 / int(period))
+
+
+def ewm_continue(values: np.ndarray, alpha: float, seed=None) -> np.ndarray:
+    """
+    Exponential smoothing that picks up where an earlier run stopped.
+
+    `seed` is (last smoothed value, NaN inputs seen since it). Replaying
+    it in front of `values` reproduces pandas' weights exactly, so the
+    result equals smoothing the whole series in one go.
+    """
+
+    if seed is None:
+        return ewm_mean(values, alpha)
+
+    last, gap = seed
+    head = np.full(1 + gap, np.nan)
+    head[0] = last
+
+    return ewm_mean(np.concatenate((head, values)), alpha)[1 + gap:]
+
+
+def ewm_seed(values: np.ndarray, smoothed: np.ndarray, seed=None):
+    """Seed for ewm_continue after `values` were smoothed into `smoothed`."""
+
+    observed = np.flatnonzero(~np.isnan(values))
+
+    if len(observed):
+        return float(smoothed[observed[-1]]), int(len(values) - 1 - observed[-1])
+
+    if seed is None:
+        return float("nan"), 0
+
+    return seed[0], seed[1] + len(values)
+
+
+@dataclass(frozen=True)
+class Smoothing:
+    """
+    A recursive indicator written as
+
+        inputs --pre--> streams --ewm(alpha)--> smoothed --post--> output
+
+    `pre` looks back `history` bars. Splitting it this way lets chunked
+    evaluation carry only the smoothed state across chunk boundaries.
+    """
+
+    pre: Callable
+    history: int
+    alpha: Callable
+    post: Callable
+
+
+def smooth(smoothing: Smoothing, inputs, params) -> np.ndarray:
+    """Run a Smoothing over full-length inputs."""
+
+    alpha = smoothing.alpha(*params)
+    streams = smoothing.pre(*inputs)
+
+    return smoothing.post(*(ewm_mean(s, alpha) for s in streams))
+
+
+def rsi_from_averages(ma_up: np.ndarray, ma_down: np.ndarray) -> np.ndarray:
+
+    rs = ma_up / np.where(ma_down == 0, 1e-9, ma_down)
+
+    return 100 - (100 / (1 + rs))
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """max(high - low, |high - prev close|, |low - prev close|), NaNs skipped."""
+
+    prev_close = shift(close, 1)
+
+    return np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+
+RSI_SMOOTHING = Smoothing(
+    pre=gains_losses,
+    history=1,
+    alpha=lambda period: 1 / int(period),
+    post=rsi_from_averages,
+)
+
+EMA_SMOOTHING = Smoothing(
+    pre=lambda x: (x,),
+    history=0,
+    alpha=lambda period: 2 / (int(period) + 1),
+    post=lambda smoothed: smoothed,
+)
+
+ATR_SMOOTHING = Smoothing(
+    pre=lambda high, low, close: (true_range(high, low, close),),
+    history=1,
+    alpha=lambda period: 1 / int(period),
+    post=lambda smoothed: smoothed,
+)
+
+
+def rsi(x: np.ndarray, period) -> np.ndarray:
+    """Compute RSI using a standard Wilder-like formula."""
+
+    return smooth(RSI_SMOOTHING, (x,), (period,))
+
+
+def rsi_family(x: np.ndarray, periods: Iterable) -> Dict[int, np.ndarray]:
+    """RSI for many periods sharing the up/down moves."""
+
+    up, down = gains_losses(x)
+
+    return {
+        int(p): rsi_from_averages(wilder(up, p), wilder(down, p))
+        for p in periods
+    }
+
+
+def ema(x: np.ndarray, period) -> np.ndarray:
+    """Exponential Moving Average, alpha = 2 / (period + 1)."""
+
+    return smooth(EMA_SMOOTHING, (x,), (period,))
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period) -> np.ndarray:
+    """Average True Range with Wilder smoothing."""
+
+    return smooth(ATR_SMOOTHING, (high, low, close), (period,))
+
+
+# Composite indicators. `parts` are the intermediates listed for them in
+# dsl.indicators; callers that already hold them pass them in so shared
+# EMAs/SMAs are computed once.
+
+def macd(x: np.ndarray, fast, slow, parts=None) -> np.ndarray:
+    """MACD line: EMA(fast) - EMA(slow). parts = (fast EMA, slow EMA)."""
+
+    if parts is None:
+        parts = (ema(x, fast), ema(x, slow))
+
+    return parts[0] - parts[1]
+
+
+def _macd_parts(x, fast, slow, signal, parts):
+
+    if parts is None:
+        line = macd(x, fast, slow)
+        parts = (line, ema(line, signal))
+
+    return parts
+
+
+def macd_signal(x: np.ndarray, fast, slow, signal, parts=None) -> np.ndarray:
+    """EMA(signal) of the MACD line. parts = (MACD line, its EMA)."""
+
+    return _macd_parts(x, fast, slow, signal, parts)[1]
+
+
+def macd_hist(x: np.ndarray, fast, slow, signal, parts=None) -> np.ndarray:
+    """MACD line minus its signal line. parts = (MACD line, its EMA)."""
+
+    line, signal_line = _macd_parts(x, fast, slow, signal, parts)
+
+    return line - signal_line
+
+
+def bb_middle(x: np.ndarray, period, parts=None) -> np.ndarray:
+    """Middle Bollinger band (the SMA). parts = (SMA,)."""
+
+    if parts is None:
+        parts = (sma(x, period),)
+
+    return parts[0]
+
+
+def _bb_parts(x, period, parts):
+
+    if parts is None:
+        parts = (sma(x, period), stddev(x, period))
+
+    return parts
+
+
+def bb_upper(x: np.ndarray, period, width, parts=None) -> np.ndarray:
+    """SMA + width * STDDEV. parts = (SMA, STDDEV)."""
+
+    middle, deviation = _bb_parts(x, period, parts)
+
+    return middle + float(width) * deviation
+
+
+def bb_lower(x: np.ndarray, period, width, parts=None) -> np.ndarray:
+    """SMA - width * STDDEV. parts = (SMA, STDDEV)."""
+
+    middle, deviation = _bb_parts(x, period, parts)
+
+    return middle - float(width) * deviation
@@ -0,0 +1,277 @@
+"""
+Cost-ordered, short-circuiting signal evaluation.
+
+    signals = evaluate_planned(strategy, columns)
+
+gives the same entry/exit masks as evaluate_ast, but treats every block
+(OR of its rules) and every AND/OR chain inside a rule as a list of
+terms to evaluate cheapest first:
+
+    - a term's cost is an estimate of the kernel work it still needs
+      (column comparisons ~1, rolling and recursive indicators far more,
+      anything already in the cache 0), re-estimated after each term so
+      shared subexpressions count once
+    - once the chain is decided on every row (all True for OR, all False
+      for AND) the remaining terms are not evaluated at all
+    - when only a few rows are still undecided, the next term is
+      evaluated on those rows only
+
+Restricted evaluation is exact: columns, lookbacks, CROSS and
+HIGHEST/LOWEST over a column are gathered for the given rows; other
+indicators depend on their whole history (rolling sums, ewm state), so
+they are computed in full once and indexed. A `volume > 1e6 AND
+RSI(close, 14) < 30` rule therefore never computes the RSI when no bar
+passes the volume filter, and only compares it on the bars that do.
+"""
+
+from typing import Any, Dict, List, Mapping, Optional
+import numpy as np
+import pandas as pd
+
+from dsl.indicators import get_indicator_spec, split_args
+from engine.interpreter import Interpreter, _COMPARE
+from parser.ast_nodes import (
+    IdentifierNode,
+    NumberNode,
+    BooleanNode,
+    LookbackNode,
+    IndicatorCallNode,
+    CompareNode,
+    LogicalOpNode,
+    CrossNode,
+    node_key,
+    call_key,
+)
+
+
+# Rough kernel cost per bar, relative to one column comparison
+INDICATOR_COSTS: Dict[str, float] = {
+    "SMA": 30.0,
+    "STDDEV": 40.0,
+    "HIGHEST": 25.0,
+    "LOWEST": 25.0,
+    "EMA": 20.0,
+    "RSI": 60.0,
+    "ATR": 40.0,
+}
+
+# Composites: the cost of combining their parts (parts are costed separately)
+_COMBINE_COST = 3.0
+_DEFAULT_COST = 50.0
+
+# Window gathers of HIGHEST/LOWEST restricted to rows (same NaN handling as the kernels)
+_WINDOW_REDUCE = {"HIGHEST": np.fmax, "LOWEST": np.fmin}
+
+# Restrict a term to the undecided rows when they are at most this share of all bars
+SPARSE_FRACTION = 0.25
+
+
+class PlannedInterpreter(Interpreter):
+    """Interpreter whose masks evaluate the cheapest terms first and stop early."""
+
+    def __init__(self, columns: Mapping[str, Any], cache: Optional[Dict] = None,
+                 indicators=None, sparse_fraction: float = SPARSE_FRACTION):
+        super().__init__(columns, cache, indicators)
+        self.sparse_fraction = sparse_fraction
+
+
+    def mask(self, rules) -> np.ndarray:
+        """OR of a rule list, cheapest rules first, stopping once all bars are True."""
+
+        return self.chain("OR", list(rules), None)
+
+
+    def condition(self, node, rows: Optional[np.ndarray]) -> np.ndarray:
+        """Bool values of a condition on `rows` (all bars when None)."""
+
+        if isinstance(node, LogicalOpNode):
+            if node.op == "NOT":
+                return np.logical_not(self.condition(node.right, rows))
+            return self.chain(node.op, _flatten(node, node.op), rows)
+
+        if rows is None:
+            return np.broadcast_to(self.value(node), self.length)
+
+        if isinstance(node, CompareNode):
+            values = _COMPARE[node.op](self.value_at(node.left, rows), self.value_at(node.right, rows))
+            return np.broadcast_to(values, len(rows))
+
+        if isinstance(node, CrossNode):
+            left = self.value_at(node.left, rows)
+            right = self.value_at(node.right, rows)
+            prev_left = self.value_at(node.left, rows - 1)
+            prev_right = self.value_at(node.right, rows - 1)
+
+            if node.direction.upper() == "ABOVE":
+                values = (prev_left < prev_right) & (left >= right)
+            else:
+                values = (prev_left > prev_right) & (left <= right)
+            return np.broadcast_to(values, len(rows))
+
+        if isinstance(node, BooleanNode):
+            return np.full(len(rows), bool(node.value))
+
+        return _take(self.value(node), rows)
+
+
+    def chain(self, op: str, terms: List, rows: Optional[np.ndarray]) -> np.ndarray:
+        """
+        AND/OR of `terms` on `rows`. Stops when every row is decided, and
+        passes only the open rows on once few of them are left.
+        """
+
+        absorbing = op == "OR"          # True decides an OR, False an AND
+        size = self.length if rows is None else len(rows)
+        pending = list(terms)
+        result = None
+
+        while pending:
+
+            term = min(pending, key=self.cost)
+            pending.remove(term)
+
+            if result is None:
+                result = np.array(self.condition(term, rows), dtype=bool)
+                continue
+
+            undecided = size - np.count_nonzero(result) if absorbing else np.count_nonzero(result)
+            if undecided == 0:
+                break
+
+            if rows is None and undecided > self.sparse_fraction * size:
+                if absorbing:
+                    result |= self.condition(term, None)
+                else:
+                    result &= self.condition(term, None)
+                continue
+
+            open_rows = np.flatnonzero(result != absorbing)
+            values = self.condition(term, open_rows if rows is None else rows[open_rows])
+            result[open_rows[values == absorbing]] = absorbing
+
+        return np.full(size, not absorbing) if result is None else result
+
+
+    def value_at(self, node, rows: np.ndarray):
+        """
+        Operand values on `rows` (scalars stay scalars). Rows before the
+        first bar read as NaN, so `rows - 1` gives the previous bar.
+        """
+
+        if isinstance(node, NumberNode):
+            return float(node.value)
+
+        if isinstance(node, IdentifierNode):
+            return _take(self.column(node.name), rows)
+
+        if isinstance(node, LookbackNode):
+            return _take(self.column(node.name), rows - int(node.offset))
+
+        if isinstance(node, IndicatorCallNode):
+            key = node_key(node)
+            name = node.name.upper()
+
+            if key not in self.cache and name in _WINDOW_REDUCE:
+                series, params = split_args(name, node.args)
+                if isinstance(series[0], (IdentifierNode, LookbackNode)):
+                    return self._window_at(name, series[0], int(params[0].value), rows)
+
+            return _take(self.value(node), rows)
+
+        return _take(np.broadcast_to(self.value(node), self.length), rows)
+
+
+    def _window_at(self, name, series, period, rows):
+        """HIGHEST/LOWEST on `rows` from the last `period` bars of each."""
+
+        period = max(period, 1)
+        window = rows[:, None] - np.arange(period)[::-1]
+        values = self.value_at(series, window.ravel()).reshape(window.shape)
+
+        return _WINDOW_REDUCE[name].reduce(values, axis=1)
+
+
+    def cost(self, node) -> float:
+        """Estimated work left to evaluate a node on all bars."""
+
+        if isinstance(node, (IdentifierNode, NumberNode, BooleanNode)) or node is None:
+            return 0.0
+
+        if isinstance(node, LookbackNode):
+            return 1.0
+
+        if isinstance(node, IndicatorCallNode):
+            series, params = split_args(node.name, node.args)
+            keys = [node_key(arg) for arg in series]
+            params = [arg.value for arg in params]
+
+            return sum(self.cost(arg) for arg in series) + self._call_cost(node.name.upper(), keys, params)
+
+        if isinstance(node, LogicalOpNode):
+            return self.cost(node.left) + self.cost(node.right)
+
+        if isinstance(node, (CompareNode, CrossNode)):
+            return 1.0 + self.cost(node.left) + self.cost(node.right)
+
+        return _DEFAULT_COST
+
+
+    def _call_cost(self, name, keys, params) -> float:
+
+        key = call_key(name, keys, params)
+        if key in self.cache:
+            return 0.0
+
+        spec = get_indicator_spec(name)
+        if spec.parts is None:
+            return INDICATOR_COSTS.get(name, _DEFAULT_COST)
+
+        total, part_keys = _COMBINE_COST, []
+
+        for part, source, part_params in spec.parts(*params):
+            src_keys = keys if source is None else [part_keys[source]]
+            total += self._call_cost(part, src_keys, part_params)
+            part_keys.append(call_key(part, src_keys, part_params))
+
+        return total
+
+
+def _flatten(node, op: str) -> List:
+    """Operands of a chain of the same AND/OR."""
+
+    if isinstance(node, LogicalOpNode) and node.op == op:
+        return _flatten(node.left, op) + _flatten(node.right, op)
+    return [node]
+
+
+def _take(values: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """values[rows], NaN where a row is before the first bar."""
+
+    if len(rows) == 0 or rows.min() >= 0:
+        return values[rows]
+
+    out = np.full(rows.shape, np.nan)
+    valid = rows >= 0
+    out[valid] = values[rows[valid]]
+    return out
+
+
+def evaluate_planned(strategy, columns: Mapping[str, Any],
+                     cache: Optional[Dict] = None, indicators=None) -> Dict[str, np.ndarray]:
+    """evaluate_ast with cost-ordered, short-circuiting rule evaluation."""
+
+    return PlannedInterpreter(columns, cache, indicators).signals(strategy)
+
+
+def load_planned(strategy):
+    """Same contract as engine.interpreter.load_interpreter, using the planner."""
+
+    def evaluate_strategy(df):
+        signals = evaluate_planned(strategy, df)
+
+        if isinstance(df, pd.DataFrame):
+            return {name: pd.Series(mask, index=df.index) for name, mask in signals.items()}
+
+        return signals
+
+    return evaluate_strategy
@@ -0,0 +1,429 @@
+"""
+Cross-sectional live scanner.
+
+Same compiled operation list as engine.streaming, but every state is an
+array shaped (n_symbols,): one vectorized step per incoming bar batch
+updates the whole universe, then the rule tree is evaluated across the
+cross-section. Values match StreamingEvaluator (and so the batch path)
+symbol by symbol. HIGHEST/LOWEST reduce a (period, n_symbols) buffer,
+O(period) per bar but vectorized; composite indicators reuse
+engine.streaming's op, which works on arrays as is.
+"""
+
+from collections import deque
+from typing import Any, Dict, List, Sequence
+import numpy as np
+import pandas as pd
+
+from engine import streaming
+from engine.streaming import StreamingEvaluator, _INV_COND_TOL
+
+
+class _Column:
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+    def step(self, bar, values):
+        return np.asarray(bar[self.name], dtype=float)
+
+
+class _Constant:
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def step(self, bar, values):
+        return self.value
+
+
+class _Lag:
+    """Ring buffer of the last offset+1 cross-sections."""
+
+    __slots__ = ("src", "offset", "buffer", "pos", "seen")
+
+    def __init__(self, src, offset):
+        self.src = src
+        self.offset = int(offset)
+        self.buffer = None
+        self.pos = 0
+        self.seen = 0
+
+    def step(self, bar, values):
+        cur = values[self.src]
+
+        if self.buffer is None:
+            self.buffer = np.full((self.offset + 1, len(cur)), np.nan)
+
+        self.buffer[self.pos] = cur
+        self.pos = (self.pos + 1) % (self.offset + 1)
+        self.seen += 1
+
+        if self.seen <= self.offset:
+            return np.full(len(cur), np.nan)
+        return self.buffer[self.pos].copy()
+
+
+class _Sma:
+    """Rolling mean, min_periods=1, pandas' add/remove scheme per symbol."""
+
+    __slots__ = ("src", "period", "buffer", "pos", "seen", "nobs", "total", "neg_ct",
+                 "comp_add", "comp_remove", "same_run", "prev_value")
+
+    def __init__(self, src, period):
+        self.src = src
+        self.period = int(period)
+        self.buffer = None
+        self.pos = 0
+        self.seen = 0
+
+    def _start(self, val):
+        n = len(val)
+        self.buffer = np.full((self.period, n), np.nan)
+        self.nobs = np.zeros(n, dtype=np.int64)
+        self.total = np.zeros(n)
+        self.neg_ct = np.zeros(n, dtype=np.int64)
+        self.comp_add = np.zeros(n)
+        self.comp_remove = np.zeros(n)
+        self.same_run = np.zeros(n, dtype=np.int64)
+        self.prev_value = val.copy()
+
+    def step(self, bar, values):
+        val = values[self.src]
+
+        if self.buffer is None:
+            self._start(val)
+
+        if self.seen >= self.period:
+            self._remove(self.buffer[self.pos])
+
+        self.buffer[self.pos] = val
+        self.pos = (self.pos + 1) % self.period
+        self.seen += 1
+        self._add(val)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            result = self.total / self.nobs
+
+        result = np.where(self.neg_ct == self.nobs, np.where(result > 0, 0.0, result), result)
+        result = np.where(self.neg_ct == 0, np.where(result < 0, 0.0, result), result)
+        result = np.where(self.same_run >= self.nobs, self.prev_value, result)
+
+        return np.where(self.nobs > 0, result, np.nan)
+
+    def _add(self, val):
+        valid = val == val
+
+        self.nobs += valid
+        y = val - self.comp_add
+        t = self.total + y
+        self.comp_add = np.where(valid, t - self.total - y, self.comp_add)
+        self.total = np.where(valid, t, self.total)
+        self.neg_ct += valid & np.signbit(val)
+
+        same = val == self.prev_value
+        self.same_run = np.where(valid, np.where(same, self.same_run + 1, 1), self.same_run)
+        self.prev_value = np.where(valid, val, self.prev_value)
+
+    def _remove(self, val):
+        valid = val == val
+
+        self.nobs -= valid
+        y = -val - self.comp_remove
+        t = self.total + y
+        self.comp_remove = np.where(valid, t - self.total - y, self.comp_remove)
+        self.total = np.where(valid, t, self.total)
+        self.neg_ct -= valid & np.signbit(val)
+
+
+class _Stddev:
+    """Rolling population std, pandas' roll_var per symbol (see engine.streaming._Stddev)."""
+
+    __slots__ = ("src", "period", "window", "nobs", "mean", "ssq",
+                 "comp_add", "comp_remove", "unstable")
+
+    def __init__(self, src, period):
+        self.src = src
+        self.period = int(period)
+        self.window = None
+
+    def step(self, bar, values):
+        val = values[self.src]
+        n = len(val)
+
+        first = self.window is None
+        if first:
+            self.window = deque()
+            self.nobs = np.zeros(n, dtype=np.int64)
+            self.mean, self.ssq = np.zeros(n), np.zeros(n)
+            self.comp_add, self.comp_remove = np.zeros(n), np.zeros(n)
+            self.unstable = np.zeros(n, dtype=bool)
+
+        old = self.window.popleft() if len(self.window) == self.period else None
+        self.window.append(val)
+
+        recompute = first or self.period == 1
+
+        if not recompute:
+            if old is not None:
+                self._remove(old)
+            self._add(val)
+
+        redo = np.full(n, True) if recompute else self.unstable.copy()
+
+        if redo.any():
+            for state in (self.nobs, self.mean, self.ssq, self.comp_add, self.comp_remove):
+                state[redo] = 0
+            self.unstable[redo] = False
+            for row in self.window:
+                self._add(row, redo)
+            self.unstable[redo] = False
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            var = self.ssq / self.nobs
+            std = np.where(var < 0, 0.0, np.sqrt(var))
+
+        return np.where(self.nobs > 0, std, np.nan)
+
+    def _add(self, val, mask=None):
+        valid = val == val
+        if mask is not None:
+            valid &= mask
+
+        prev_m2 = self.ssq
+        nobs = self.nobs + valid
+        prev_mean = self.mean - self.comp_add
+        y = val - self.comp_add
+        t = y - self.mean
+        comp = t + self.mean - y
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = self.mean + t / nobs
+        ssq = self.ssq + (val - prev_mean) * (val - mean)
+
+        self.nobs = nobs
+        self.comp_add = np.where(valid, comp, self.comp_add)
+        self.mean = np.where(valid, mean, self.mean)
+        self.ssq = np.where(valid, ssq, self.ssq)
+        self.unstable |= valid & (prev_m2 * _INV_COND_TOL > self.ssq)
+
+    def _remove(self, val):
+        valid = val == val
+
+        prev_m2 = self.ssq
+        nobs = self.nobs - valid
+        keep = valid & (nobs > 0)
+        emptied = valid & (nobs == 0)
+
+        prev_mean = self.mean - self.comp_remove
+        y = val - self.comp_remove
+        t = y - self.mean
+        comp = t + self.mean - y
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = self.mean - t / nobs
+        ssq = self.ssq - (val - prev_mean) * (val - mean)
+
+        self.nobs = nobs
+        self.comp_remove = np.where(keep, comp, self.comp_remove)
+        self.mean = np.where(keep, mean, np.where(emptied, 0.0, self.mean))
+        self.ssq = np.where(keep, ssq, np.where(emptied, 0.0, self.ssq))
+        self.unstable = np.where(emptied, False, self.unstable | (keep & (prev_m2 * _INV_COND_TOL > self.ssq)))
+
+
+class _Extreme:
+    """Rolling max/min (NaNs skipped) over a (period, n_symbols) ring buffer."""
+
+    __slots__ = ("src", "period", "ufunc", "buffer", "pos")
+
+    def __init__(self, src, period, ufunc=np.fmax):
+        self.src = src
+        self.period = int(period)
+        self.ufunc = ufunc
+        self.buffer = None
+        self.pos = 0
+
+    def step(self, bar, values):
+        val = values[self.src]
+
+        if self.buffer is None:
+            self.buffer = np.full((self.period, len(val)), np.nan)
+
+        self.buffer[self.pos] = val
+        self.pos = (self.pos + 1) % self.period
+
+        return self.ufunc.reduce(self.buffer, axis=0)
+
+
+def _highest(src, period):
+    return _Extreme(src, period, np.fmax)
+
+
+def _lowest(src, period):
+    return _Extreme(src, period, np.fmin)
+
+
+class _Ewm:
+    """ewm(alpha=alpha, adjust=False).mean(), one step for every symbol (see engine.streaming._Ewm)."""
+
+    __slots__ = ("alpha", "old_wt_factor", "com_one", "new_wt", "weighted", "old_wt", "nobs")
+
+    def __init__(self, alpha):
+        com = (1 - alpha) / alpha
+        self.alpha = 1 / (1 + com)
+        self.old_wt_factor = 1 - self.alpha
+        self.com_one = com == 1
+        self.weighted = None
+
+    def step(self, cur):
+        is_obs = cur == cur
+
+        if self.weighted is None:
+            self.weighted = cur.copy()
+            self.old_wt = np.ones(len(cur))
+            self.new_wt = np.full(len(cur), self.alpha)
+            self.nobs = is_obs.astype(np.int64)
+            return np.where(self.nobs > 0, self.weighted, np.nan)
+
+        self.nobs += is_obs
+        has = self.weighted == self.weighted
+
+        self.old_wt = np.where(has, self.old_wt * self.old_wt_factor, self.old_wt)
+
+        update = has & is_obs & (self.weighted != cur)
+        if self.com_one:
+            self.new_wt = np.where(update, 1 - self.old_wt, self.new_wt)
+
+        with np.errstate(invalid="ignore"):
+            blended = (self.old_wt * self.weighted + self.new_wt * cur) / (self.old_wt + self.new_wt)
+
+        self.weighted = np.where(update, blended, self.weighted)
+        self.old_wt = np.where(has & is_obs, 1.0, self.old_wt)
+        self.weighted = np.where(~has & is_obs, cur, self.weighted)
+
+        return np.where(self.nobs > 0, self.weighted, np.nan)
+
+
+class _Smoothed(streaming._Smoothed):
+    """Recursive indicator over (time, n_symbols) input rows."""
+
+    __slots__ = ()
+
+    ewm_op = _Ewm
+
+    @staticmethod
+    def output(value):
+        return np.asarray(value, dtype=float)
+
+
+class _Compare:
+    __slots__ = ("left", "op", "right")
+
+    _OPS = {
+        ">": np.greater,
+        "<": np.less,
+        ">=": np.greater_equal,
+        "<=": np.less_equal,
+        "==": np.equal,
+    }
+
+    def __init__(self, left, op, right):
+        self.left = left
+        self.op = self._OPS[op]
+        self.right = right
+
+    def step(self, bar, values):
+        return self.op(values[self.left], values[self.right])
+
+
+class _Logical:
+    __slots__ = ("op", "left", "right")
+
+    def __init__(self, op, left, right):
+        self.op = op
+        self.left = left
+        self.right = right
+
+    def step(self, bar, values):
+
+        if self.op == "NOT":
+            return np.logical_not(values[self.right])
+        if self.op == "AND":
+            return np.logical_and(values[self.left], values[self.right])
+        return np.logical_or(values[self.left], values[self.right])
+
+
+class _Cross:
+    __slots__ = ("left", "right", "prev_left", "prev_right", "above")
+
+    def __init__(self, left, right, prev_left, prev_right, direction):
+        self.left = left
+        self.right = right
+        self.prev_left = prev_left
+        self.prev_right = prev_right
+        self.above = direction.upper() == "ABOVE"
+
+    def step(self, bar, values):
+        l, r = values[self.left], values[self.right]
+        pl, pr = values[self.prev_left], values[self.prev_right]
+
+        if self.above:
+            return (pl < pr) & (l >= r)
+        return (pl > pr) & (l <= r)
+
+
+class UniverseScanner(StreamingEvaluator):
+    """
+    Streaming evaluator over a whole universe.
+
+        scanner = UniverseScanner(ast, symbols)
+        hits = scanner.scan(bars)   # bars: field -> (n_symbols,) array, or a
+                                    # DataFrame indexed by symbol
+    """
+
+    column_op = _Column
+    constant_op = _Constant
+    lag_op = _Lag
+    compare_op = _Compare
+    logical_op = _Logical
+    cross_op = _Cross
+    smoothed_op = _Smoothed
+    indicator_ops = {
+        "SMA": _Sma,
+        "STDDEV": _Stddev,
+        "HIGHEST": _highest,
+        "LOWEST": _lowest,
+    }
+
+    def __init__(self, strategy, symbols: Sequence[Any]):
+        super().__init__(strategy)
+        self.symbols = list(symbols)
+
+
+    def on_bar(self, bar) -> Dict[str, np.ndarray]:
+        """Advance every symbol by one bar; returns (n_symbols,) entry/exit masks."""
+
+        if isinstance(bar, pd.DataFrame):
+            bar = bar.reindex(self.symbols)
+
+        return super().on_bar(bar)
+
+
+    def scan(self, bar, block: str = "entry") -> List[Any]:
+        """Advance one bar and list the symbols whose `block` rules fire on it."""
+
+        hits = self.on_bar(bar)[block]
+
+        return [sym for sym, hit in zip(self.symbols, hits.tolist()) if hit]
+
+
+    def _combine(self, slots):
+
+        combined = np.zeros(len(self.symbols), dtype=bool)
+
+        for i in slots:
+            combined |= np.broadcast_to(self._values[i], combined.shape)
+
+        return combined
@@ -0,0 +1,262 @@
+"""
+Time-sharded parallel evaluation of one long series.
+
+    signals = evaluate_sharded(strategy, df, workers=8)
+
+The bars are split into consecutive shards, one per worker by default,
+and every shard is evaluated independently, indicators included, over
+its own bars plus the warm-up engine.interpreter.required_history
+reports in front of them (indicator windows, lookback offsets, one bar
+per CROSS).
+
+No warm-up reproduces the last bits of rolling sums (SMA, STDDEV,
+Bollinger bands: pandas keeps one compensated sum over the whole
+series) or of recursive smoothing (RSI, EMA, ATR, MACD). So each shard
+computes those calls, and whatever feeds them, from the first bar up to
+its own end, the full recompute IndicatorCache(exact=True) does on
+append. Signals then equal a single full-length run bit for bit, but
+the cost of those indicators grows with a shard's end rather than its
+length, so only the rest of the AST is spread across the workers.
+
+exact=False evaluates them from the warm-up too, lengthened for every
+smoother until the weight of its unknown starting state, (1 - alpha)^k,
+falls below double precision (shard_warmup). Everything is then
+parallel, but restarted sums and smoothers can round differently in
+the last bits, and a comparison between two mathematically equal values
+can come out the other way.
+
+The columns are placed once in shared memory; workers attach to them
+and write their shard's signals straight into shared output arrays, so
+a task is just the shard bounds.
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+from dsl.indicators import get_indicator_spec, split_args
+from engine import kernels
+from engine.chunked import referenced_columns
+from engine.interpreter import ROLLING_SUMS, Interpreter, column_length, required_history
+from parser.ast_nodes import IndicatorCallNode, CompareNode, LogicalOpNode, CrossNode
+from store.shared_columns import SharedColumns, attach_columns
+
+
+# Smallest shard worth a process of its own
+_MIN_SHARD_BARS = 100_000
+
+# Residual weight of a smoother's starting state that no longer shows in a double
+_SETTLED = np.finfo(float).eps / 2
+
+
+def shard_bounds(n_bars: int, shards: int) -> List[int]:
+    """Start of every shard plus n_bars, as evenly sized as possible."""
+
+    shards = max(min(shards, n_bars), 1)
+
+    return [n_bars * i // shards for i in range(shards + 1)]
+
+
+def shard_warmup(node) -> int:
+    """
+    Bars a shard needs in front of its own with exact=False:
+    required_history, plus the settling time of every recursive smoother
+    on the way.
+    """
+
+    if isinstance(node, IndicatorCallNode):
+        series, params = split_args(node.name, node.args)
+        base = max((shard_warmup(arg) for arg in series), default=0)
+
+        return base + _spec_warmup(node.name.upper(), [arg.value for arg in params])
+
+    if isinstance(node, (CompareNode, LogicalOpNode)):
+        return max(shard_warmup(node.left), shard_warmup(node.right))
+
+    if isinstance(node, CrossNode):
+        return max(shard_warmup(node.left), shard_warmup(node.right)) + 1
+
+    if hasattr(node, "rules"):
+        return max((shard_warmup(rule) for rule in node.rules), default=0)
+
+    if hasattr(node, "entry"):
+        return max(shard_warmup(node.entry), shard_warmup(node.exit))
+
+    return required_history(node)
+
+
+def evaluate_sharded(strategy, columns: Mapping[str, Any],
+                     workers: Optional[int] = None,
+                     shards: Optional[int] = None,
+                     exact: bool = True) -> Dict[str, Any]:
+    """
+    Entry/exit signals of a StrategyNode, evaluated in time shards across
+    a process pool. `workers` caps the pool (default: CPU count; 1 runs
+    the shards in this process); `shards` defaults to one per worker,
+    fewer for short series. exact=False trades bit-identical signals for
+    a fully parallel run (see the module docstring). DataFrames give
+    bool Series on df.index, column mappings give bool arrays.
+    """
+
+    data = {name: kernels.as_float(columns[name]) for name in sorted(referenced_columns(strategy))}
+    n = column_length(columns)
+
+    workers = workers or os.cpu_count() or 1
+    if shards is None:
+        shards = min(workers, max(n // _MIN_SHARD_BARS, 1))
+
+    bounds = shard_bounds(n, shards)
+    tasks = list(zip(bounds, bounds[1:]))
+    warmup = required_history(strategy) if exact else shard_warmup(strategy)
+
+    workers = min(workers, len(tasks))
+
+    if workers <= 1:
+        signals = {"entry": np.zeros(n, dtype=bool), "exit": np.zeros(n, dtype=bool)}
+        runner = _ShardRunner(strategy, data, signals, warmup, exact)
+        for task in tasks:
+            runner(task)
+    else:
+        signals = _run_shared(strategy, data, tasks, warmup, exact, n, workers)
+
+    if isinstance(columns, pd.DataFrame):
+        return {name: pd.Series(mask, index=columns.index) for name, mask in signals.items()}
+
+    return signals
+
+
+def _run_shared(strategy, data, tasks, warmup, exact, n, workers) -> Dict[str, np.ndarray]:
+    """Evaluate the shards in a pool over shared input and output arrays."""
+
+    outputs = {"entry": np.zeros(n, dtype=bool), "exit": np.zeros(n, dtype=bool)}
+
+    with SharedColumns(data) as inputs, SharedColumns(outputs) as signals:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_worker,
+                                 initargs=(strategy, inputs.layout, signals.layout, warmup, exact)) as pool:
+            list(pool.map(_run_shard, tasks))
+
+        return {name: mask.copy() for name, mask in signals.arrays.items()}
+
+
+class _ShardRunner:
+    """Evaluates shards of one strategy and writes their signals into `out`."""
+
+    def __init__(self, strategy, columns: Mapping[str, np.ndarray],
+                 out: Mapping[str, np.ndarray], warmup: int, exact: bool = True):
+        self.strategy = strategy
+        self.columns = columns
+        self.out = out
+        self.warmup = warmup
+        self.exact = exact
+
+
+    def __call__(self, task: Tuple[int, int]) -> None:
+
+        begin, end = task
+        start = max(begin - self.warmup, 0)
+
+        if self.exact:
+            interpreter = _ShardInterpreter(self.columns, start, end)
+        else:
+            interpreter = Interpreter({name: values[start:end] for name, values in self.columns.items()})
+        interpreter.length = end - start
+
+        signals = interpreter.signals(self.strategy)
+
+        for name, mask in signals.items():
+            self.out[name][begin:end] = mask[begin - start:]
+
+
+class _ShardInterpreter(Interpreter):
+    """
+    Interpreter over rows [start, end) that takes rolling sums and
+    smoothers (and everything under them) from a run over rows [0, end).
+    """
+
+    def __init__(self, columns: Mapping[str, np.ndarray], start: int, end: int):
+        super().__init__({name: values[start:end] for name, values in columns.items()})
+        self.start = start
+        self.prefix = Interpreter({name: values[:end] for name, values in columns.items()})
+
+    def indicator(self, node: IndicatorCallNode) -> np.ndarray:
+
+        if not _from_start(node):
+            return super().indicator(node)
+
+        return self.prefix.value(node)[self.start:]
+
+
+def _from_start(node) -> bool:
+    """True if an indicator call, or one of its inputs, depends on every bar before it."""
+
+    if not isinstance(node, IndicatorCallNode):
+        return False
+
+    series, params = split_args(node.name, node.args)
+
+    return (_spec_from_start(node.name.upper(), [arg.value for arg in params])
+            or any(_from_start(arg) for arg in series))
+
+
+def _spec_from_start(name: str, params) -> bool:
+
+    spec = get_indicator_spec(name)
+
+    if name in ROLLING_SUMS or spec.smoothing is not None:
+        return True
+
+    return spec.parts is not None and any(
+        _spec_from_start(part, part_params) for part, _, part_params in spec.parts(*params))
+
+
+# -- pool workers -----------------------------------------------------------
+
+# Set once per worker process by _attach_worker: (runner, shared blocks)
+_WORKER: Optional[Tuple[_ShardRunner, list]] = None
+
+
+def _attach_worker(strategy, input_layout, output_layout, warmup, exact) -> None:
+
+    global _WORKER
+
+    input_blocks, columns = attach_columns(input_layout)
+    output_blocks, out = attach_columns(output_layout, writable=True)
+
+    _WORKER = (_ShardRunner(strategy, columns, out, warmup, exact), input_blocks + output_blocks)
+
+
+def _run_shard(task: Tuple[int, int]) -> None:
+
+    _WORKER[0](task)
+
+
+def _spec_warmup(name: str, params) -> int:
+    """Warm-up of one indicator, including that of its parts."""
+
+    spec = get_indicator_spec(name)
+    own = spec.history(*params)
+
+    if spec.smoothing is not None:
+        own += _settle(spec.smoothing.alpha(*params))
+
+    if spec.parts is None:
+        return own
+
+    parts = []
+    for part, source, part_params in spec.parts(*params):
+        base = 0 if source is None else parts[source]
+        parts.append(base + _spec_warmup(part, part_params))
+
+    return max([own] + parts)
+
+
+def _settle(alpha: float) -> int:
+    """Bars after which an ewm(alpha) no longer depends on its starting value."""
+
+    if alpha >= 1:
+        return 0
+
+    return math.ceil(math.log(_SETTLED) / math.log1p(-alpha))
@@ -0,0 +1,633 @@
+"""
+Streaming evaluation for live bars.
+
+The AST is compiled once into a flat list of operations in dependency
+order (shared subtrees appear once). Each stateful operation keeps just
+what the next bar needs:
+
+    SMA, STDDEV       ring buffer + compensated running sums
+    HIGHEST, LOWEST   monotonic deque of candidate extremes
+    RSI, EMA, ATR     the last history+1 inputs + ewm state per stream
+    MACD*, BB*        nothing: combined from the slots of their parts
+    lookback          ring buffer of the last `offset` values
+    CROSS             previous value of each side (a lookback of 1)
+
+so `on_bar` costs O(size of the AST), independent of history length
+(amortized: STDDEV rebuilds its window after a catastrophic cancellation,
+as pandas does). Arithmetic mirrors pandas' rolling mean/var and ewm
+step by step, NaN bars included, so the decisions match the batch
+evaluators bar for bar.
+"""
+
+import math
+import sys
+from collections import deque
+from typing import Any, Dict, List, Mapping
+import numpy as np
+
+from dsl.indicators import get_indicator_spec, split_args
+from parser.ast_nodes import (
+    IdentifierNode,
+    NumberNode,
+    BooleanNode,
+    LookbackNode,
+    IndicatorCallNode,
+    CompareNode,
+    LogicalOpNode,
+    CrossNode,
+    node_key,
+    call_key,
+)
+
+
+_NAN = float("nan")
+
+# pandas' roll_var recomputes a window once a removal leaves fewer than
+# ~3 significant digits
+_INV_COND_TOL = sys.float_info.epsilon * 1e3
+
+
+class _Column:
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+    def step(self, bar, values):
+        return float(bar[self.name])
+
+
+class _Constant:
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def step(self, bar, values):
+        return self.value
+
+
+class _Lag:
+    """Value of an input `offset` bars ago (NaN until enough bars)."""
+
+    __slots__ = ("src", "offset", "buffer")
+
+    def __init__(self, src, offset):
+        self.src = src
+        self.offset = int(offset)
+        self.buffer = deque(maxlen=self.offset + 1)
+
+    def step(self, bar, values):
+        self.buffer.append(values[self.src])
+
+        if len(self.buffer) <= self.offset:
+            return _NAN
+        return self.buffer[0]
+
+
+class _Sma:
+    """Rolling mean, min_periods=1, using pandas' add/remove scheme."""
+
+    __slots__ = ("src", "period", "buffer", "nobs", "total", "neg_ct",
+                 "comp_add", "comp_remove", "same_run", "prev_value")
+
+    def __init__(self, src, period):
+        self.src = src
+        self.period = int(period)
+        self.buffer = deque()
+        self.nobs = 0
+        self.total = 0.0
+        self.neg_ct = 0
+        self.comp_add = 0.0
+        self.comp_remove = 0.0
+        self.same_run = 0
+        self.prev_value = None
+
+    def step(self, bar, values):
+        val = values[self.src]
+
+        if self.prev_value is None:
+            self.prev_value = val
+
+        if len(self.buffer) == self.period:
+            self._remove(self.buffer.popleft())
+
+        self.buffer.append(val)
+        self._add(val)
+
+        if self.nobs == 0:
+            return _NAN
+
+        result = self.total / self.nobs
+
+        if self.same_run >= self.nobs:
+            result = self.prev_value
+        elif self.neg_ct == 0 and result < 0:
+            result = 0.0
+        elif self.neg_ct == self.nobs and result > 0:
+            result = 0.0
+
+        return result
+
+    def _add(self, val):
+
+        if val != val:
+            return
+
+        self.nobs += 1
+        y = val - self.comp_add
+        t = self.total + y
+        self.comp_add = t - self.total - y
+        self.total = t
+
+        if math.copysign(1.0, val) < 0:
+            self.neg_ct += 1
+
+        if val == self.prev_value:
+            self.same_run += 1
+        else:
+            self.same_run = 1
+        self.prev_value = val
+
+    def _remove(self, val):
+
+        if val != val:
+            return
+
+        self.nobs -= 1
+        y = -val - self.comp_remove
+        t = self.total + y
+        self.comp_remove = t - self.total - y
+        self.total = t
+
+        if math.copysign(1.0, val) < 0:
+            self.neg_ct -= 1
+
+
+class _Stddev:
+    """
+    Rolling population std (ddof=0, min_periods=1) using pandas' roll_var:
+    Welford updates with Kahan compensation, and a recompute from the
+    window whenever a removal cancels catastrophically.
+    """
+
+    __slots__ = ("src", "period", "buffer", "nobs", "mean", "ssq",
+                 "comp_add", "comp_remove", "unstable")
+
+    def __init__(self, src, period):
+        self.src = src
+        self.period = int(period)
+        self.buffer = deque()
+        self._reset()
+
+    def _reset(self):
+        self.nobs = 0
+        self.mean = 0.0
+        self.ssq = 0.0
+        self.comp_add = 0.0
+        self.comp_remove = 0.0
+        self.unstable = False
+
+    def step(self, bar, values):
+        val = values[self.src]
+
+        # pandas rebuilds the first window, and every window of period 1
+        recompute = self.period == 1 or not self.buffer
+
+        old = self.buffer.popleft() if len(self.buffer) == self.period else None
+        self.buffer.append(val)
+
+        if not recompute:
+            if old is not None:
+                self._remove(old)
+            self._add(val)
+
+        if recompute or self.unstable:
+            self._reset()
+            for x in self.buffer:
+                self._add(x)
+            self.unstable = False
+
+        if self.nobs == 0:
+            return _NAN
+
+        var = self.ssq / self.nobs
+
+        return math.sqrt(var) if var >= 0 else 0.0
+
+    def _add(self, val):
+
+        if val != val:
+            return
+
+        prev_m2 = self.ssq
+        self.nobs += 1
+        prev_mean = self.mean - self.comp_add
+        y = val - self.comp_add
+        t = y - self.mean
+        self.comp_add = t + self.mean - y
+        self.mean = self.mean + t / self.nobs
+        self.ssq = self.ssq + (val - prev_mean) * (val - self.mean)
+
+        if prev_m2 * _INV_COND_TOL > self.ssq:
+            self.unstable = True
+
+    def _remove(self, val):
+
+        if val != val:
+            return
+
+        prev_m2 = self.ssq
+        self.nobs -= 1
+
+        if self.nobs == 0:
+            self.mean = 0.0
+            self.ssq = 0.0
+            self.unstable = False
+            return
+
+        prev_mean = self.mean - self.comp_remove
+        y = val - self.comp_remove
+        t = y - self.mean
+        self.comp_remove = t + self.mean - y
+        self.mean = self.mean - t / self.nobs
+        self.ssq = self.ssq - (val - prev_mean) * (val - self.mean)
+
+        if prev_m2 * _INV_COND_TOL > self.ssq:
+            self.unstable = True
+
+
+class _Extreme:
+    """Rolling max/min (min_periods=1, NaNs skipped) with a monotonic deque."""
+
+    __slots__ = ("src", "period", "highest", "window", "seen")
+
+    def __init__(self, src, period, highest=True):
+        self.src = src
+        self.period = int(period)
+        self.highest = highest
+        self.window = deque()
+        self.seen = 0
+
+    def step(self, bar, values):
+        val = values[self.src]
+        i = self.seen
+        self.seen += 1
+
+        if val == val:
+            window = self.window
+            if self.highest:
+                while window and window[-1][1] <= val:
+                    window.pop()
+            else:
+                while window and window[-1][1] >= val:
+                    window.pop()
+            window.append((i, val))
+
+        while self.window and self.window[0][0] <= i - self.period:
+            self.window.popleft()
+
+        return self.window[0][1] if self.window else _NAN
+
+
+def _highest(src, period):
+    return _Extreme(src, period, highest=True)
+
+
+def _lowest(src, period):
+    return _Extreme(src, period, highest=False)
+
+
+class _Ewm:
+    """
+    One step of ewm(alpha=alpha, adjust=False).mean(), following pandas'
+    loop exactly: alpha goes through the centre of mass and back, and
+    for com == 1 the new weight tracks 1 - old weight.
+    """
+
+    __slots__ = ("alpha", "old_wt_factor", "com_one", "new_wt", "weighted", "old_wt", "nobs", "started")
+
+    def __init__(self, alpha):
+        com = (1 - alpha) / alpha
+        self.alpha = 1 / (1 + com)
+        self.old_wt_factor = 1 - self.alpha
+        self.com_one = com == 1
+        self.new_wt = self.alpha
+        self.weighted = _NAN
+        self.old_wt = 1.0
+        self.nobs = 0
+        self.started = False
+
+    def step(self, cur):
+        cur = float(cur)
+        is_obs = cur == cur
+
+        if not self.started:
+            self.started = True
+            self.weighted = cur
+            self.nobs = int(is_obs)
+            return self.weighted if self.nobs else _NAN
+
+        self.nobs += is_obs
+
+        if self.weighted == self.weighted:
+            self.old_wt *= self.old_wt_factor
+            if is_obs:
+                if self.weighted != cur:
+                    if self.com_one:
+                        self.new_wt = 1 - self.old_wt
+                    self.weighted = (self.old_wt * self.weighted + self.new_wt * cur) / (self.old_wt + self.new_wt)
+                self.old_wt = 1.0
+
+        elif is_obs:
+            self.weighted = cur
+
+        return self.weighted if self.nobs else _NAN
+
+
+class _Smoothed:
+    """
+    Recursive indicator (RSI, EMA, ATR) from its kernels.Smoothing: `pre`
+    over the last history+1 input rows, one ewm step per stream, `post`.
+    """
+
+    __slots__ = ("smoothing", "srcs", "alpha", "window", "ewms")
+
+    ewm_op = _Ewm
+
+    def __init__(self, smoothing, srcs, params):
+        self.smoothing = smoothing
+        self.srcs = srcs
+        self.alpha = smoothing.alpha(*params)
+        self.window = deque(maxlen=smoothing.history + 1)
+        self.ewms = None
+
+    def step(self, bar, values):
+        self.window.append(tuple(values[i] for i in self.srcs))
+
+        rows = np.array(self.window, dtype=float)
+        streams = self.smoothing.pre(*(rows[:, j] for j in range(len(self.srcs))))
+
+        if self.ewms is None:
+            self.ewms = [self.ewm_op(self.alpha) for _ in streams]
+
+        smoothed = [ewm.step(s[-1]) for ewm, s in zip(self.ewms, streams)]
+
+        return self.output(self.smoothing.post(*smoothed))
+
+    @staticmethod
+    def output(value):
+        return float(value)
+
+
+class _Composite:
+    """Composite indicator (MACD*, BB*) combined from the slots of its parts."""
+
+    __slots__ = ("kernel", "srcs", "params", "parts")
+
+    def __init__(self, kernel, srcs, params, parts):
+        self.kernel = kernel
+        self.srcs = srcs
+        self.params = params
+        self.parts = parts
+
+    def step(self, bar, values):
+        return self.kernel(*(values[i] for i in self.srcs), *self.params,
+                           parts=[values[i] for i in self.parts])
+
+
+# Rolling-window indicators; recursive and composite ones come from their
+# dsl.indicators spec (smoothing / parts)
+_STREAM_INDICATORS = {
+    "SMA": _Sma,
+    "STDDEV": _Stddev,
+    "HIGHEST": _highest,
+    "LOWEST": _lowest,
+}
+
+
+class _Compare:
+    __slots__ = ("left", "op", "right")
+
+    _OPS = {
+        ">": lambda a, b: a > b,
+        "<": lambda a, b: a < b,
+        ">=": lambda a, b: a >= b,
+        "<=": lambda a, b: a <= b,
+        "==": lambda a, b: a == b,
+    }
+
+    def __init__(self, left, op, right):
+        self.left = left
+        self.op = self._OPS[op]
+        self.right = right
+
+    def step(self, bar, values):
+        return self.op(values[self.left], values[self.right])
+
+
+class _Logical:
+    __slots__ = ("op", "left", "right")
+
+    def __init__(self, op, left, right):
+        self.op = op
+        self.left = left
+        self.right = right
+
+    def step(self, bar, values):
+
+        if self.op == "NOT":
+            return not values[self.right]
+        if self.op == "AND":
+            return bool(values[self.left]) and bool(values[self.right])
+        return bool(values[self.left]) or bool(values[self.right])
+
+
+class _Cross:
+    __slots__ = ("left", "right", "prev_left", "prev_right", "above")
+
+    def __init__(self, left, right, prev_left, prev_right, direction):
+        self.left = left
+        self.right = right
+        self.prev_left = prev_left
+        self.prev_right = prev_right
+        self.above = direction.upper() == "ABOVE"
+
+    def step(self, bar, values):
+        l, r = values[self.left], values[self.right]
+        pl, pr = values[self.prev_left], values[self.prev_right]
+
+        if self.above:
+            return pl < pr and l >= r
+        return pl > pr and l <= r
+
+
+class StreamingEvaluator:
+    """
+    Incremental evaluator for one strategy.
+
+        stream = StreamingEvaluator(ast)
+        for bar in feed:                      # bar: mapping column -> value
+            decision = stream.on_bar(bar)     # {'entry': bool, 'exit': bool}
+    """
+
+    # Operation classes; engine.scanner swaps in (n_symbols,) array versions
+    column_op = _Column
+    constant_op = _Constant
+    lag_op = _Lag
+    compare_op = _Compare
+    logical_op = _Logical
+    cross_op = _Cross
+    smoothed_op = _Smoothed
+    composite_op = _Composite
+    indicator_ops = _STREAM_INDICATORS
+
+    def __init__(self, strategy):
+        self._ops: List[Any] = []
+        self._slots: Dict[tuple, int] = {}
+
+        entry_rules = strategy.entry.rules if strategy.entry else []
+        exit_rules = strategy.exit.rules if strategy.exit else []
+
+        self._entry = [self._compile(rule) for rule in entry_rules]
+        self._exit = [self._compile(rule) for rule in exit_rules]
+        self._values: List[Any] = [None] * len(self._ops)
+        self.bars_seen = 0
+
+
+    def on_bar(self, bar: Mapping[str, Any]) -> Dict[str, bool]:
+        """Advance every state by one bar and return this bar's decision."""
+
+        values = self._values
+
+        for i, op in enumerate(self._ops):
+            values[i] = op.step(bar, values)
+
+        self.bars_seen += 1
+
+        return {
+            "entry": self._combine(self._entry),
+            "exit": self._combine(self._exit),
+        }
+
+
+    def _combine(self, slots):
+        """OR of the rule values held in `slots`."""
+
+        return any(self._values[i] for i in slots)
+
+
+    def warm_up(self, df) -> Dict[str, bool]:
+        """Feed a history DataFrame row by row; returns the last bar's decision."""
+
+        decision = {"entry": False, "exit": False}
+
+        for bar in df.to_dict("records"):
+            decision = self.on_bar(bar)
+
+        return decision
+
+
+    def _add(self, key, op) -> int:
+
+        self._slots[key] = len(self._ops)
+        self._ops.append(op)
+        return self._slots[key]
+
+
+    def _lag(self, node, offset) -> int:
+        """Slot holding `node` delayed by `offset` bars."""
+
+        if isinstance(node, NumberNode):
+            return self._compile(node)
+
+        key = ("shift", node_key(node), int(offset))
+        if key in self._slots:
+            return self._slots[key]
+
+        src = self._compile(node)
+        return self._add(key, self.lag_op(src, offset))
+
+
+    def _call(self, name, keys, srcs, params) -> int:
+        """
+        Slot of indicator `name` over the slots `srcs` (structural keys
+        `keys`). Parts of composite indicators get their own slots, shared
+        with equal calls elsewhere, as in engine.interpreter.
+        """
+
+        key = call_key(name, keys, params)
+        if key in self._slots:
+            return self._slots[key]
+
+        spec = get_indicator_spec(name)
+
+        if spec.parts is not None:
+            parts, part_keys = [], []
+
+            for part, source, part_params in spec.parts(*params):
+                if source is None:
+                    src_keys, src_slots = keys, srcs
+                else:
+                    src_keys, src_slots = [part_keys[source]], [parts[source]]
+
+                parts.append(self._call(part, src_keys, src_slots, part_params))
+                part_keys.append(call_key(part, src_keys, part_params))
+
+            return self._add(key, self.composite_op(spec.kernel, srcs, params, parts))
+
+        if spec.smoothing is not None:
+            return self._add(key, self.smoothed_op(spec.smoothing, srcs, params))
+
+        if name not in self.indicator_ops:
+            raise ValueError(f"No streaming kernel for indicator {name}")
+
+        return self._add(key, self.indicator_ops[name](*srcs, *params))
+
+
+    def _compile(self, node) -> int:
+        """Compile a node (once per distinct subtree) and return its slot."""
+
+        if isinstance(node, LookbackNode):
+            return self._lag(IdentifierNode(node.name), node.offset)
+
+        key = node_key(node)
+        if key in self._slots:
+            return self._slots[key]
+
+        if isinstance(node, IdentifierNode):
+            return self._add(key, self.column_op(node.name))
+
+        if isinstance(node, NumberNode):
+            return self._add(key, self.constant_op(float(node.value)))
+
+        if isinstance(node, BooleanNode):
+            return self._add(key, self.constant_op(bool(node.value)))
+
+        if isinstance(node, IndicatorCallNode):
+            series, params = split_args(node.name, node.args)
+            if not all(isinstance(p, NumberNode) for p in params):
+                raise ValueError(f"{node.name.upper()} parameters must be numbers")
+
+            keys = [node_key(arg) for arg in series]
+            srcs = [self._compile(arg) for arg in series]
+            return self._call(node.name.upper(), keys, srcs, [float(p.value) for p in params])
+
+        if isinstance(node, CompareNode):
+            left = self._compile(node.left)
+            right = self._compile(node.right)
+            return self._add(key, self.compare_op(left, node.op, right))
+
+        if isinstance(node, LogicalOpNode):
+            left = self._compile(node.left) if node.op != "NOT" else None
+            right = self._compile(node.right)
+            return self._add(key, self.logical_op(node.op, left, right))
+
+        if isinstance(node, CrossNode):
+            left = self._compile(node.left)
+            right = self._compile(node.right)
+            prev_left = self._lag(node.left, 1)
+            prev_right = self._lag(node.right, 1)
+            return self._add(key, self.cross_op(left, right, prev_left, prev_right, node.direction))
+
+        raise TypeError(f"Unsupported AST node: {type(node).__name__}")
@@ -0,0 +1,163 @@
+"""
+Interactive edit-and-run workspace over one dataset.
+
+    ws = Workspace(df)
+    trades, metrics = ws.run(strategy)
+    trades, metrics = ws.run(edited)        # only changed rules recomputed
+
+Each rule's signal vector is kept under its structural key (node_key;
+O(1) for interned trees), so after an edit only rules whose subtree
+changed are evaluated; unchanged and reordered rules, and rules moved
+between ENTRY and EXIT, are reused. Indicator and lookback arrays are
+shared through one interpreter cache, so a new rule over an existing
+SMA does not recompute it either. The block ORs and the backtest are
+then rebuilt from the cached vectors.
+
+At most `max_rules` rule vectors are kept (least recently used first
+out). Every cached rule holds a reference to the indicator, lookback
+and CROSS arrays it was computed from; arrays no cached rule refers to
+any more are dropped with the last one, so memory stays bounded however
+long the edit session runs.
+"""
+
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Mapping, Optional
+import numpy as np
+import pandas as pd
+
+from backtest.simulator import run_backtest
+from dsl.indicators import split_args
+from engine.batch import _children, part_keys
+from engine.interpreter import Interpreter
+from parser.ast_nodes import LookbackNode, IndicatorCallNode, CrossNode, node_key
+from parser.parser import parse_strategy_text
+
+
+class Workspace:
+    """Per-rule signal cache for repeated runs of edited strategies over the same data."""
+
+    def __init__(self, columns: Mapping[str, Any], indicators=None, max_rules: int = 1024):
+        self.columns = columns
+        self.interpreter = Interpreter(columns, indicators=indicators)
+        self.max_rules = max_rules
+
+        self._rules: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._deps: Dict[tuple, set] = {}       # rule key -> interpreter cache keys
+        self._refs: Counter = Counter()         # cache key -> cached rules using it
+
+        # Rules evaluated / reused by the last call
+        self.computed = 0
+        self.reused = 0
+
+
+    def rule_signal(self, rule) -> np.ndarray:
+        """Bool vector of one rule, from the cache when its subtree is unchanged."""
+
+        key = node_key(rule)
+        values = self._rules.get(key)
+
+        if values is not None:
+            self._rules.move_to_end(key)
+            self.reused += 1
+            return values
+
+        # Read-only view, shared by every later run that reuses it
+        values = np.broadcast_to(self.interpreter.value(rule), self.interpreter.length)
+
+        self._rules[key] = values
+        self._deps[key] = deps = _cache_keys(rule)
+        self._refs.update(deps)
+        self.computed += 1
+
+        while len(self._rules) > self.max_rules:
+            self._evict(next(iter(self._rules)))
+
+        return values
+
+
+    def signals(self, strategy) -> Dict[str, Any]:
+        """
+        Entry/exit signals of a StrategyNode (or DSL text). DataFrames give
+        bool Series on df.index, column mappings give bool arrays.
+        """
+
+        if isinstance(strategy, str):
+            strategy = parse_strategy_text(strategy)
+
+        self.computed = self.reused = 0
+
+        signals = {
+            "entry": self._block(strategy.entry),
+            "exit": self._block(strategy.exit),
+        }
+
+        if isinstance(self.columns, pd.DataFrame):
+            return {name: pd.Series(mask, index=self.columns.index) for name, mask in signals.items()}
+
+        return signals
+
+
+    def run(self, strategy, columnar: bool = False):
+        """signals() followed by run_backtest on the workspace data."""
+
+        signals = self.signals(strategy)
+
+        return run_backtest(self.columns, signals["entry"], signals["exit"], columnar=columnar)
+
+
+    def clear(self) -> None:
+        """Forget cached rule vectors and indicator arrays."""
+
+        self._rules.clear()
+        self._deps.clear()
+        self._refs.clear()
+        self.interpreter.cache.clear()
+
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+
+    def _evict(self, key) -> None:
+        """Forget one rule vector and the arrays only it was using."""
+
+        del self._rules[key]
+
+        for dep in self._deps.pop(key):
+            self._refs[dep] -= 1
+            if self._refs[dep] <= 0:
+                del self._refs[dep]
+                self.interpreter.cache.pop(dep, None)
+
+
+    def _block(self, block) -> np.ndarray:
+
+        combined = np.zeros(self.interpreter.length, dtype=bool)
+
+        for rule in (block.rules if block else []):
+            combined |= self.rule_signal(rule)
+
+        return combined
+
+
+def _cache_keys(node, keys: Optional[set] = None) -> set:
+    """Interpreter cache keys evaluating `node` fills (data columns aside)."""
+
+    keys = set() if keys is None else keys
+
+    if isinstance(node, LookbackNode):
+        keys.add(("shift", ("id", node.name), int(node.offset)))
+
+    elif isinstance(node, IndicatorCallNode):
+        series, params = split_args(node.name, node.args)
+        keys.add(node_key(node))
+        keys.update(part_keys(node.name.upper(), [node_key(arg) for arg in series],
+                              [arg.value for arg in params]))
+
+    elif isinstance(node, CrossNode):
+        keys.update(("shift", node_key(side), 1) for side in (node.left, node.right))
+
+    for child in _children(node):
+        _cache_keys(child, keys)
+
+    return keys
@@ -2,8 +2,8 @@
 Pipeline:
 1. Take natural language strategy text
 2. Convert NL → structured JSON (rule objects)
-3. Convert structured JSON → DSL string
-4. Parse DSL → AST StrategyNode
+3. Convert structured JSON → AST StrategyNode (DSL string only for display)
+4. Optimize the AST (fold constants, drop redundant rules)
 5. Generate Python code from AST
 6. Execute code to get entry/exit signals
 7. Run backtest simulator
@@ -15,20 +15,19 @@ import textwrap
 
 from nlp.nl_to_struct import nl_to_struct
 from nlp.struct_to_dsl import struct_to_dsl
+from nlp.struct_to_ast import struct_to_ast
+from parser.optimizer import optimize_strategy
 
-from parser.parser import parse_strategy_text
 from codegen.generator import generate_python
+from codegen.cache import EvaluatorCache
 from backtest.simulator import run_backtest
 
 
-def format_ast(ast):
-    return repr(ast)
+EVALUATORS = EvaluatorCache()
 
 
-def load_evaluator(python_src: str):
-    namespace = {}
-    exec(python_src, namespace)
-    return namespace["evaluate_strategy"]
+def format_ast(ast):
+    return repr(ast)
 
 
 def load_sample_data():
@@ -99,16 +98,23 @@ def main():
     struct = nl_to_struct(nl)
     print("\n======= STRUCT =======\n", struct)
 
+    # The AST is built straight from the struct; the DSL text is only shown
+    ast = struct_to_ast(struct)
+
     dsl = struct_to_dsl(struct)
     print("\n======= DSL =======\n", dsl)
 
-    ast = parse_strategy_text(dsl)
     print("\n======= AST =======\n", ast)
 
+    ast, report = optimize_strategy(ast)
+    if report:
+        print("\n======= OPTIMIZER =======\n")
+        print(report)
+
     python_src = generate_python(ast)
     print("\n======= PYTHON CODE =======\n", python_src)
 
-    evaluate = load_evaluator(python_src)
+    evaluate = EVALUATORS.get(ast, source=python_src)
     df = load_sample_data()
 
     signals = evaluate(df)
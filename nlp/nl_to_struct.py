@@ -1,5 +1,35 @@
 import re
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+
+# All patterns are compiled once at import. Column names and indicator
+# phrases are found with one combined alternation per sentence; priority
+# between several hits is then resolved in the same order as the
+# original per-name loops, so results are unchanged.
+
+_COLUMNS = ["open", "high", "low", "close", "volume"]
+_LOOKBACK_COLUMNS = ["high", "low", "close", "open", "volume"]
+
+_COLUMN_WORD = re.compile(r"\b(open|high|low|close|volume)\b")
+_COLUMN_TEXT = re.compile(r"high|low|close|open|volume")
+
+_YESTERDAY = re.compile(r"yesterday|previous|last session")
+_DAYS_AGO = re.compile(r"(\d+)\s*(days?|bars?)\s*(ago|back)?")
+_LOOK_BACK = re.compile(r"look\s*back\s*(\d+)")
+
+_INDICATOR_HINT = re.compile(r"sma|moving average|rsi|relative strength index")
+_SMA_PREFIX = re.compile(r"(sma|simple moving average|moving average)[\s\(]*(\d+)")
+_SMA_SUFFIX = re.compile(r"(\d+)[-\s]*(day)?\s*(sma|simple moving average|moving average)")
+_RSI = re.compile(r"(rsi|relative strength index)[\s\(]*(\d+)")
+
+_CROSS_SPLIT = re.compile(r"crosses (?:above|below)")
+
+_SENTENCE_SPLIT = re.compile(r"[.,]")
+_EXIT_WORDS = re.compile(r"sell|exit|close position")
+_FILLER = re.compile(r"\b(buy|sell|enter|exit|close position|when|is)\b")
+_NUMBER_BOUND = re.compile(r"(above|below|>|<)\s*(\d+(\.\d+)?[mk]?)")
+_COMPARISON = re.compile(r"(\w+)\s*(above|below|>|<)\s*([\w\.]+)")
 
 
 def normalize_number(text: str) -> float:
@@ -16,46 +46,39 @@ def normalize_number(text: str) -> float:
     return float(text)
 
 
+def _first_column(found, order) -> Optional[str]:
+    """First name of `order` among the names found in a sentence."""
+
+    for name in order:
+        if name in found:
+            return name
+
+    return None
+
+
 def parse_lookback_phrase(text: str) -> Optional[Dict[str, Any]]:
     """Detects lookback."""
 
     t = text.lower().strip()
 
-    if "yesterday" in t or "previous" in t or "last session" in t:
-        for name in ["high", "low", "close", "open", "volume"]:
-            if name in t:
-                return {
-                    "type": "operand",
-                    "kind": "lookback",
-                    "name": name,
-                    "offset": 1
-                }
-
-    match = re.search(r"(\d+)\s*(days?|bars?)\s*(ago|back)?", t)
-    if match:
+    name = _first_column(set(_COLUMN_TEXT.findall(t)), _LOOKBACK_COLUMNS)
+    if name is None:
+        return None
+
+    if _YESTERDAY.search(t):
+        offset = 1
+    else:
+        match = _DAYS_AGO.search(t) or _LOOK_BACK.search(t)
+        if not match:
+            return None
         offset = int(match.group(1))
-        for name in ["high", "low", "close", "open", "volume"]:
-            if name in t:
-                return {
-                    "type": "operand",
-                    "kind": "lookback",
-                    "name": name,
-                    "offset": offset
-                }
-
-    match2 = re.search(r"look\s*back\s*(\d+)", t)
-    if match2:
-        offset = int(match2.group(1))
-        for name in ["high", "low", "close", "open", "volume"]:
-            if name in t:
-                return {
-                    "type": "operand",
-                    "kind": "lookback",
-                    "name": name,
-                    "offset": offset
-                }
 
-    return None
+    return {
+        "type": "operand",
+        "kind": "lookback",
+        "name": name,
+        "offset": offset
+    }
 
 
 def parse_indicator(text: str) -> Optional[Dict[str, Any]]:
@@ -63,7 +86,10 @@ def parse_indicator(text: str) -> Optional[Dict[str, Any]]:
 
     t = text.lower().strip()
 
-    sma_prefix = re.search(r"(sma|simple moving average|moving average)[\s\(]*(\d+)", t)
+    if not _INDICATOR_HINT.search(t):
+        return None
+
+    sma_prefix = _SMA_PREFIX.search(t)
 
     if sma_prefix:
 
@@ -76,7 +102,7 @@ def parse_indicator(text: str) -> Optional[Dict[str, Any]]:
             "args": ["close", period]
         }
 
-    sma_suffix = re.search(r"(\d+)[-\s]*(day)?\s*(sma|simple moving average|moving average)", t)
+    sma_suffix = _SMA_SUFFIX.search(t)
 
     if sma_suffix:
 
@@ -89,7 +115,7 @@ def parse_indicator(text: str) -> Optional[Dict[str, Any]]:
         }
 
 
-    rsi_match = re.search(r"(rsi|relative strength index)[\s\(]*(\d+)", t)
+    rsi_match = _RSI.search(t)
 
     if rsi_match:
 
@@ -107,17 +133,16 @@ def parse_indicator(text: str) -> Optional[Dict[str, Any]]:
 def parse_basic_operand(text: str) -> Optional[Dict[str, Any]]:
     """Detects crossover events."""
 
-    lowered = text.lower()
+    name = _first_column(set(_COLUMN_WORD.findall(text.lower())), _COLUMNS)
 
-    for name in ["open", "high", "low", "close", "volume"]:
-        if re.search(rf"\b{name}\b", lowered):
-            return {
-                "type": "operand",
-                "kind": "identifier",
-                "name": name
-            }
+    if name is None:
+        return None
 
-    return None
+    return {
+        "type": "operand",
+        "kind": "identifier",
+        "name": name
+    }
 
 
 def parse_cross_condition(sentence: str) -> Optional[Dict[str, Any]]:
@@ -136,7 +161,7 @@ def parse_cross_condition(sentence: str) -> Optional[Dict[str, Any]]:
     if not direction:
         return None
 
-    left_part, right_part = re.split(r"crosses (?:above|below)", s, maxsplit=1)
+    left_part, right_part = _CROSS_SPLIT.split(s, maxsplit=1)
 
     left_operand = (
         parse_indicator(left_part)
@@ -161,101 +186,136 @@ def parse_cross_condition(sentence: str) -> Optional[Dict[str, Any]]:
     return None
 
 
-def nl_to_struct(nl_text: str) -> Dict[str, List[Dict[str, Any]]]:
-    """Main nl -> struct converter function."""
+def parse_sentence(s: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+    """
+    One stripped, lower-cased sentence → (is_exit, condition or None).
+    """
 
-    text = nl_text.lower()
+    is_exit = _EXIT_WORDS.search(s) is not None
 
-    entry_conditions: List[Dict[str, Any]] = []
-    exit_conditions: List[Dict[str, Any]] = []
+    s = _FILLER.sub("", s).strip()
 
-    sentences = re.split(r"[.,]", text)
+    cross = parse_cross_condition(s)
+    if cross:
+        return is_exit, cross
 
-    for sent in sentences:
-        
-        s = sent.strip()
-        if not s:
-            continue
-
-        if any(word in s for word in ["sell", "exit", "close position"]):
-            target = exit_conditions
-        else:
-            target = entry_conditions
+    indicator = parse_indicator(s)
 
-        s = re.sub(r"\b(buy|sell|enter|exit|close position|when|is)\b", "", s).strip()
+    if indicator:
 
-        cross = parse_cross_condition(s)
-        if cross:
-            target.append(cross)
-            continue
+        num_match = _NUMBER_BOUND.search(s)
+        if num_match:
+            op_word, num_text = num_match.group(1), num_match.group(2)
+            try:
+                right_val = normalize_number(num_text)
+            except:
+                return is_exit, None
 
-        indicator = parse_indicator(s)
-
-        if indicator:
-
-            num_match = re.search(r"(above|below|>|<)\s*(\d+(\.\d+)?[mk]?)", s)
-            if num_match:
-                op_word, num_text = num_match.group(1), num_match.group(2)
-                try:
-                    right_val = normalize_number(num_text)
-                except:
-                    continue
-
-                op = ">" if op_word in ("above", ">") else "<"
-
-                target.append({
-                    "type": "comparison",
-                    "left": indicator,
-                    "op": op,
-                    "right": right_val,
-                })
-                continue
-
-            op = ">" if ("above" in s or "greater than" in s or ">" in s) else "<"
-            left = parse_basic_operand(s) or {
-                "type": "operand",
-                "kind": "identifier",
-                "name": "close"
-            }
+            op = ">" if op_word in ("above", ">") else "<"
 
-            target.append({
+            return is_exit, {
                 "type": "comparison",
-                "left": left,
+                "left": indicator,
                 "op": op,
-                "right": indicator,
-            })
-            continue
+                "right": right_val,
+            }
 
-        comp_match = re.search(r"(\w+)\s*(above|below|>|<)\s*([\w\.]+)", s)
+        op = ">" if ("above" in s or "greater than" in s or ">" in s) else "<"
+        left = parse_basic_operand(s) or {
+            "type": "operand",
+            "kind": "identifier",
+            "name": "close"
+        }
 
-        if comp_match:
+        return is_exit, {
+            "type": "comparison",
+            "left": left,
+            "op": op,
+            "right": indicator,
+        }
 
-            left_word, op_word, right_word = comp_match.groups()
+    comp_match = _COMPARISON.search(s)
 
-            left = (
-                parse_basic_operand(left_word)
-                or parse_lookback_phrase(left_word)
-            )
+    if comp_match:
 
-            if not left:
-                continue
+        left_word, op_word, right_word = comp_match.groups()
 
-            op = ">" if op_word in ("above", ">") else "<"
+        left = (
+            parse_basic_operand(left_word)
+            or parse_lookback_phrase(left_word)
+        )
 
-            try:
-                right_val = normalize_number(right_word)
+        if not left:
+            return is_exit, None
 
-            except:
-                continue
+        op = ">" if op_word in ("above", ">") else "<"
 
-            target.append({
-                "type": "comparison",
-                "left": left,
-                "op": op,
-                "right": right_val,
-            })
+        try:
+            right_val = normalize_number(right_word)
+
+        except:
+            return is_exit, None
+
+        return is_exit, {
+            "type": "comparison",
+            "left": left,
+            "op": op,
+            "right": right_val,
+        }
+
+    return is_exit, None
+
+
+@lru_cache(maxsize=65536)
+def _cached_sentence(s: str):
+    return parse_sentence(s)
+
+
+def _copy(value):
+    """Fresh copy of a cached condition (dicts/lists of scalars)."""
+
+    if isinstance(value, dict):
+        return {k: _copy(v) for k, v in value.items()}
+
+    if isinstance(value, list):
+        return [_copy(v) for v in value]
+
+    return value
+
+
+def nl_to_struct(nl_text: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Main nl -> struct converter function."""
+
+    text = nl_text.lower()
+
+    entry_conditions: List[Dict[str, Any]] = []
+    exit_conditions: List[Dict[str, Any]] = []
+
+    sentences = _SENTENCE_SPLIT.split(text)
+
+    for sent in sentences:
+
+        s = sent.strip()
+        if not s:
+            continue
+
+        is_exit, condition = _cached_sentence(s)
+
+        if condition is not None:
+            target = exit_conditions if is_exit else entry_conditions
+            target.append(_copy(condition))
 
     return {
         "entry": entry_conditions,
         "exit": exit_conditions,
     }
+
+
+def nl_to_struct_many(nl_texts: Iterable[str]) -> List[Dict[str, List[Dict[str, Any]]]]:
+    """
+    nl_to_struct over many descriptions. Sentences are memoized across
+    the batch (and across calls), so boilerplate phrases repeated by
+    thousands of strategies are translated once.
+    """
+
+    return [nl_to_struct(text) for text in nl_texts]
@@ -0,0 +1,116 @@
+import re
+from typing import Dict, Any, List
+
+from dsl.indicators import is_supported
+from dsl.operators import is_comparison_op
+from parser.ast_nodes import (
+    StrategyNode,
+    EntryBlockNode,
+    ExitBlockNode,
+    CompareNode,
+    IdentifierNode,
+    NumberNode,
+    LookbackNode,
+    IndicatorCallNode,
+    CrossNode,
+)
+
+
+# Builds the AST straight from nl_to_struct output. The result equals
+# parse_strategy_text(struct_to_dsl(struct)), and invalid structs raise
+# the same SyntaxErrors the parser would, without the text round-trip.
+
+_IDENT = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+
+
+def scalar_to_ast(value: Any):
+    """Bare indicator arg / comparison value → NumberNode or IdentifierNode."""
+
+    text = str(value)
+
+    if _NUMBER.fullmatch(text):
+        return NumberNode(float(text))
+
+    if _IDENT.fullmatch(text):
+        return IdentifierNode(text)
+
+    raise SyntaxError(f"Invalid operand {text!r}")
+
+
+def operand_to_ast(op: Dict[str, Any]):
+    """Operand dict → AST node. (Recursive)"""
+
+    kind = op["kind"]
+
+    if kind == "identifier":
+        return scalar_to_ast(op["name"])
+
+    if kind == "lookback":
+        if not _IDENT.fullmatch(str(op["name"])):
+            raise SyntaxError(f"Invalid lookback name {op['name']!r}")
+        return LookbackNode(op["name"], int(op["offset"]))
+
+    if kind == "indicator":
+        name = op["name"].upper()
+
+        if not is_supported(name):
+            raise SyntaxError(f"Unknown indicator {name}")
+
+        args = [
+            operand_to_ast(a) if isinstance(a, dict) else scalar_to_ast(a)
+            for a in op["args"]
+        ]
+
+        return IndicatorCallNode(name, args)
+
+    raise ValueError(f"Unknown operand kind {kind}")
+
+
+def comparison_to_ast(node: Dict[str, Any]) -> CompareNode:
+
+    op = node["op"]
+    if not is_comparison_op(op):
+        raise SyntaxError(f"Invalid comparison operator {op!r}")
+
+    right = node["right"]
+    right = operand_to_ast(right) if isinstance(right, dict) else scalar_to_ast(right)
+
+    return CompareNode(operand_to_ast(node["left"]), op, right)
+
+
+def cross_to_ast(node: Dict[str, Any]) -> CrossNode:
+
+    direction = node["direction"].upper()
+    if direction not in ("ABOVE", "BELOW"):
+        raise SyntaxError(f"Invalid CROSS direction: {direction}")
+
+    return CrossNode(operand_to_ast(node["left"]), direction, operand_to_ast(node["right"]))
+
+
+def rule_to_ast(rule: Dict[str, Any]):
+
+    rtype = rule["type"]
+
+    if rtype == "comparison":
+        return comparison_to_ast(rule)
+
+    if rtype == "cross":
+        return cross_to_ast(rule)
+
+    raise ValueError(f"Unknown rule type {rtype}")
+
+
+def struct_to_ast(struct: Dict[str, Any]) -> StrategyNode:
+    """Main function to convert structure -> AST."""
+
+    entry_rules: List = [rule_to_ast(rule) for rule in struct.get("entry", [])]
+    exit_rules: List = [rule_to_ast(rule) for rule in struct.get("exit", [])]
+
+    if not entry_rules and not exit_rules:
+        raise SyntaxError("A strategy must contain ENTRY: and/or EXIT:")
+
+    return StrategyNode(
+        EntryBlockNode(entry_rules) if entry_rules else None,
+        ExitBlockNode(exit_rules) if exit_rules else None,
+    )
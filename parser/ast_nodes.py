@@ -2,8 +2,19 @@ from dataclasses import dataclass
 from typing import List, Optional, Any
 
 
+class _Node:
+    """Base of the AST node dataclasses: pickles as a plain constructor call."""
+
+    __slots__ = ()
+
+    def __reduce__(self):
+        return (type(self), tuple(getattr(self, name) for name in self.__slots__))
+
+
 @dataclass
-class StrategyNode:
+class StrategyNode(_Node):
+    __slots__ = ("entry", "exit")
+
     entry: Optional["EntryBlockNode"]
     exit: Optional["ExitBlockNode"]
 
@@ -12,7 +23,9 @@ class StrategyNode:
 
 
 @dataclass
-class EntryBlockNode:
+class EntryBlockNode(_Node):
+    __slots__ = ("rules",)
+
     rules: List[Any]   
 
     def __repr__(self):
@@ -20,7 +33,9 @@ class EntryBlockNode:
 
 
 @dataclass
-class ExitBlockNode:
+class ExitBlockNode(_Node):
+    __slots__ = ("rules",)
+
     rules: List[Any]
 
     def __repr__(self):
@@ -28,7 +43,9 @@ class ExitBlockNode:
 
 
 @dataclass
-class LogicalOpNode:
+class LogicalOpNode(_Node):
+    __slots__ = ("op", "left", "right")
+
     op: str            # AND / OR
     left: Any
     right: Any
@@ -38,7 +55,9 @@ class LogicalOpNode:
 
 
 @dataclass
-class CompareNode:
+class CompareNode(_Node):
+    __slots__ = ("left", "op", "right")
+
     left: Any
     op: str            # >, <, >=, <=, ==
     right: Any
@@ -48,7 +67,9 @@ class CompareNode:
 
 
 @dataclass
-class CrossNode:
+class CrossNode(_Node):
+    __slots__ = ("left", "direction", "right")
+
     left: Any
     direction: str     # ABOVE / BELOW
     right: Any
@@ -58,7 +79,9 @@ class CrossNode:
 
 
 @dataclass
-class IdentifierNode:
+class IdentifierNode(_Node):
+    __slots__ = ("name",)
+
     name: str
 
     def __repr__(self):
@@ -66,7 +89,9 @@ class IdentifierNode:
 
 
 @dataclass
-class NumberNode:
+class NumberNode(_Node):
+    __slots__ = ("value",)
+
     value: float
 
     def __repr__(self):
@@ -74,7 +99,9 @@ class NumberNode:
 
 
 @dataclass
-class LookbackNode:
+class LookbackNode(_Node):
+    __slots__ = ("name", "offset")
+
     name: str
     offset: int
 
@@ -83,9 +110,86 @@ class LookbackNode:
 
 
 @dataclass
-class IndicatorCallNode:
+class IndicatorCallNode(_Node):
+    __slots__ = ("name", "args")
+
     name: str            # SMA, RSI, etc.
     args: List[Any]      # list of operands or numbers
 
     def __repr__(self):
         return f"IndicatorCall({self.name}, args={self.args})"
+
+
+@dataclass
+class BooleanNode(_Node):
+    __slots__ = ("value",)
+
+    value: bool        # constant produced by parser.optimizer
+
+    def __repr__(self):
+        return f"Boolean({self.value})"
+
+
+class InternedNode:
+    """
+    Marker base of the immutable, hash-consed nodes built by
+    parser.interned; they carry their node_key precomputed in `key`.
+    """
+
+    __slots__ = ()
+
+
+def node_key(node) -> tuple:
+    """Hashable structural key of an AST node. Equal subtrees give equal keys."""
+
+    if isinstance(node, InternedNode):
+        return node.key
+
+    if isinstance(node, IdentifierNode):
+        return ("id", node.name)
+
+    if isinstance(node, NumberNode):
+        return ("num", float(node.value))
+
+    if isinstance(node, BooleanNode):
+        return ("bool", bool(node.value))
+
+    if isinstance(node, LookbackNode):
+        return ("lookback", node.name, int(node.offset))
+
+    if isinstance(node, IndicatorCallNode):
+        return ("call", node.name.upper(), tuple(node_key(a) for a in node.args))
+
+    if isinstance(node, CompareNode):
+        return ("compare", node.op, node_key(node.left), node_key(node.right))
+
+    if isinstance(node, LogicalOpNode):
+        return ("logical", node.op, node_key(node.left), node_key(node.right))
+
+    if isinstance(node, CrossNode):
+        return ("cross", node.direction.upper(), node_key(node.left), node_key(node.right))
+
+    if isinstance(node, EntryBlockNode):
+        return ("entry", tuple(node_key(r) for r in node.rules))
+
+    if isinstance(node, ExitBlockNode):
+        return ("exit", tuple(node_key(r) for r in node.rules))
+
+    if isinstance(node, StrategyNode):
+        entry = node_key(node.entry) if node.entry else None
+        exit = node_key(node.exit) if node.exit else None
+        return ("strategy", entry, exit)
+
+    if isinstance(node, str):
+        return ("str", node)
+
+    if node is None:
+        return ("none",)
+
+    raise TypeError(f"Unsupported AST node: {type(node).__name__}")
+
+
+def call_key(name: str, series_keys, params) -> tuple:
+    """node_key of an indicator call given its series keys and numeric parameters."""
+
+    return ("call", name.upper(), tuple(series_keys) + tuple(("num", float(p)) for p in params))
@@ -0,0 +1,168 @@
+"""
+Bulk parsing of strategy libraries.
+
+    results = parse_directory("strategies/", cache_dir=".parse_cache")
+    for path, result in results.items():
+        if result.ok: ... result.ast ...
+        else: log(path, result.error)
+
+Sources are deduplicated by content, looked up in a persistent cache
+keyed by a hash of the text, and only the misses are parsed, across a
+process pool when there are enough of them. Syntax errors are results
+too (and are cached), so one bad file doesn't stop the batch.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+from parser.parser import parse_strategy_text
+from parser.ast_nodes import StrategyNode
+from parser.interned import intern as intern_node
+
+
+# Bump whenever the parser or the AST classes change what a text parses to
+PARSER_VERSION = 2
+
+# Below this many misses per worker a pool costs more than it saves
+_MIN_PER_WORKER = 16
+
+
+@dataclass(frozen=True)
+class ParseResult:
+    """AST of one source, or the error message it failed with."""
+
+    ast: Optional[StrategyNode]
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def source_hash(text: str) -> str:
+    """Cache key of a DSL source."""
+
+    return hashlib.sha256(f"v{PARSER_VERSION}:{text}".encode("utf-8")).hexdigest()
+
+
+class ParseCache:
+    """Pickled ParseResults in a directory, one `<hash>.ast` file per source text."""
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+
+    def get(self, key: str) -> Optional[ParseResult]:
+        """Cached result, or None if missing or unreadable."""
+
+        try:
+            with open(self._path(key), "rb") as f:
+                result = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            return None
+
+        return result if isinstance(result, ParseResult) else None
+
+
+    def put(self, key: str, result: ParseResult) -> None:
+        """Write atomically so concurrent processes never read a partial file."""
+
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.ast")
+
+
+def parse_source(text: str) -> ParseResult:
+    """Parse one source, turning a failure into an error result."""
+
+    try:
+        return ParseResult(parse_strategy_text(text))
+    except (SyntaxError, ValueError) as e:
+        return ParseResult(None, str(e))
+
+
+def parse_many(sources: Iterable[str],
+               workers: Optional[int] = None,
+               cache_dir: Optional[str] = None,
+               intern: bool = False) -> List[ParseResult]:
+    """
+    Parse many DSL texts; results are in input order. With `cache_dir`,
+    unchanged texts are never parsed again. `workers` caps the process
+    pool (default: CPU count; 1 parses in this process). intern=True
+    returns hash-consed trees (see parser.interned).
+    """
+
+    texts = list(sources)
+    keys = [source_hash(text) for text in texts]
+    cache = ParseCache(cache_dir) if cache_dir else None
+
+    found: Dict[str, ParseResult] = {}
+    missing: Dict[str, str] = {}
+
+    for key, text in zip(keys, texts):
+        if key in found or key in missing:
+            continue
+
+        cached = cache.get(key) if cache else None
+        if cached is not None:
+            found[key] = cached
+        else:
+            missing[key] = text
+
+    for key, result in zip(missing, _parse_all(list(missing.values()), workers)):
+        found[key] = result
+        if cache:
+            cache.put(key, result)
+
+    results = [found[key] for key in keys]
+
+    if intern:
+        results = [ParseResult(intern_node(r.ast), r.error) for r in results]
+
+    return results
+
+
+def parse_files(paths: Iterable[Union[str, Path]], **kwargs) -> Dict[str, ParseResult]:
+    """parse_many over files, keyed by path."""
+
+    paths = [str(p) for p in paths]
+    texts = [Path(p).read_text(encoding="utf-8") for p in paths]
+
+    return dict(zip(paths, parse_many(texts, **kwargs)))
+
+
+def parse_directory(root: Union[str, Path], pattern: str = "*.dsl", **kwargs) -> Dict[str, ParseResult]:
+    """parse_files over every file under `root` (recursively) matching `pattern`."""
+
+    return parse_files(sorted(Path(root).rglob(pattern)), **kwargs)
+
+
+def _parse_all(texts: List[str], workers: Optional[int]) -> List[ParseResult]:
+
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, max(len(texts) // _MIN_PER_WORKER, 1))
+
+    if workers <= 1:
+        return [parse_source(text) for text in texts]
+
+    chunksize = max(len(texts) // (workers * 4), 1)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(parse_source, texts, chunksize=chunksize))
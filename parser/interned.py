@@ -0,0 +1,211 @@
+"""
+Immutable, hash-consed AST nodes.
+
+    ast = intern(parse_strategy_text(text))
+
+returns the same tree built from interned nodes: structurally equal
+subtrees (SMA(close,20) in 500 strategies) are one shared object. Each
+interned node is a subclass of its parser.ast_nodes class, so every
+consumer keeps working, but it
+
+    - is immutable, with tuples in place of the rules/args lists
+    - carries `key` (its node_key, so node_key() is O(1)), a stable
+      16-byte blake2b `digest`, and a hash derived from it
+    - compares by identity, which hash-consing makes structural
+
+Names/directions/numbers are canonicalized the way node_key does, so two
+nodes get the same interned object exactly when their node_keys match.
+Nodes are held weakly; unpickling re-interns in the receiving process.
+"""
+
+import hashlib
+import threading
+import weakref
+from dataclasses import fields
+from typing import Any, Dict
+
+from parser.ast_nodes import (
+    InternedNode,
+    StrategyNode,
+    EntryBlockNode,
+    ExitBlockNode,
+    LogicalOpNode,
+    CompareNode,
+    CrossNode,
+    IdentifierNode,
+    NumberNode,
+    LookbackNode,
+    IndicatorCallNode,
+    BooleanNode,
+    node_key,
+)
+
+
+class _Frozen(InternedNode):
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        return self is other
+
+    def __ne__(self, other):
+        return self is not other
+
+    def __reduce__(self):
+        return (intern, (thaw(self),))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+_NODE_TYPES = (
+    StrategyNode,
+    EntryBlockNode,
+    ExitBlockNode,
+    LogicalOpNode,
+    CompareNode,
+    CrossNode,
+    IdentifierNode,
+    NumberNode,
+    LookbackNode,
+    IndicatorCallNode,
+    BooleanNode,
+)
+
+# One interned subclass per node class: InternedNumberNode(NumberNode), ...
+_INTERNED: Dict[type, type] = {
+    base: type(
+        f"Interned{base.__name__}",
+        (_Frozen, base),
+        {"__slots__": ("key", "digest", "_hash", "__weakref__"), "__module__": __name__},
+    )
+    for base in _NODE_TYPES
+}
+
+_FIELDS = {base: tuple(f.name for f in fields(base)) for base in _NODE_TYPES}
+
+# Same canonical forms as node_key
+_SCALARS = {
+    (NumberNode, "value"): float,
+    (LookbackNode, "offset"): int,
+    (IndicatorCallNode, "name"): str.upper,
+    (CrossNode, "direction"): str.upper,
+    (BooleanNode, "value"): bool,
+}
+
+_TABLE: "weakref.WeakValueDictionary[tuple, Any]" = weakref.WeakValueDictionary()
+_LOCK = threading.Lock()
+
+
+def intern(node):
+    """Interned (immutable, shared) version of an AST; idempotent."""
+
+    if node is None or isinstance(node, (InternedNode, str)):
+        return node
+
+    base = type(node)
+    if base not in _INTERNED:
+        raise TypeError(f"Unsupported AST node: {base.__name__}")
+
+    values = tuple(_canonical(base, name, getattr(node, name)) for name in _FIELDS[base])
+
+    return _make(base, values)
+
+
+def thaw(node):
+    """Plain, mutable copy of an (interned) AST."""
+
+    if node is None or isinstance(node, str):
+        return node
+
+    base = next(b for b in type(node).__mro__ if b in _INTERNED)
+    values = []
+
+    for name in _FIELDS[base]:
+        value = getattr(node, name)
+        if isinstance(value, (list, tuple)):
+            values.append([thaw(v) for v in value])
+        elif isinstance(value, _NODE_TYPES):
+            values.append(thaw(value))
+        else:
+            values.append(value)
+
+    return base(*values)
+
+
+def interned_count() -> int:
+    """Number of live interned nodes."""
+
+    return len(_TABLE)
+
+
+def _canonical(base, name, value):
+
+    if isinstance(value, (list, tuple)):
+        return tuple(intern(v) for v in value)
+
+    if isinstance(value, _NODE_TYPES):
+        return intern(value)
+
+    convert = _SCALARS.get((base, name))
+
+    return value if convert is None else convert(value)
+
+
+def _make(base, values):
+
+    # Children are interned already, so this key hashes in O(fields)
+    table_key = (base,) + values
+
+    node = _TABLE.get(table_key)
+    if node is not None:
+        return node
+
+    node = object.__new__(_INTERNED[base])
+    for name, value in zip(_FIELDS[base], values):
+        object.__setattr__(node, name, value)
+
+    digest = _digest(base, values)
+    object.__setattr__(node, "key", node_key(base(*values)))
+    object.__setattr__(node, "digest", digest)
+    object.__setattr__(node, "_hash", int.from_bytes(digest[:8], "little", signed=True))
+
+    with _LOCK:
+        return _TABLE.setdefault(table_key, node)
+
+
+def _digest(base, values) -> bytes:
+    """blake2b over the class name, scalar reprs and child digests."""
+
+    h = hashlib.blake2b(base.__name__.encode(), digest_size=16)
+
+    for value in values:
+        if isinstance(value, tuple):
+            h.update(b"(%d" % len(value))
+            for item in value:
+                _update(h, item)
+            h.update(b")")
+        else:
+            _update(h, value)
+
+    return h.digest()
+
+
+def _update(h, value):
+
+    if isinstance(value, InternedNode):
+        h.update(b"n" + value.digest)
+    else:
+        text = repr(value).encode()
+        h.update(b"s%d:" % len(text) + text)
@@ -0,0 +1,347 @@
+"""
+AST optimizer, run between parsing and code generation.
+
+    ast, report = optimize_strategy(parse_strategy_text(text))
+
+Rewrites only what is provably identical on every bar, NaN bars
+included (any comparison with NaN is False, NOT flips it to True):
+
+    constant folding   3 > 2 → TRUE; TRUE AND x → x; FALSE OR x → x
+    NOT NOT x → x
+    x > x, x < x, CROSS(x, _, x), CROSS of two numbers → FALSE
+    duplicates         repeated rules / repeated AND-OR operands
+    bound merging      close > 100 OR close > 120 → close > 100
+                       close > 100 AND close > 120 → close > 120
+                       close > 120 AND close < 100 → FALSE
+    known ranges       RSI(...) > 100, RSI(...) < 0 → FALSE
+
+FALSE rules are dropped from a block; a TRUE rule replaces the block
+with a single BooleanNode(True). Rules that are true only where the
+operand is defined (RSI(...) <= 100) are kept, since they are False on
+the NaN warm-up bars.
+"""
+
+import operator
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from parser.ast_nodes import (
+    StrategyNode,
+    EntryBlockNode,
+    ExitBlockNode,
+    LogicalOpNode,
+    CompareNode,
+    CrossNode,
+    IdentifierNode,
+    NumberNode,
+    LookbackNode,
+    IndicatorCallNode,
+    BooleanNode,
+    node_key,
+)
+
+
+# Closed value ranges of bounded indicators (NaN aside)
+INDICATOR_RANGES: Dict[str, Tuple[float, float]] = {
+    "RSI": (0.0, 100.0),
+}
+
+_COMPARE = {
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+    "==": operator.eq,
+}
+
+# Comparison seen from the other side: 100 < x  is  x > 100
+_FLIP = {">": "<", "<": ">", ">=": "<=", "<=": ">=", "==": "=="}
+
+
+@dataclass
+class OptimizationReport:
+    """What the optimizer removed or rewrote, as readable DSL snippets."""
+
+    changes: List[str] = field(default_factory=list)
+
+    def note(self, what: str, node, detail: str = "") -> None:
+        self.changes.append(f"{what}: {format_node(node)}{detail}")
+
+    def __bool__(self) -> bool:
+        return bool(self.changes)
+
+    def __str__(self) -> str:
+        return "\n".join(self.changes) if self.changes else "no changes"
+
+
+def format_node(node) -> str:
+    """DSL-like text of an AST node, for reports."""
+
+    if isinstance(node, IdentifierNode):
+        return node.name
+    if isinstance(node, NumberNode):
+        return f"{node.value:g}"
+    if isinstance(node, BooleanNode):
+        return "TRUE" if node.value else "FALSE"
+    if isinstance(node, LookbackNode):
+        return f"{node.name}[{node.offset}]"
+    if isinstance(node, IndicatorCallNode):
+        return f"{node.name}({', '.join(format_node(a) for a in node.args)})"
+    if isinstance(node, CompareNode):
+        return f"{format_node(node.left)} {node.op} {format_node(node.right)}"
+    if isinstance(node, CrossNode):
+        return f'CROSS({format_node(node.left)}, "{node.direction}", {format_node(node.right)})'
+    if isinstance(node, LogicalOpNode):
+        if node.op == "NOT":
+            return f"NOT {format_node(node.right)}"
+        return f"({format_node(node.left)} {node.op} {format_node(node.right)})"
+    if isinstance(node, str):
+        return f'"{node}"'
+    return repr(node)
+
+
+def optimize_strategy(strategy: StrategyNode) -> Tuple[StrategyNode, OptimizationReport]:
+    """Optimized copy of a StrategyNode plus a report; the input is not modified."""
+
+    report = OptimizationReport()
+
+    entry = strategy.entry
+    exit = strategy.exit
+
+    if entry is not None:
+        entry = EntryBlockNode(_optimize_block(entry.rules, report))
+    if exit is not None:
+        exit = ExitBlockNode(_optimize_block(exit.rules, report))
+
+    return StrategyNode(entry, exit), report
+
+
+def _optimize_block(rules, report: OptimizationReport) -> List:
+    """A block's rules are OR'd together, so a block is one big OR chain."""
+
+    terms = _chain("OR", [_simplify(rule, report) for rule in rules], report)
+
+    if terms is True:
+        return [BooleanNode(True)]
+    if terms is False:
+        return []
+    return terms
+
+
+def _simplify(node, report: OptimizationReport):
+    """Simplified node, or True/False when it is constant on every bar."""
+
+    if isinstance(node, BooleanNode):
+        return bool(node.value)
+
+    if isinstance(node, CompareNode):
+        return _simplify_compare(node, report)
+
+    if isinstance(node, CrossNode):
+        if isinstance(node.left, NumberNode) and isinstance(node.right, NumberNode) \
+                or node_key(node.left) == node_key(node.right):
+            report.note("always false", node)
+            return False
+        return node
+
+    if isinstance(node, LogicalOpNode):
+
+        if node.op == "NOT":
+            inner = _simplify(node.right, report)
+
+            if isinstance(inner, bool):
+                report.note("folded", node, f" → {'FALSE' if inner else 'TRUE'}")
+                return not inner
+
+            if isinstance(inner, LogicalOpNode) and inner.op == "NOT":
+                report.note("double negation", node)
+                return inner.right
+
+            return node if inner is node.right else LogicalOpNode("NOT", None, inner)
+
+        if node.op in ("AND", "OR"):
+            operands = [_simplify(term, report) for term in _flatten(node, node.op)]
+            terms = _chain(node.op, operands, report)
+
+            if isinstance(terms, bool):
+                return terms
+            return _rebuild(node.op, terms)
+
+    return node
+
+
+def _simplify_compare(node: CompareNode, report: OptimizationReport):
+
+    left, right = node.left, node.right
+
+    if isinstance(left, NumberNode) and isinstance(right, NumberNode):
+        value = _COMPARE[node.op](float(left.value), float(right.value))
+        report.note("constant", node, f" → {'TRUE' if value else 'FALSE'}")
+        return value
+
+    if node.op in (">", "<") and node_key(left) == node_key(right):
+        report.note("always false", node)
+        return False
+
+    bound = _bound(node)
+    if bound is not None and _outside_range(bound):
+        report.note("always false (out of indicator range)", node)
+        return False
+
+    return node
+
+
+def _bound(node) -> Optional[Tuple[tuple, str, float, object]]:
+    """(operand key, op, threshold, operand) for `operand op number`, either side."""
+
+    if not isinstance(node, CompareNode):
+        return None
+
+    if isinstance(node.right, NumberNode) and not isinstance(node.left, NumberNode):
+        return node_key(node.left), node.op, float(node.right.value), node.left
+
+    if isinstance(node.left, NumberNode) and not isinstance(node.right, NumberNode):
+        return node_key(node.right), _FLIP[node.op], float(node.left.value), node.right
+
+    return None
+
+
+def _outside_range(bound) -> bool:
+    """True if no value in the operand's known range satisfies the bound."""
+
+    _, op, threshold, operand = bound
+
+    if not isinstance(operand, IndicatorCallNode):
+        return False
+
+    limits = INDICATOR_RANGES.get(operand.name.upper())
+    if limits is None:
+        return False
+
+    low, high = limits
+
+    if op == ">":
+        return threshold >= high
+    if op == ">=":
+        return threshold > high
+    if op == "<":
+        return threshold <= low
+    if op == "<=":
+        return threshold < low
+    return not low <= threshold <= high
+
+
+def _flatten(node, op: str) -> List:
+    """Operands of a chain of the same AND/OR."""
+
+    if isinstance(node, LogicalOpNode) and node.op == op:
+        return _flatten(node.left, op) + _flatten(node.right, op)
+    return [node]
+
+
+def _rebuild(op: str, terms: List):
+    """Left-associative chain, as the parser builds it."""
+
+    node = terms[0]
+    for term in terms[1:]:
+        node = LogicalOpNode(op, node, term)
+    return node
+
+
+def _chain(op: str, operands: List, report: OptimizationReport):
+    """
+    Simplify the operands of one AND/OR chain. Returns True/False when
+    the chain is constant, else the remaining operands in order.
+    """
+
+    absorbing = op == "OR"        # TRUE absorbs an OR, FALSE absorbs an AND
+    terms = []
+    seen = set()
+
+    for term in operands:
+
+        if isinstance(term, bool):
+            if term == absorbing:
+                return absorbing
+            continue
+
+        # Flattening may surface nested chains of the same op
+        for part in _flatten(term, op):
+            key = node_key(part)
+            if key in seen:
+                report.note("duplicate", part)
+                continue
+            seen.add(key)
+            terms.append(part)
+
+    if not terms:
+        return not absorbing
+
+    return _merge_bounds(op, terms, report)
+
+
+def _merge_bounds(op: str, terms: List, report: OptimizationReport):
+    """
+    Merge `x > a` style comparisons on the same operand. In an OR chain
+    the weakest bound on each side implies the others; in an AND chain
+    the strongest does, and an empty interval makes the chain FALSE.
+    """
+
+    groups: Dict[Tuple[tuple, str], List[int]] = {}
+    bounds = {}
+
+    for i, term in enumerate(terms):
+        bound = _bound(term)
+        if bound is None or bound[1] == "==":
+            continue
+
+        key, cmp, threshold, _ = bound
+        side = "lower" if cmp in (">", ">=") else "upper"
+        groups.setdefault((key, side), []).append(i)
+        bounds[i] = (side, threshold, cmp in (">", "<"))
+
+    drop = set()
+    best_of = {}
+
+    for (key, side), members in groups.items():
+
+        best = members[0]
+        for i in members[1:]:
+            if _stronger(bounds[i], bounds[best]) == (op == "AND"):
+                best = i
+
+        best_of[(key, side)] = best
+
+        for i in members:
+            if i != best:
+                report.note("merged", terms[i], f" (implied by {format_node(terms[best])})")
+                drop.add(i)
+
+    if op == "AND":
+        for (key, side), lower in best_of.items():
+            upper = best_of.get((key, "upper"))
+            if side == "lower" and upper is not None and _empty(bounds[lower], bounds[upper]):
+                report.note("contradiction", _rebuild("AND", [terms[lower], terms[upper]]), " → FALSE")
+                return False
+
+    return [term for i, term in enumerate(terms) if i not in drop]
+
+
+def _stronger(a, b) -> bool:
+    """Is bound `a` strictly more restrictive than `b` (same operand, same side)?"""
+
+    side, ta, strict_a = a
+    _, tb, strict_b = b
+
+    if ta == tb:
+        return strict_a and not strict_b
+    return ta > tb if side == "lower" else ta < tb
+
+
+def _empty(lower, upper) -> bool:
+    """No value satisfies both a lower and an upper bound."""
+
+    _, low, strict_low = lower
+    _, high, strict_high = upper
+
+    return low > high or (low == high and (strict_low or strict_high))
@@ -1,5 +1,5 @@
-from typing import List, Optional
-from dsl.tokenizer import tokenize_text, Token
+from typing import List
+from dsl.tokenizer import tokenize_fast
 from parser.token_stream import TokenStream
 from dsl.operators import (
     is_logical_op,
@@ -7,6 +7,7 @@ from dsl.operators import (
     canonicalize_logical,
 )
 from dsl.indicators import is_supported
+from parser.interned import intern as intern_node
 from parser.ast_nodes import (
     StrategyNode,
     EntryBlockNode,
@@ -21,15 +22,19 @@ from parser.ast_nodes import (
 )
 
 
-def parse_strategy_text(text: str) -> StrategyNode:
+def parse_strategy_text(text: str, intern: bool = False) -> StrategyNode:
     """
     Top-level function used by main.py:
         DSL text → AST StrategyNode
+    With intern=True the tree is built from shared immutable nodes
+    (see parser.interned).
     """
 
-    tokens = tokenize_text(text)
+    tokens = tokenize_fast(text)
     stream = TokenStream(tokens)
-    return parse_strategy(stream)
+    strategy = parse_strategy(stream)
+
+    return intern_node(strategy) if intern else strategy
 
 
 def parse_strategy(ts: TokenStream) -> StrategyNode:
@@ -42,15 +47,15 @@ def parse_strategy(ts: TokenStream) -> StrategyNode:
     entry_block = None
     exit_block = None
 
-    if ts.match("IDENT", "ENTRY"):
+    if ts.match_value("IDENT", "ENTRY"):
 
-        ts.expect("COLON")
+        ts.expect_value("COLON")
         entry_rules = parse_rule_list(ts)
         entry_block = EntryBlockNode(entry_rules)
 
-    if ts.match("IDENT", "EXIT"):
+    if ts.match_value("IDENT", "EXIT"):
 
-        ts.expect("COLON")
+        ts.expect_value("COLON")
         exit_rules = parse_rule_list(ts)
         exit_block = ExitBlockNode(exit_rules)
 
@@ -71,30 +76,28 @@ def parse_rule_list(ts: TokenStream) -> List:
 
     while True:
 
-        nexttok = ts.peek()
-
-        if nexttok is None:
-            break
-
-        if nexttok.type == "IDENT" and nexttok.value.upper() in ("ENTRY", "EXIT"):
+        if _at_block_start(ts):
             break
 
         rules.append(parse_expr(ts))
 
-        while ts.match("NEWLINE"):
+        while ts.match_value("NEWLINE"):
             pass
 
-        nexttok = ts.peek()
-
-        if nexttok is None:
-            break
-
-        if nexttok.type == "IDENT" and nexttok.value.upper() in ("ENTRY", "EXIT"):
+        if _at_block_start(ts):
             break
 
     return rules
 
 
+def _at_block_start(ts: TokenStream) -> bool:
+    """End of input, or an ENTRY/EXIT header."""
+
+    kind = ts.peek_type()
+
+    return kind is None or (kind == "IDENT" and ts.peek_value().upper() in ("ENTRY", "EXIT"))
+
+
 def parse_expr(ts: TokenStream):
     """
     EXPR ::= TERM ( (AND | OR) TERM )*
@@ -105,11 +108,12 @@ def parse_expr(ts: TokenStream):
 
     while True:
 
-        tok = ts.peek()
+        value = ts.peek_value()
 
-        if tok and tok.type == "IDENT" and is_logical_op(tok.value):
+        # NOT is prefix-only (see parse_term), so a NOT here starts the next rule
+        if ts.peek_type() == "IDENT" and is_logical_op(value) and canonicalize_logical(value) != "NOT":
 
-            op = canonicalize_logical(ts.next().value)
+            op = canonicalize_logical(ts.advance())
             right = parse_term(ts)
             node = LogicalOpNode(op, node, right)
 
@@ -121,13 +125,17 @@ def parse_expr(ts: TokenStream):
 
 def parse_term(ts: TokenStream):
     """
-    TERM ::= FACTOR | "(" EXPR ")"
+    TERM ::= "NOT" TERM | FACTOR | "(" EXPR ")"
     """
 
-    if ts.match("LPAREN"):
+    if ts.match_value("IDENT", "NOT"):
+
+        return LogicalOpNode("NOT", None, parse_term(ts))
+
+    if ts.match_value("LPAREN"):
 
         inner = parse_expr(ts)
-        ts.expect("RPAREN")
+        ts.expect_value("RPAREN")
         return inner
 
     return parse_factor(ts)
@@ -138,19 +146,15 @@ def parse_factor(ts: TokenStream):
     FACTOR ::= COMPARISON | CROSS_EVENT
     """
     
-    tok = ts.peek()
-
-    if tok and tok.type == "IDENT" and tok.value.upper() == "CROSS":
+    if ts.peek_type() == "IDENT" and ts.peek_value().upper() == "CROSS":
 
         return parse_cross_event(ts)
 
     left = parse_operand(ts)
 
-    tok = ts.peek()
-
-    if tok and tok.type == "OP" and is_comparison_op(tok.value):
+    if ts.peek_type() == "OP" and is_comparison_op(ts.peek_value()):
 
-        op = ts.next().value
+        op = ts.advance()
         right = parse_operand(ts)
 
         return CompareNode(left, op, right)
@@ -159,36 +163,37 @@ def parse_factor(ts: TokenStream):
 
 
 def parse_operand(ts: TokenStream):
-    tok = ts.peek()
+    kind = ts.peek_type()
 
-    if tok is None:
+    if kind is None:
         raise SyntaxError("Unexpected end while parsing operand")
 
-    if tok.type == "NUMBER":
+    if kind == "NUMBER":
+
+        return NumberNode(float(ts.advance()))
+
+    if kind == "STRING":
 
-        ts.next()
-        return NumberNode(float(tok.value))
+        return ts.advance().strip('"')
 
-    if tok.type == "STRING":
+    if kind == "IDENT":
 
-        ts.next()
-        return tok.value.strip('"')  
+        name = ts.advance()
 
-    if tok.type == "IDENT":
+        if ts.match_value("LBRACK"):
 
-        ident_tok = ts.next()
-        name = ident_tok.value
+            offset = ts.expect_value("NUMBER")
+            ts.expect_value("RBRACK")
 
-        if ts.match("LBRACK"):
+            if not offset.isdigit():
+                raise SyntaxError(f"Lookback offset must be a whole number: {name}[{offset}]")
 
-            idx_tok = ts.expect("NUMBER")
-            ts.expect("RBRACK")
-            return LookbackNode(name, int(idx_tok.value))
+            return LookbackNode(name, int(offset))
 
-        if ts.match("LPAREN"):
+        if ts.match_value("LPAREN"):
             
             args = parse_arg_list(ts)
-            ts.expect("RPAREN")
+            ts.expect_value("RPAREN")
 
             if not is_supported(name):
                 raise SyntaxError(f"Unknown indicator {name}")
@@ -197,7 +202,7 @@ def parse_operand(ts: TokenStream):
 
         return IdentifierNode(name)
 
-    raise SyntaxError(f"Unexpected token {tok.type}({tok.value}) while parsing operand")
+    raise SyntaxError(f"Unexpected token {kind}({ts.peek_value()}) while parsing operand")
 
 
 def parse_arg_list(ts: TokenStream):
@@ -208,13 +213,13 @@ def parse_arg_list(ts: TokenStream):
     
     args = []
 
-    if ts.peek() and ts.peek().type == "RPAREN":
+    if ts.peek_type() == "RPAREN":
 
         return args
 
     args.append(parse_operand(ts))
 
-    while ts.match("COMMA"):
+    while ts.match_value("COMMA"):
 
         args.append(parse_operand(ts))
 
@@ -227,21 +232,20 @@ def parse_cross_event(ts: TokenStream):
     DIRECTION ::= "ABOVE" or "BELOW" (STRING token)
     """
 
-    ts.expect("IDENT", "CROSS")
-    ts.expect("LPAREN")
+    ts.expect_value("IDENT", "CROSS")
+    ts.expect_value("LPAREN")
 
     left = parse_operand(ts)
-    ts.expect("COMMA")
+    ts.expect_value("COMMA")
 
-    dir_tok = ts.expect("STRING")
-    direction = dir_tok.value.strip('"').upper()
+    direction = ts.expect_value("STRING").strip('"').upper()
 
     if direction not in ("ABOVE", "BELOW"):
         
         raise SyntaxError(f"Invalid CROSS direction: {direction}")
 
-    ts.expect("COMMA")
+    ts.expect_value("COMMA")
     right = parse_operand(ts)
 
-    ts.expect("RPAREN")
+    ts.expect_value("RPAREN")
     return CrossNode(left, direction, right)
@@ -1,18 +1,32 @@
-from typing import List, Optional
-from dsl.tokenizer import Token
+from typing import List, Optional, Union
+from dsl.tokenizer import Token, TokenArrays
 
 
 class TokenStream:
-    
-    def __init__(self, tokens: List[Token]):
+    """
+    Cursor over a token sequence. The parser reads token types and values
+    straight from parallel lists (those of TokenArrays as they are), so
+    parsing tokenize_fast output creates no token objects: the parser
+    uses the *_value methods, which return token text. peek(), next(),
+    match() and expect() still hand out tokens, built on demand.
+    """
+
+    def __init__(self, tokens: Union[List[Token], TokenArrays]):
+
+        if isinstance(tokens, TokenArrays):
+            self.types, self.values = tokens.types, tokens.values
+        else:
+            self.types = [tok.type for tok in tokens]
+            self.values = [tok.value for tok in tokens]
+
         self.tokens = tokens
-        self.pos = 0 
+        self.pos = 0
 
 
     def peek(self) -> Optional[Token]:
         """Return the current token without consuming it."""
 
-        if self.pos >= len(self.tokens):
+        if self.pos >= len(self.types):
             return None
         return self.tokens[self.pos]
 
@@ -20,30 +34,43 @@ class TokenStream:
     def next(self) -> Optional[Token]:
         """Consume the current token and advance."""
 
-        if self.pos >= len(self.tokens):
-            return None
-        tok = self.tokens[self.pos]
-        self.pos += 1
+        tok = self.peek()
+        if tok is not None:
+            self.pos += 1
         return tok
 
 
+    def peek_type(self) -> Optional[str]:
+        """Type of the current token (None at the end)."""
+
+        return self.types[self.pos] if self.pos < len(self.types) else None
+
+
+    def peek_value(self) -> Optional[str]:
+        """Text of the current token (None at the end)."""
+
+        return self.values[self.pos] if self.pos < len(self.values) else None
+
+
+    def advance(self) -> Optional[str]:
+        """Consume the current token and return its text."""
+
+        value = self.peek_value()
+        if value is not None:
+            self.pos += 1
+        return value
+
+
     def match(self, type_: str, value: Optional[str] = None) -> Optional[Token]:
         """
         If the current token matches both type (and optionally value),
         consume and return it. Otherwise return None.
         """
 
-        tok = self.peek()
-        if tok is None:
-            return None
-
-        if tok.type != type_:
-            return None
-        
-        if value is not None and tok.value.upper() != value.upper():
+        if self.match_value(type_, value) is None:
             return None
 
-        return self.next()
+        return self.tokens[self.pos - 1]
 
 
     def expect(self, type_: str, value: Optional[str] = None) -> Token:
@@ -52,9 +79,29 @@ class TokenStream:
         token is not present.
         """
 
-        tok = self.match(type_, value)
+        self.expect_value(type_, value)
+
+        return self.tokens[self.pos - 1]
+
+
+    def match_value(self, type_: str, value: Optional[str] = None) -> Optional[str]:
+        """match() returning the token's text, without building a Token."""
+
+        if self.pos >= len(self.types) or self.types[self.pos] != type_:
+            return None
+
+        if value is not None and self.values[self.pos].upper() != value.upper():
+            return None
 
-        if tok is None:
+        return self.advance()
+
+
+    def expect_value(self, type_: str, value: Optional[str] = None) -> str:
+        """expect() returning the token's text, without building a Token."""
+
+        text = self.match_value(type_, value)
+
+        if text is None:
 
             expected = f"{type_}" if value is None else f"{type_}({value})"
             actual = self.peek()
@@ -65,15 +112,15 @@ class TokenStream:
                     f"Expected {expected}, got {actual.type}({actual.value}) "
                     f"at line {actual.line}, col {actual.col}"
                 )
-            
+
             else:
 
                 raise SyntaxError(f"Expected {expected}, but hit end of input")
-            
-        return tok
+
+        return text
 
 
     def at_end(self) -> bool:
         """True if the stream has no more tokens."""
 
-        return self.pos >= len(self.tokens)
+        return self.pos >= len(self.types)
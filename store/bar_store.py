@@ -0,0 +1,236 @@
+"""
+Local columnar OHLCV store.
+
+Layout under `root`:
+
+    index.json                  symbol -> length and column dtypes
+    <symbol>/<column>.bin       one contiguous typed array per column
+
+Data is ingested once; afterwards `load` memory-maps the column files
+read-only, so evaluators and run_backtest work on zero-copy NumPy views
+and a job over thousands of symbols skips CSV parsing and DataFrame
+construction entirely. Columns are mapped lazily on first access.
+"""
+
+import json
+import os
+import tempfile
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence
+import numpy as np
+import pandas as pd
+
+
+OHLCV = ("open", "high", "low", "close", "volume")
+
+_INDEX_FILE = "index.json"
+_INDEX_COLUMN = "_index"
+
+
+class StoreColumns(Mapping):
+    """Read-only mapping column -> np.memmap for one symbol, opened on demand."""
+
+    def __init__(self, directory: str, length: int, dtypes: Dict[str, str]):
+        self._directory = directory
+        self._length = length
+        self._dtypes = dtypes
+        self._arrays: Dict[str, np.ndarray] = {}
+
+    def __getitem__(self, name: str) -> np.ndarray:
+
+        values = self._arrays.get(name)
+
+        if values is None:
+            if name not in self._dtypes:
+                raise KeyError(name)
+
+            dtype = np.dtype(self._dtypes[name])
+            if self._length == 0:
+                values = np.empty(0, dtype=dtype)
+            else:
+                path = os.path.join(self._directory, f"{name}.bin")
+                values = np.memmap(path, dtype=dtype, mode="r", shape=(self._length,))
+            self._arrays[name] = values
+
+        return values
+
+    def __iter__(self) -> Iterator[str]:
+        return (name for name in self._dtypes if name != _INDEX_COLUMN)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    @property
+    def index(self) -> Optional[np.ndarray]:
+        """Stored row labels (e.g. datetime64 timestamps), if any."""
+
+        if _INDEX_COLUMN not in self._dtypes:
+            return None
+        return self[_INDEX_COLUMN]
+
+
+class BarStore:
+    """Directory of memory-mappable per-symbol column files."""
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._index = self._read_index()
+
+
+    def symbols(self) -> List[str]:
+        return sorted(self._index)
+
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._index
+
+
+    def length(self, symbol: str) -> int:
+        return self._index[symbol]["length"]
+
+
+    def ingest(self, symbol: str, df: pd.DataFrame, columns: Sequence[str] = OHLCV) -> None:
+        """Write (or replace) a symbol's columns from a DataFrame."""
+
+        directory = self._symbol_dir(symbol)
+        os.makedirs(directory, exist_ok=True)
+
+        dtypes = {}
+
+        for name, values in self._arrays_from(df, columns).items():
+            values = np.ascontiguousarray(values)
+            _write_atomic(os.path.join(directory, f"{name}.bin"), values.tobytes())
+            dtypes[name] = values.dtype.str
+
+        self._index[symbol] = {"length": len(df), "columns": dtypes}
+        self._write_index()
+
+
+    def append(self, symbol: str, df: pd.DataFrame) -> None:
+        """
+        Append new bars to an existing symbol (same columns and dtypes).
+        Everything is checked before the first byte is written, and a write
+        that fails midway is truncated back, so the symbol is never left
+        with columns of different lengths.
+        """
+
+        if symbol not in self._index:
+            self.ingest(symbol, df)
+            return
+
+        entry = self._index[symbol]
+        directory = self._symbol_dir(symbol)
+        arrays = self._checked_arrays(symbol, df, entry["columns"])
+
+        paths = {name: os.path.join(directory, f"{name}.bin") for name in arrays}
+        sizes = {name: entry["length"] * np.dtype(dtype).itemsize
+                 for name, dtype in entry["columns"].items()}
+
+        try:
+            for name, values in arrays.items():
+                with open(paths[name], "r+b") as f:
+                    f.truncate(sizes[name])
+                    f.seek(sizes[name])
+                    f.write(values.tobytes())
+        except OSError:
+            for name, path in paths.items():
+                if os.path.exists(path):
+                    os.truncate(path, sizes[name])
+            raise
+
+        entry["length"] += len(df)
+        self._write_index()
+
+
+    def load(self, symbol: str) -> StoreColumns:
+        """Zero-copy column views for one symbol."""
+
+        entry = self._index[symbol]
+
+        return StoreColumns(self._symbol_dir(symbol), entry["length"], entry["columns"])
+
+
+    def frame(self, symbol: str) -> pd.DataFrame:
+        """Convenience DataFrame over the stored columns (may copy)."""
+
+        columns = self.load(symbol)
+        index = columns.index
+
+        return pd.DataFrame({name: columns[name] for name in columns},
+                            index=None if index is None else pd.Index(index))
+
+
+    def _arrays_from(self, df: pd.DataFrame, columns: Sequence[str]) -> Dict[str, np.ndarray]:
+
+        arrays = {name: df[name].to_numpy() for name in columns}
+
+        if isinstance(df.index, pd.DatetimeIndex):
+            arrays[_INDEX_COLUMN] = df.index.to_numpy(dtype="datetime64[ns]")
+
+        return arrays
+
+
+    def _checked_arrays(self, symbol: str, df: pd.DataFrame, dtypes: Dict[str, str]) -> Dict[str, np.ndarray]:
+        """Arrays of `df` in the stored dtypes; ValueError unless each column converts safely."""
+
+        missing = [name for name in dtypes if name != _INDEX_COLUMN and name not in df.columns]
+        if _INDEX_COLUMN in dtypes and not isinstance(df.index, pd.DatetimeIndex):
+            missing.append("DatetimeIndex")
+        if missing:
+            raise ValueError(f"Appended bars for {symbol!r} are missing {', '.join(missing)}")
+
+        columns = [name for name in dtypes if name != _INDEX_COLUMN]
+        arrays = self._arrays_from(df, columns)
+        if _INDEX_COLUMN not in dtypes:
+            arrays.pop(_INDEX_COLUMN, None)
+
+        checked = {}
+
+        for name, dtype in dtypes.items():
+            values = arrays[name]
+
+            if not np.can_cast(values.dtype, dtype, casting="safe"):
+                raise ValueError(f"Appended {name!r} for {symbol!r} is {values.dtype}, stored as {np.dtype(dtype)}")
+
+            checked[name] = np.ascontiguousarray(values, dtype=dtype)
+
+        return checked
+
+
+    def _symbol_dir(self, symbol: str) -> str:
+
+        if not symbol or os.sep in symbol or symbol in (".", ".."):
+            raise ValueError(f"Invalid symbol name {symbol!r}")
+
+        return os.path.join(self.root, symbol)
+
+
+    def _read_index(self) -> Dict[str, Any]:
+
+        path = os.path.join(self.root, _INDEX_FILE)
+
+        if not os.path.exists(path):
+            return {}
+
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)["symbols"]
+
+
+    def _write_index(self) -> None:
+
+        payload = json.dumps({"version": 1, "symbols": self._index}, indent=1)
+        _write_atomic(os.path.join(self.root, _INDEX_FILE), payload.encode("utf-8"))
+
+
+def _write_atomic(path: str, payload: bytes) -> None:
+
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(tmp, path)
+    except OSError:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
@@ -0,0 +1,399 @@
+"""
+Persistent indicator cache.
+
+    cache = IndicatorCache(cache_dir=".indicator_cache")
+    rsi = cache.compute("RSI", [close], [14])
+
+Entries are keyed by the indicator, its parameters and a fingerprint of
+each input series (a digest of its dtype and first HEAD_ROWS values), so
+the same history gives the same key in every run and after appends.
+Each entry also records how many rows it covers and a digest of those
+input rows; a lookup only uses it if the caller's data starts with
+exactly those rows.
+
+Tiers:
+    memory   LRU bounded by `max_memory_bytes` of cached values
+    disk     `<key>.npy` values (memory-mapped on load) plus a
+             `<key>.json` sidecar under `cache_dir`; least recently used
+             files are evicted past `max_disk_bytes`
+
+When the input has grown since an entry was written, only the new rows
+are computed: recursive indicators (RSI, EMA, ATR) continue from the
+stored smoothing state, HIGHEST/LOWEST and composites from the tail of
+their inputs. Rolling sums (SMA, STDDEV) round differently when started
+from a tail, so by default they are recomputed in full on append to
+keep results identical to an uncached run; exact=False extends them
+from the tail too (like engine.chunked with exact=False), at the cost
+of last-bit differences.
+
+engine.interpreter.Interpreter(columns, indicators=cache) and
+codegen.runtime.indicator_cache(cache) read through it.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+
+from dsl.indicators import get_indicator_spec, canonicalize_name
+from engine import kernels
+
+
+# Bump whenever kernels or the entry format change what a key maps to
+CACHE_VERSION = 1
+
+# Rows of each input hashed into the key
+HEAD_ROWS = 1024
+
+# Windowed kernels whose values depend only on their window
+_EXACT_WINDOW = {"HIGHEST", "LOWEST"}
+
+
+@dataclass
+class CachedSeries:
+    """Indicator values over the first `length` rows of its inputs."""
+
+    values: np.ndarray
+    length: int
+    digest: str                     # of those input rows
+    state: Optional[Dict] = None    # {"seeds": [...]} for recursive indicators
+
+
+class IndicatorCache:
+    """Two-tier (memory LRU + .npy files) cache of indicator arrays."""
+
+    def __init__(self,
+                 cache_dir: Optional[str] = None,
+                 max_memory_bytes: int = 256 * 2**20,
+                 max_disk_bytes: int = 4 * 2**30,
+                 exact: bool = True):
+        self.cache_dir = cache_dir
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.exact = exact
+
+        self._entries: "OrderedDict[str, CachedSeries]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.RLock()
+
+        self.hits = 0
+        self.extensions = 0
+        self.misses = 0
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+
+    def compute(self, name: str, inputs: Sequence[np.ndarray], params: Sequence,
+                parts: Optional[List[np.ndarray]] = None) -> np.ndarray:
+        """
+        Indicator `name` over `inputs`, from the cache when possible.
+        Composite parts are computed through the cache too unless given.
+        """
+
+        name = canonicalize_name(name)
+        inputs = [kernels.as_float(x) for x in inputs]
+
+        # Panels (time x symbol) are not cached
+        if any(x.ndim != 1 for x in inputs):
+            return self._kernel(name, inputs, params, parts)
+
+        key = self.key(name, inputs, params)
+        n = len(inputs[0])
+
+        entry = self.get(key)
+        hasher = _Hasher(inputs)
+
+        usable = entry is not None and entry.length <= n and hasher.digest(entry.length) == entry.digest
+
+        if usable and entry.length == n:
+            self.hits += 1
+            return entry.values
+
+        if usable and self._extendable(name):
+            values, state = self._extend(name, entry, inputs, params, parts)
+            self.extensions += 1
+        else:
+            values, state = self._full(name, inputs, params, parts)
+            self.misses += 1
+
+        self.put(key, CachedSeries(values, n, hasher.digest(n), state))
+
+        return values
+
+
+    def key(self, name: str, inputs: Sequence[np.ndarray], params: Sequence) -> str:
+        """Entry key: indicator, parameters and input fingerprints."""
+
+        h = hashlib.sha256(f"v{CACHE_VERSION}:{name}:{[float(p) for p in params]!r}".encode())
+
+        for x in inputs:
+            h.update(_fingerprint(x))
+
+        return h.hexdigest()
+
+
+    # -- computation ----------------------------------------------------
+
+    def _kernel(self, name, inputs, params, parts):
+
+        spec = get_indicator_spec(name)
+
+        if spec.parts is None:
+            return spec.kernel(*inputs, *params)
+
+        return spec.kernel(*inputs, *params, parts=self._parts(spec, inputs, params, parts))
+
+
+    def _parts(self, spec, inputs, params, parts):
+
+        if parts is not None:
+            return [kernels.as_float(p) for p in parts]
+
+        parts = []
+        for part, source, part_params in spec.parts(*params):
+            src_inputs = inputs if source is None else [parts[source]]
+            parts.append(self.compute(part, src_inputs, part_params))
+
+        return parts
+
+
+    def _full(self, name, inputs, params, parts):
+
+        spec = get_indicator_spec(name)
+
+        if spec.smoothing is None:
+            return self._kernel(name, inputs, params, parts), None
+
+        smoothing = spec.smoothing
+        alpha = smoothing.alpha(*params)
+        streams = smoothing.pre(*inputs)
+        smoothed = [kernels.ewm_mean(s, alpha) for s in streams]
+
+        state = {"seeds": [kernels.ewm_seed(s, m) for s, m in zip(streams, smoothed)]}
+
+        return smoothing.post(*smoothed), state
+
+
+    def _extendable(self, name) -> bool:
+        """Can new rows be computed from the stored entry without changing old results?"""
+
+        spec = get_indicator_spec(name)
+
+        return (spec.smoothing is not None or spec.parts is not None
+                or name in _EXACT_WINDOW or not self.exact)
+
+
+    def _extend(self, name, entry: CachedSeries, inputs, params, parts):
+        """Values for all rows, computing only those after entry.length."""
+
+        spec = get_indicator_spec(name)
+        done = entry.length
+
+        if spec.smoothing is not None:
+            smoothing = spec.smoothing
+            start = max(done - smoothing.history, 0)
+            streams = [s[done - start:] for s in smoothing.pre(*(x[start:] for x in inputs))]
+
+            alpha = smoothing.alpha(*params)
+            seeds = entry.state["seeds"]
+            smoothed = [kernels.ewm_continue(s, alpha, seed) for s, seed in zip(streams, seeds)]
+
+            new = smoothing.post(*smoothed)
+            state = {"seeds": [kernels.ewm_seed(s, m, seed)
+                               for s, m, seed in zip(streams, smoothed, seeds)]}
+
+        else:
+            start = max(done - spec.history(*params), 0)
+            tail = [x[start:] for x in inputs]
+
+            if spec.parts is None:
+                new = spec.kernel(*tail, *params)[done - start:]
+            else:
+                full_parts = self._parts(spec, inputs, params, parts)
+                new = spec.kernel(*tail, *params, parts=[p[start:] for p in full_parts])[done - start:]
+            state = None
+
+        return np.concatenate((entry.values, new)), state
+
+
+    # -- tiers ----------------------------------------------------------
+
+    def get(self, key: str) -> Optional[CachedSeries]:
+        """Entry for `key` from memory, then disk; None if absent."""
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        entry = self._load(key)
+        if entry is not None:
+            self._remember(key, entry)
+
+        return entry
+
+
+    def put(self, key: str, entry: CachedSeries) -> None:
+
+        # Shared between callers from now on
+        entry.values.setflags(write=False)
+
+        self._remember(key, entry)
+        self._store(key, entry)
+
+
+    def clear(self) -> None:
+        """Drop the memory tier (files in cache_dir are kept)."""
+
+        with self._lock:
+            self._entries.clear()
+            self._memory_bytes = 0
+
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+    def _remember(self, key: str, entry: CachedSeries) -> None:
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._memory_bytes -= old.values.nbytes
+
+            self._entries[key] = entry
+            self._memory_bytes += entry.values.nbytes
+
+            while self._memory_bytes > self.max_memory_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._memory_bytes -= evicted.values.nbytes
+
+
+    def _paths(self, key: str):
+        return os.path.join(self.cache_dir, f"{key}.npy"), os.path.join(self.cache_dir, f"{key}.json")
+
+
+    def _load(self, key: str) -> Optional[CachedSeries]:
+        """Memory-mapped entry from disk, ignoring stale or unreadable files."""
+
+        if not self.cache_dir:
+            return None
+
+        values_path, meta_path = self._paths(key)
+
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            values = np.load(values_path, mmap_mode="r")
+        except (OSError, ValueError, KeyError):
+            return None
+
+        if meta.get("version") != CACHE_VERSION or len(values) != meta.get("length"):
+            return None
+
+        state = meta.get("state")
+        if state is not None:
+            state = {"seeds": [(float(last), int(gap)) for last, gap in state["seeds"]]}
+
+        # Touch for LRU eviction
+        try:
+            os.utime(values_path)
+        except OSError:
+            pass
+
+        return CachedSeries(values, meta["length"], meta["digest"], state)
+
+
+    def _store(self, key: str, entry: CachedSeries) -> None:
+        """Write values then sidecar, both atomically; then evict past the size limit."""
+
+        if not self.cache_dir:
+            return
+
+        values_path, meta_path = self._paths(key)
+        meta = {
+            "version": CACHE_VERSION,
+            "length": entry.length,
+            "digest": entry.digest,
+            "state": entry.state,
+        }
+
+        try:
+            _write_atomic(values_path, lambda f: np.save(f, np.ascontiguousarray(entry.values)), self.cache_dir)
+            _write_atomic(meta_path, lambda f: f.write(json.dumps(meta).encode("utf-8")), self.cache_dir)
+        except OSError:
+            return
+
+        self._evict_disk()
+
+
+    def _evict_disk(self) -> None:
+
+        files = []
+        total = 0
+
+        for item in os.scandir(self.cache_dir):
+            if item.name.endswith(".npy"):
+                stat = item.stat()
+                files.append((stat.st_mtime, item.path, stat.st_size))
+                total += stat.st_size
+
+        for _, path, size in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+
+            for victim in (path, path[:-len(".npy")] + ".json"):
+                try:
+                    os.remove(victim)
+                except OSError:
+                    pass
+            total -= size
+
+
+class _Hasher:
+    """Digests of growing row prefixes of the same inputs, hashing each row once."""
+
+    def __init__(self, inputs):
+        self.inputs = inputs
+        self.rows = 0
+        self.hashes = [hashlib.sha256() for _ in inputs]
+
+    def digest(self, rows: int) -> str:
+
+        if rows < self.rows:
+            self.rows, self.hashes = 0, [hashlib.sha256() for _ in self.inputs]
+
+        for x, h in zip(self.inputs, self.hashes):
+            h.update(np.ascontiguousarray(x[self.rows:rows]).data)
+        self.rows = rows
+
+        return ":".join(h.hexdigest() for h in self.hashes)
+
+
+def _fingerprint(x: np.ndarray) -> bytes:
+    """Stable identity of a series that survives appends."""
+
+    head = np.ascontiguousarray(x[:HEAD_ROWS])
+
+    return hashlib.sha256(x.dtype.str.encode() + head.data).digest()
+
+
+def _write_atomic(path: str, write, directory: str) -> None:
+
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+    except OSError:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
@@ -0,0 +1,102 @@
+"""
+Columns in shared memory.
+
+    with SharedColumns(columns) as shared:
+        # hand shared.layout to pool workers, which call
+        # attach_columns(layout) to get the same arrays
+        ...
+
+The owner copies each column once into its own
+multiprocessing.shared_memory block; other processes map the same pages
+and get zero-copy NumPy arrays. Only the small, picklable `layout`
+(block names, dtypes, lengths) travels to them. The owner unlinks the
+blocks on close.
+"""
+
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Mapping, Tuple
+import numpy as np
+
+
+# column -> (block name, dtype str, length)
+Layout = Dict[str, Tuple[str, str, int]]
+
+
+class SharedColumns:
+    """Shared-memory copies of 1-D arrays, owned (and unlinked) by this process."""
+
+    def __init__(self, columns: Mapping[str, Any]):
+        self.layout: Layout = {}
+        self.arrays: Dict[str, np.ndarray] = {}
+        self._blocks: List[shared_memory.SharedMemory] = []
+
+        try:
+            for name, values in columns.items():
+                values = np.ascontiguousarray(values)
+
+                block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+                self._blocks.append(block)
+
+                array = np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf)
+                array[:] = values
+
+                self.arrays[name] = array
+                self.layout[name] = (block.name, values.dtype.str, len(values))
+        except BaseException:
+            self.close()
+            raise
+
+
+    def close(self) -> None:
+        """Release and unlink every block; arrays handed out become invalid."""
+
+        self.arrays = {}
+
+        for block in self._blocks:
+            try:
+                block.close()
+            except BufferError:
+                # A view is still alive somewhere; the mapping goes with it
+                pass
+            block.unlink()
+
+        self._blocks = []
+
+
+    def __enter__(self) -> "SharedColumns":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def attach_columns(layout: Layout, writable: bool = False) -> Tuple[List[shared_memory.SharedMemory], Dict[str, np.ndarray]]:
+    """
+    Arrays over the blocks of another process's SharedColumns. Keep the
+    returned blocks referenced for as long as the arrays are used.
+    """
+
+    blocks, arrays = [], {}
+
+    for name, (block_name, dtype, length) in layout.items():
+        block = _attach(block_name)
+        blocks.append(block)
+
+        array = np.ndarray((length,), dtype=np.dtype(dtype), buffer=block.buf)
+        array.flags.writeable = writable
+        arrays[name] = array
+
+    return blocks, arrays
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+
+    try:
+        # Python 3.13+: the owner alone tracks the block
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Older versions register it again with the resource tracker.
+        # Pool workers share the owner's tracker, so that registration
+        # is a duplicate the owner's unlink() clears; unregistering here
+        # would drop the owner's own entry instead.
+        return shared_memory.SharedMemory(name=name)
@@ -0,0 +1,113 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_bars(n: int, seed: int = 0, gaps: bool = False) -> pd.DataFrame:
+    """Random-walk OHLCV bars; gaps=True puts NaNs into close."""
+
+    rng = np.random.default_rng(seed)
+    close = 1000 + np.cumsum(rng.normal(0, 1, n))
+
+    if gaps:
+        close[rng.choice(n, size=max(n // 100, 1), replace=False)] = np.nan
+
+    return pd.DataFrame({
+        "open": close + rng.normal(0, 0.5, n),
+        "high": close + rng.random(n),
+        "low": close - rng.random(n),
+        "close": close,
+        "volume": rng.random(n) * 2e6,
+    })
+
+
+@pytest.fixture
+def bars():
+    return make_bars(5_000, gaps=True)
+
+
+_PRICE = ["close", "open", "high", "low", "close[1]", "high[2]"]
+_PERIODS = [1, 2, 3, 5, 14, 20]
+
+
+def _operand(rng, kind):
+    """Random DSL operand text of a kind: 'price', 'oscillator' or 'spread'."""
+
+    p = lambda: int(rng.choice(_PERIODS))
+    pick = lambda options: options[rng.integers(len(options))]()
+
+    if kind == "price":
+        return pick([
+            lambda: str(rng.choice(_PRICE)),
+            lambda: f"SMA(close, {p()})",
+            lambda: f"EMA(close, {p()})",
+            lambda: f"HIGHEST(high, {p()})",
+            lambda: f"LOWEST(low, {p()})",
+            lambda: f"BB_MIDDLE(close, {p()})",
+            lambda: f"BB_UPPER(close, {p()}, 2)",
+            lambda: f"BB_LOWER(close, {p()}, 1.5)",
+            lambda: f"EMA(SMA(close, {p()}), {p()})",
+            lambda: f"{1000 + rng.integers(-20, 20)}",
+        ])
+
+    if kind == "oscillator":
+        return pick([
+            lambda: f"RSI(close, {p()})",
+            lambda: f"SMA(RSI(close, {p()}), {p()})",
+            lambda: f"{rng.integers(20, 80)}",
+        ])
+
+    return pick([
+        lambda: f"MACD(close, {p()}, {p()})",
+        lambda: f"MACD_SIGNAL(close, {p()}, {p()}, {p()})",
+        lambda: f"MACD_HIST(close, {p()}, {p()}, {p()})",
+        lambda: f"STDDEV(close, {p()})",
+        lambda: f"ATR(high, low, close, {p()})",
+        lambda: f"{rng.integers(0, 4)}",
+    ])
+
+
+def _factor(rng):
+
+    roll = rng.random()
+    kind = str(rng.choice(["price", "oscillator", "spread"]))
+
+    if roll < 0.05:
+        return f"{rng.integers(1, 4)} > {rng.integers(1, 4)}"
+
+    if roll < 0.3:
+        direction = rng.choice(["ABOVE", "BELOW"])
+        return f'CROSS({_operand(rng, kind)}, "{direction}", {_operand(rng, kind)})'
+
+    op = rng.choice([">", "<", ">=", "<=", "=="])
+    return f"{_operand(rng, kind)} {op} {_operand(rng, kind)}"
+
+
+def _rule(rng):
+
+    terms = []
+    for _ in range(rng.integers(1, 4)):
+        term = _factor(rng)
+        if rng.random() < 0.2:
+            term = f"NOT {term}"
+        terms.append(term)
+
+    rule = terms[0]
+    for term in terms[1:]:
+        rule += f" {rng.choice(['AND', 'OR'])} {term}"
+
+    return rule
+
+
+def random_strategy_text(rng) -> str:
+    """Random strategy over every indicator, with NOT, CROSS and constants."""
+
+    entry = [_rule(rng) for _ in range(rng.integers(1, 3))]
+    exit = [_rule(rng) for _ in range(rng.integers(1, 3))]
+
+    return "ENTRY:\n" + "\n".join(entry) + "\nEXIT:\n" + "\n".join(exit)
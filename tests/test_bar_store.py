@@ -0,0 +1,122 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import make_bars
+from store.bar_store import BarStore
+
+
+def _with_volume(df, seed=0):
+    rng = np.random.default_rng(seed)
+    df = df.copy()
+    df["volume"] = rng.integers(100, 10_000, len(df))
+    df.index = pd.date_range("2020-01-01", periods=len(df), freq="min")
+    return df
+
+
+def _file_sizes(root, symbol):
+    directory = os.path.join(root, symbol)
+    return {name: os.path.getsize(os.path.join(directory, name)) for name in sorted(os.listdir(directory))}
+
+
+def test_round_trip(tmp_path):
+    df = _with_volume(make_bars(500, gaps=True))
+    BarStore(str(tmp_path)).ingest("AAA", df)
+
+    store = BarStore(str(tmp_path))
+    columns = store.load("AAA")
+
+    assert store.symbols() == ["AAA"] and store.length("AAA") == 500
+    assert isinstance(columns["close"], np.memmap)
+    assert columns["volume"].dtype == df["volume"].dtype
+    pd.testing.assert_frame_equal(store.frame("AAA"), df, check_freq=False, check_index_type=False)
+
+
+def test_append_equals_ingest_of_the_whole(tmp_path):
+    df = _with_volume(make_bars(300, gaps=True))
+    store = BarStore(str(tmp_path))
+
+    store.ingest("AAA", df.iloc[:100])
+    store.append("AAA", df.iloc[100:250])
+    store.append("AAA", df.iloc[250:250])
+    BarStore(str(tmp_path)).append("AAA", df.iloc[250:])
+
+    reopened = BarStore(str(tmp_path))
+
+    assert reopened.length("AAA") == 300
+    pd.testing.assert_frame_equal(reopened.frame("AAA"), df, check_freq=False, check_index_type=False)
+
+
+def test_append_to_new_symbol_ingests(tmp_path):
+    df = _with_volume(make_bars(50))
+    store = BarStore(str(tmp_path))
+
+    store.append("BBB", df)
+
+    assert store.length("BBB") == 50
+    assert np.array_equal(store.load("BBB")["close"], df["close"].to_numpy())
+
+
+def test_append_safe_upcast_is_allowed(tmp_path):
+    df = _with_volume(make_bars(40))
+    store = BarStore(str(tmp_path))
+    store.ingest("AAA", df.iloc[:20])
+
+    narrower = df.iloc[20:].astype({"close": np.float32, "volume": np.int32})
+    store.append("AAA", narrower)
+
+    assert store.load("AAA")["volume"].dtype == df["volume"].dtype
+    assert np.array_equal(store.load("AAA")["volume"], df["volume"].to_numpy())
+
+
+def _missing_column(df):
+    return df.drop(columns="volume")
+
+
+def _float_volume(df):
+    return df.astype({"volume": float})
+
+
+def _text_close(df):
+    return df.astype({"close": str})
+
+
+def _no_timestamps(df):
+    return df.reset_index(drop=True)
+
+
+@pytest.mark.parametrize("spoil", [_missing_column, _float_volume, _text_close, _no_timestamps])
+def test_rejected_append_writes_nothing(tmp_path, spoil):
+    df = _with_volume(make_bars(60))
+    store = BarStore(str(tmp_path))
+    store.ingest("AAA", df.iloc[:30])
+    before = _file_sizes(tmp_path, "AAA")
+
+    with pytest.raises(ValueError):
+        store.append("AAA", spoil(df.iloc[30:]))
+
+    assert _file_sizes(tmp_path, "AAA") == before
+    assert BarStore(str(tmp_path)).length("AAA") == 30
+
+    # The store is still consistent and accepts a valid append
+    store.append("AAA", df.iloc[30:])
+    pd.testing.assert_frame_equal(BarStore(str(tmp_path)).frame("AAA"), df, check_freq=False, check_index_type=False)
+
+
+def test_failed_write_is_rolled_back(tmp_path, monkeypatch):
+    df = _with_volume(make_bars(60))
+    store = BarStore(str(tmp_path))
+    store.ingest("AAA", df.iloc[:30])
+    before = _file_sizes(tmp_path, "AAA")
+
+    # Fail once the first columns are already written
+    os.remove(os.path.join(tmp_path, "AAA", "volume.bin"))
+    before.pop("volume.bin")
+
+    with pytest.raises(OSError):
+        store.append("AAA", df.iloc[30:])
+
+    assert _file_sizes(tmp_path, "AAA") == before
+    assert BarStore(str(tmp_path)).length("AAA") == 30
@@ -0,0 +1,58 @@
+import numpy as np
+
+from engine.batch import StrategyPlan, evaluate_many
+from engine.interpreter import evaluate_ast
+from parser.ast_nodes import IndicatorCallNode
+from parser.optimizer import optimize_strategy
+from parser.parser import parse_strategy_text
+
+
+TEXTS = [
+    """
+    ENTRY:
+    CROSS(SMA(close, 5), "ABOVE", SMA(close, 20))
+    EXIT:
+    RSI(close, 14) > 70
+    """,
+    """
+    ENTRY:
+    SMA(close, 20) < close AND RSI(close, 14) < 30
+    EXIT:
+    CROSS(close, "BELOW", SMA(close, 5))
+    """,
+    """
+    ENTRY:
+    MACD(close, 12, 26) > 0 AND EMA(close, 12) > EMA(close, 26)
+    EXIT:
+    ATR(high, low, close, 14) > 5 OR close[3] > close
+    """,
+    """
+    ENTRY:
+    3 > 2 AND CROSS(close, "ABOVE", 1000) AND NOT SMA(close, 20) < close
+    EXIT:
+    NOT 2 > 3 AND CROSS(990, "BELOW", close) OR RSI(close, 14) > 70
+    """,
+]
+
+
+def test_evaluate_many_matches_single_runs(bars):
+    strategies = [parse_strategy_text(text) for text in TEXTS]
+    strategies += [optimize_strategy(strategy)[0] for strategy in strategies]
+    bars = bars.round(2)
+
+    results = evaluate_many(strategies, bars)
+
+    assert len(results) == len(strategies)
+    for strategy, signals in zip(strategies, results):
+        expected = evaluate_ast(strategy, bars)
+        for name in ("entry", "exit"):
+            assert np.array_equal(signals[name].to_numpy(), expected[name])
+
+
+def test_plan_shares_indicators():
+    strategies = [parse_strategy_text(text) for text in TEXTS[:2]]
+
+    plan = StrategyPlan(strategies)
+
+    # SMA(close, 5), SMA(close, 20) and RSI(close, 14) appear in both
+    assert plan.count(IndicatorCallNode) == 3
@@ -0,0 +1,84 @@
+import os
+
+import parser.bulk
+from parser.bulk import ParseResult, parse_directory, parse_many, source_hash
+from parser.parser import parse_strategy_text
+
+
+GOOD = [
+    'ENTRY:\nCROSS(SMA(close, 5), "ABOVE", SMA(close, 20))\nEXIT:\nRSI(close, 14) > 70',
+    "ENTRY:\nclose[2] < open AND NOT close > HIGHEST(high, 10)",
+    "EXIT:\nMACD_SIGNAL(close, 12, 26, 9) <= 0",
+]
+
+BAD = ["ENTRY:\nclose[1.5] > open", "ENTRY:\nclose >", "ENTRY:\nFOO(close) > 1"]
+
+
+def _no_parsing(text):
+    raise AssertionError("parse_source called on a cache hit")
+
+
+def _assert_results(results, texts):
+
+    for result, text in zip(results, texts):
+        if text in GOOD:
+            assert result.ok
+            assert repr(result.ast) == repr(parse_strategy_text(text))
+        else:
+            assert not result.ok and result.ast is None and result.error
+
+
+def test_errors_are_results_not_exceptions():
+    texts = [GOOD[0], BAD[0], GOOD[1], BAD[1], BAD[2], GOOD[2]]
+
+    results = parse_many(texts, workers=1)
+
+    _assert_results(results, texts)
+    assert "whole number" in results[1].error
+
+
+def test_misses_are_cached_and_hits_skip_parsing(tmp_path, monkeypatch):
+    texts = GOOD + BAD + GOOD[:1]
+    first = parse_many(texts, workers=1, cache_dir=str(tmp_path))
+
+    assert sorted(os.listdir(tmp_path)) == sorted(f"{source_hash(t)}.ast" for t in set(texts))
+
+    monkeypatch.setattr(parser.bulk, "parse_source", _no_parsing)
+    second = parse_many(texts, workers=1, cache_dir=str(tmp_path))
+
+    # Syntax errors are served from the cache too
+    assert second == first
+    _assert_results(second, texts)
+
+
+def test_unreadable_cache_entry_is_a_miss(tmp_path):
+    (tmp_path / f"{source_hash(GOOD[0])}.ast").write_bytes(b"not a pickle")
+
+    results = parse_many(GOOD, workers=1, cache_dir=str(tmp_path))
+
+    _assert_results(results, GOOD)
+    assert parser.bulk.ParseCache(str(tmp_path)).get(source_hash(GOOD[0])) == results[0]
+
+
+def test_pool_matches_in_process(monkeypatch):
+    monkeypatch.setattr(parser.bulk, "_MIN_PER_WORKER", 1)
+
+    # Variants keep the texts distinct so none is deduplicated away
+    texts = [f"{t}\nEXIT:\nclose < {i}" if t.startswith("ENTRY") else t
+             for i, t in enumerate((GOOD + BAD) * 3)]
+
+    pooled = parse_many(texts, workers=2)
+
+    assert [repr(r) for r in pooled] == [repr(r) for r in parse_many(texts, workers=1)]
+    assert sum(r.ok for r in pooled) == 3 * len(GOOD)
+
+
+def test_parse_directory(tmp_path):
+    for i, text in enumerate(GOOD + BAD):
+        (tmp_path / f"s{i}.dsl").write_text(text, encoding="utf-8")
+
+    results = parse_directory(tmp_path, workers=1)
+
+    assert list(results) == [str(tmp_path / f"s{i}.dsl") for i in range(len(GOOD + BAD))]
+    assert all(isinstance(r, ParseResult) for r in results.values())
+    _assert_results(results.values(), GOOD + BAD)
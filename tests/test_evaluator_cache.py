@@ -0,0 +1,64 @@
+import importlib.util
+import os
+
+import pandas as pd
+import pytest
+
+import codegen.cache
+from codegen.cache import EvaluatorCache, strategy_hash
+from parser.parser import parse_strategy_text
+
+
+STRATEGY = """
+ENTRY:
+CROSS(SMA(close, 5), "ABOVE", SMA(close, 20))
+EXIT:
+RSI(close, 14) > 70
+"""
+
+
+def _no_generation(*args, **kwargs):
+    raise AssertionError("generate_python called on a disk hit")
+
+
+def test_disk_hit_skips_generation(tmp_path, monkeypatch, bars):
+    strategy = parse_strategy_text(STRATEGY)
+    expected = EvaluatorCache(cache_dir=str(tmp_path)).get(strategy)(bars)
+
+    monkeypatch.setattr(codegen.cache, "generate_python", _no_generation)
+    actual = EvaluatorCache(cache_dir=str(tmp_path)).get(strategy)(bars)
+
+    assert os.listdir(tmp_path) == [f"{strategy_hash(strategy)}.evc"]
+    for name in ("entry", "exit"):
+        pd.testing.assert_series_equal(actual[name], expected[name])
+
+
+# Empty, foreign, and right magic number with a truncated marshal payload
+@pytest.mark.parametrize("data", [b"", b"not a pyc", importlib.util.MAGIC_NUMBER + b"\xe3"])
+def test_stale_or_corrupt_file_is_regenerated(tmp_path, bars, data):
+    strategy = parse_strategy_text(STRATEGY)
+    path = tmp_path / f"{strategy_hash(strategy)}.evc"
+    expected = EvaluatorCache().get(strategy)(bars)
+
+    path.write_bytes(data)
+
+    actual = EvaluatorCache(cache_dir=str(tmp_path)).get(strategy)(bars)
+
+    assert path.read_bytes().startswith(importlib.util.MAGIC_NUMBER)
+    assert len(path.read_bytes()) > len(importlib.util.MAGIC_NUMBER) + 1
+    for name in ("entry", "exit"):
+        pd.testing.assert_series_equal(actual[name], expected[name])
+
+
+def test_memory_tier_is_lru():
+    cache = EvaluatorCache(maxsize=2)
+    first, second, third = (parse_strategy_text(f"ENTRY:\nclose > {n}") for n in (1, 2, 3))
+
+    evaluate = cache.get(first)
+    cache.get(second)
+    assert cache.get(first) is evaluate
+
+    cache.get(third)
+
+    assert len(cache) == 2
+    assert first in cache and third in cache and second not in cache
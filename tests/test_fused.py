@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from codegen.cache import EvaluatorCache, strategy_hash
+from codegen.fused import generate_fused_python
+from engine.interpreter import evaluate_ast
+from parser.optimizer import optimize_strategy
+from parser.parser import parse_strategy_text
+
+
+STRATEGIES = [
+    """
+    ENTRY:
+    CROSS(SMA(close, 5), "ABOVE", SMA(close, 20)) AND close[2] < open AND NOT volume < 1000000
+    RSI(close, 14) < 30
+    RSI(close, 14) < 30 AND close > open
+    EXIT:
+    CROSS(close, "BELOW", SMA(close, 10)) OR RSI(close, 7) > 70
+    """,
+    """
+    ENTRY:
+    EMA(close, 12) > EMA(close, 26) AND MACD(close, 12, 26) > 0 AND close >= HIGHEST(high, 20)
+    EXIT:
+    close <= LOWEST(low, 10) OR ATR(high, low, close, 14) > 15 OR STDDEV(close, 20) > 2
+    """,
+]
+
+EDGE_CASES = [
+    """
+    ENTRY:
+    CROSS(close, "ABOVE", 1000) AND NOT close[1] > open
+    EXIT:
+    CROSS(990, "BELOW", close) OR CROSS(1000, "ABOVE", 990)
+    """,
+    """
+    ENTRY:
+    3 > 2 AND close > open
+    2 > 3
+    EXIT:
+    NOT 3 > 2 OR NOT NOT close < open
+    """,
+]
+
+
+@pytest.mark.parametrize("text", STRATEGIES)
+def test_fused_matches_default(bars, text):
+    strategy = parse_strategy_text(text)
+    bars = bars.round(2)
+
+    expected = EvaluatorCache(maxsize=1).get(strategy)(bars)
+    actual = EvaluatorCache(maxsize=1, fused=True).get(strategy)(bars)
+
+    for name in ("entry", "exit"):
+        pd.testing.assert_series_equal(pd.Series(actual[name], index=bars.index),
+                                       pd.Series(expected[name], index=bars.index), check_names=False)
+
+
+def test_fused_flavour_has_its_own_key():
+    strategy = parse_strategy_text(STRATEGIES[0])
+
+    assert strategy_hash(strategy, fused=True) != strategy_hash(strategy)
+    compile(generate_fused_python(strategy), "<fused>", "exec")
+
+
+@pytest.mark.parametrize("optimize", [False, True])
+@pytest.mark.parametrize("text", EDGE_CASES)
+def test_fused_constants_and_numeric_crosses(bars, text, optimize):
+    strategy = parse_strategy_text(text)
+    if optimize:
+        strategy, _ = optimize_strategy(strategy)
+
+    expected = evaluate_ast(strategy, bars)
+    actual = EvaluatorCache(maxsize=1, fused=True).get(strategy)(bars)
+
+    for name in ("entry", "exit"):
+        assert np.array_equal(np.asarray(actual[name], dtype=bool), expected[name])
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from codegen.generator import _expr_to_code, generate_python
+from engine.interpreter import evaluate_ast
+from parser.optimizer import optimize_strategy
+from parser.parser import parse_strategy_text
+
+
+STRATEGY = """
+ENTRY:
+CROSS(SMA(close, 5), "ABOVE", SMA(close, 20)) AND close[1] < SMA(close, 5)
+RSI(close, 14) < 30 AND close[1] > open
+EXIT:
+SMA(close, 20) > close[1] OR RSI(close, 14) > 70
+"""
+
+
+def _run(source, bars):
+    namespace = {}
+    exec(source, namespace)
+    return namespace, namespace["evaluate_strategy"](bars)
+
+
+def test_repeated_subexpressions_are_bound_once():
+    source = generate_python(parse_strategy_text(STRATEGY))
+
+    assert source.count('sma(df["close"]') == 2
+    assert source.count('rsi(df["close"]') == 1
+    assert source.count('df["close"].shift(1)') == 1
+
+
+def test_shared_temporaries_match_inline_code(bars):
+    strategy = parse_strategy_text(STRATEGY)
+    namespace, signals = _run(generate_python(strategy), bars)
+
+    for name, block in (("entry", strategy.entry), ("exit", strategy.exit)):
+        # Each rule on its own, without temporaries
+        rules = [eval(_expr_to_code(rule), dict(namespace, df=bars)) for rule in block.rules]
+        expected = pd.concat(rules, axis=1).any(axis=1)
+
+        pd.testing.assert_series_equal(signals[name], expected, check_names=False)
+
+
+CONSTANTS = [
+    """
+    ENTRY:
+    CROSS(close, "ABOVE", 1000) AND NOT close[1] > open
+    EXIT:
+    CROSS(990, "BELOW", close) OR CROSS(1000, "ABOVE", 990)
+    """,
+    """
+    ENTRY:
+    3 > 2 AND close > open
+    2 > 3
+    EXIT:
+    NOT 3 > 2 OR NOT NOT close < open
+    """,
+    """
+    ENTRY:
+    3 > 2
+    EXIT:
+    NOT 2 > 3
+    """,
+]
+
+
+@pytest.mark.parametrize("optimize", [False, True])
+@pytest.mark.parametrize("text", CONSTANTS)
+def test_numeric_operands_match_interpreter(bars, text, optimize):
+    strategy = parse_strategy_text(text)
+    if optimize:
+        strategy, _ = optimize_strategy(strategy)
+
+    expected = evaluate_ast(strategy, bars)
+    _, signals = _run(generate_python(strategy), bars)
+
+    for name in ("entry", "exit"):
+        assert signals[name].dtype == bool
+        assert np.array_equal(signals[name].to_numpy(), expected[name])
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+from dsl.indicators import get_indicator_spec
+from engine.interpreter import evaluate_ast
+from parser.parser import parse_strategy_text
+from store.indicator_cache import IndicatorCache
+
+
+CALLS = [
+    ("SMA", ["close"], [20]),
+    ("STDDEV", ["close"], [20]),
+    ("RSI", ["close"], [14]),
+    ("EMA", ["close"], [12]),
+    ("HIGHEST", ["high"], [20]),
+    ("LOWEST", ["low"], [20]),
+    ("ATR", ["high", "low", "close"], [14]),
+    ("MACD", ["close"], [12, 26]),
+]
+
+
+def _inputs(bars, fields, n=None):
+    return [bars[f].to_numpy()[:n] for f in fields]
+
+
+def _uncached(name, inputs, params):
+    return get_indicator_spec(name).kernel(*inputs, *params)
+
+
+@pytest.mark.parametrize("name,fields,params", CALLS)
+def test_disk_hit_matches_uncached(tmp_path, bars, name, fields, params):
+    inputs = _inputs(bars, fields)
+
+    IndicatorCache(cache_dir=str(tmp_path)).compute(name, inputs, params)
+    fresh = IndicatorCache(cache_dir=str(tmp_path))
+    values = fresh.compute(name, inputs, params)
+
+    assert fresh.hits == 1
+    np.testing.assert_array_equal(values, _uncached(name, inputs, params))
+
+
+@pytest.mark.parametrize("name,fields,params", CALLS)
+def test_append_matches_uncached(bars, name, fields, params):
+    cache = IndicatorCache()
+
+    cache.compute(name, _inputs(bars, fields, 3000), params)
+    values = cache.compute(name, _inputs(bars, fields), params)
+
+    assert cache.hits == 0
+    # exact=True recomputes rolling sums in full; the rest extend (MACD via its parts too)
+    assert (cache.extensions > 0) == (name not in ("SMA", "STDDEV"))
+    np.testing.assert_array_equal(values, _uncached(name, _inputs(bars, fields), params))
+
+
+def test_changed_history_is_a_miss(bars):
+    cache = IndicatorCache()
+    close = bars["close"].to_numpy()
+    edited = close.copy()
+    edited[10] += 1
+
+    cache.compute("RSI", [close], [14])
+    values = cache.compute("RSI", [edited], [14])
+
+    assert cache.misses == 2
+    np.testing.assert_array_equal(values, _uncached("RSI", [edited], [14]))
+
+
+def test_interpreter_reads_through_cache(bars):
+    strategy = parse_strategy_text("""
+    ENTRY:
+    CROSS(SMA(close, 5), "ABOVE", SMA(close, 20)) AND MACD(close, 12, 26) > 0
+    EXIT:
+    RSI(close, 14) > 70 OR ATR(high, low, close, 14) > 15
+    """)
+    cache = IndicatorCache()
+
+    first = evaluate_ast(strategy, bars, indicators=cache)
+    second = evaluate_ast(strategy, bars, indicators=cache)
+    expected = evaluate_ast(strategy, bars)
+
+    assert cache.hits > 0
+    for name in ("entry", "exit"):
+        assert np.array_equal(first[name], expected[name])
+        assert np.array_equal(second[name], expected[name])
+
+
+@pytest.mark.parametrize("name,fields,params", CALLS)
+def test_append_across_gaps_bar_by_bar(bars, name, fields, params):
+    # Cached prefixes ending on and right after NaN bars (close is NaN at 85 and 88)
+    cache = IndicatorCache()
+    inputs = _inputs(bars, fields, 120)
+
+    for n in (60, 86, 87, 88, 89, 90, 120):
+        values = cache.compute(name, [x[:n] for x in inputs], params)
+
+        np.testing.assert_array_equal(values, _uncached(name, [x[:n] for x in inputs], params))
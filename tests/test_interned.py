@@ -0,0 +1,65 @@
+import pickle
+
+import pytest
+
+from parser.ast_nodes import IndicatorCallNode, NumberNode, IdentifierNode, node_key
+from parser.interned import intern, thaw
+from parser.parser import parse_strategy_text
+
+
+TEXT = """
+ENTRY:
+CROSS(SMA(close, 5), "ABOVE", SMA(close, 20)) AND close[1] < SMA(close, 20)
+EXIT:
+RSI(close, 14) > 70 OR NOT close > open
+"""
+
+
+def test_equal_subtrees_are_one_object():
+    first = intern(parse_strategy_text(TEXT))
+    second = intern(parse_strategy_text(TEXT.replace("EXIT:", "EXIT:\nclose > 1")))
+
+    sma20 = first.entry.rules[0].left.right
+    assert sma20 is first.entry.rules[0].right.right
+    assert sma20 is second.entry.rules[0].left.right
+    assert first.entry is second.entry
+    assert first is not second
+
+
+def test_canonical_forms_match_node_key():
+    # Same node_key -> same object, whatever the spelling
+    lower = intern(IndicatorCallNode("sma", [IdentifierNode("close"), NumberNode(20)]))
+    upper = intern(IndicatorCallNode("SMA", [IdentifierNode("close"), NumberNode(20.0)]))
+
+    assert lower is upper
+    assert lower.key == node_key(IndicatorCallNode("SMA", [IdentifierNode("close"), NumberNode(20)]))
+    assert isinstance(lower, IndicatorCallNode)
+    assert isinstance(lower.args, tuple)
+
+
+def test_interned_nodes_are_immutable():
+    node = intern(parse_strategy_text(TEXT))
+
+    with pytest.raises(AttributeError):
+        node.entry = None
+    with pytest.raises(AttributeError):
+        node.entry.rules[0].left.left.name = "SMA"
+
+
+def test_thaw_and_pickle_round_trip():
+    plain = parse_strategy_text(TEXT)
+    node = intern(plain)
+
+    assert repr(thaw(node)) == repr(plain)
+    assert node_key(thaw(node)) == node_key(plain) == node.key
+    assert pickle.loads(pickle.dumps(node)) is node
+    assert intern(node) is node
+
+
+def test_hash_and_digest_are_structural():
+    a = intern(parse_strategy_text(TEXT))
+    b = intern(parse_strategy_text(TEXT.replace("70", "71")))
+
+    assert {a: 1}[intern(parse_strategy_text(TEXT))] == 1
+    assert a.digest != b.digest and len(a.digest) == 16
+    assert a.entry.digest == b.entry.digest
@@ -0,0 +1,54 @@
+import pandas as pd
+import pytest
+
+from codegen.cache import EvaluatorCache
+from engine.interpreter import evaluate_strategy_ast, required_history
+from parser.parser import parse_strategy_text
+
+
+STRATEGIES = [
+    """
+    ENTRY:
+    CROSS(SMA(close, 5), "ABOVE", SMA(close, 20)) AND close[2] < open
+    RSI(close, 14) < 30 AND NOT volume < 1000000
+    EXIT:
+    CROSS(close, "BELOW", SMA(close, 10)) OR RSI(close, 7) > 70
+    """,
+    """
+    ENTRY:
+    EMA(close, 12) > EMA(close, 26) AND MACD(close, 12, 26) > 0
+    close >= HIGHEST(high, 20)
+    EXIT:
+    close <= LOWEST(low, 10) OR ATR(high, low, close, 14) > 15
+    """,
+    """
+    ENTRY:
+    STDDEV(close, 20) > 2 AND CROSS(close, "ABOVE", SMA(close, 20))
+    EXIT:
+    SMA(RSI(close, 14), 5) > 60 AND close <= close[1]
+    """,
+]
+
+
+@pytest.mark.parametrize("text", STRATEGIES)
+def test_interpreter_matches_generated_code(bars, text):
+    strategy = parse_strategy_text(text)
+    bars = bars.round(2)
+
+    expected = EvaluatorCache(maxsize=1).get(strategy)(bars)
+    actual = evaluate_strategy_ast(strategy, bars)
+
+    for name in ("entry", "exit"):
+        pd.testing.assert_series_equal(actual[name], expected[name].astype(bool), check_names=False)
+        assert actual[name].any()
+
+
+def test_required_history():
+    strategy = parse_strategy_text("""
+    ENTRY:
+    CROSS(SMA(close, 20), "ABOVE", close[3])
+    EXIT:
+    HIGHEST(high, 50) < close
+    """)
+
+    assert required_history(strategy) == 49
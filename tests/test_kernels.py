@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from engine import kernels
+
+
+def _ewm(x, alpha):
+    return pd.Series(x).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+
+
+@pytest.fixture
+def ohlc(bars):
+    return {name: bars[name].to_numpy() for name in ("high", "low", "close")}
+
+
+@pytest.mark.parametrize("period", [1, 2, 12, 26])
+def test_ema(ohlc, period):
+    close = ohlc["close"]
+
+    np.testing.assert_allclose(kernels.ema(close, period), _ewm(close, 2 / (period + 1)), rtol=1e-12)
+
+
+@pytest.mark.parametrize("period", [1, 7, 14])
+def test_atr(ohlc, period):
+    high, low, close = ohlc["high"], ohlc["low"], ohlc["close"]
+
+    prev = pd.Series(close).shift(1)
+    ranges = pd.concat([pd.Series(high - low), (high - prev).abs(), (low - prev).abs()], axis=1)
+    expected = _ewm(ranges.max(axis=1).to_numpy(), 1 / period)
+
+    np.testing.assert_allclose(kernels.atr(high, low, close, period), expected, rtol=1e-12)
+
+
+def test_macd_family(ohlc):
+    close = ohlc["close"]
+    line = kernels.ema(close, 12) - kernels.ema(close, 26)
+    signal = kernels.ema(line, 9)
+
+    np.testing.assert_array_equal(kernels.macd(close, 12, 26), line)
+    np.testing.assert_array_equal(kernels.macd_signal(close, 12, 26, 9), signal)
+    np.testing.assert_array_equal(kernels.macd_hist(close, 12, 26, 9), line - signal)
+
+    # Precomputed parts give the same values
+    np.testing.assert_array_equal(kernels.macd_hist(close, 12, 26, 9, parts=(line, signal)), line - signal)
+
+
+def test_bollinger(ohlc):
+    close = pd.Series(ohlc["close"])
+    middle = close.rolling(20, min_periods=1).mean().to_numpy()
+    deviation = close.rolling(20, min_periods=1).std(ddof=0).to_numpy()
+
+    np.testing.assert_array_equal(kernels.bb_middle(close.to_numpy(), 20), middle)
+    np.testing.assert_array_equal(kernels.bb_upper(close.to_numpy(), 20, 2), middle + 2 * deviation)
+    np.testing.assert_array_equal(kernels.bb_lower(close.to_numpy(), 20, 1.5), middle - 1.5 * deviation)
+
+
+def _with_nans(n=300, seed=1):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(size=n)
+    x[:3] = np.nan                       # leading gap
+    x[50:80] = np.nan                    # gap longer than most windows
+    x[rng.choice(n, 20, replace=False)] = np.nan
+    x[-1] = np.nan
+    return x
+
+
+@pytest.mark.parametrize("period", [1, 2, 3, 7, 20, 40, 299, 300, 1000])
+def test_rolling_extremes_skip_nans_like_pandas(period):
+    x = _with_nans()
+    frame = pd.DataFrame(np.column_stack((x, x[::-1], np.full(len(x), np.nan))))
+
+    for values in (x, frame.to_numpy()):
+        rolling = (pd.Series(values) if values.ndim == 1 else pd.DataFrame(values)).rolling(period, min_periods=1)
+
+        np.testing.assert_array_equal(kernels.highest(values, period), rolling.max().to_numpy())
+        np.testing.assert_array_equal(kernels.lowest(values, period), rolling.min().to_numpy())
+
+
+def test_rolling_extremes_of_empty_input():
+    assert kernels.highest(np.array([]), 5).shape == (0,)
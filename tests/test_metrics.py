@@ -0,0 +1,90 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.metrics import (
+    drawdown,
+    equity_curve,
+    holdings,
+    performance_metrics,
+    win_rate,
+)
+from backtest.simulator import TRADE_DTYPE, run_backtest
+from conftest import make_bars
+
+
+NAN = float("nan")
+
+# Long over bars 1-3 (10 -> 9, through a gap) and over bar 5 (12 -> 14)
+CLOSE = [10.0, 11.0, NAN, 9.0, 12.0, 14.0]
+
+
+def _trades(*rows):
+    return np.array(list(rows), dtype=TRADE_DTYPE)
+
+
+TRADES = _trades((0, 3, 10.0, 9.0, -1.0), (4, 5, 12.0, 14.0, 2.0))
+
+
+def test_equity_is_marked_at_last_finite_close():
+    assert holdings(TRADES, 6).tolist() == [True, True, True, False, True, False]
+
+    # +1 (10->11), 0 over the gap, -2 (11->9), flat, +2 (12->14)
+    assert equity_curve(CLOSE, TRADES).tolist() == [0.0, 1.0, 1.0, -1.0, -1.0, 1.0]
+    assert drawdown([0.0, 1.0, 1.0, -1.0, -1.0, 1.0]).tolist() == [0.0, 0.0, 0.0, -2.0, -2.0, 0.0]
+
+
+def test_leading_nans_add_nothing():
+    equity = equity_curve([NAN, NAN, 10.0, 12.0], _trades((0, 3, NAN, 12.0, NAN)))
+
+    assert equity.tolist() == [0.0, 0.0, 0.0, 2.0]
+    assert performance_metrics([NAN, 10.0, 12.0], _trades())["final_equity"] == 0.0
+
+
+def test_performance_metrics_by_hand():
+    metrics = performance_metrics(CLOSE, TRADES)
+
+    # Capital is the first close: returns 0, .1, 0, -.2, 0, .2
+    mean = 0.1 / 6
+    std = math.sqrt((3 * (0 - mean) ** 2 + (0.1 - mean) ** 2 + (-0.2 - mean) ** 2 + (0.2 - mean) ** 2) / 6)
+    downside = math.sqrt(0.2 ** 2 / 6)
+
+    assert metrics["final_equity"] == 1.0
+    assert metrics["max_drawdown"] == 2.0
+    assert metrics["sharpe"] == pytest.approx(mean / std * math.sqrt(252))
+    assert metrics["sortino"] == pytest.approx(mean / downside * math.sqrt(252))
+    assert metrics["exposure"] == 4 / 6
+    assert metrics["avg_holding_period"] == 2.0
+    assert metrics["win_rate"] == 0.5
+    assert metrics["num_trades"] == 2
+
+
+def test_win_rate_skips_unknown_pnl():
+    trades = _trades((0, 1, 1.0, 2.0, 1.0), (1, 2, 2.0, 1.0, -1.0), (2, 3, NAN, 3.0, NAN), (3, 4, 3.0, 5.0, 2.0))
+
+    assert win_rate(trades) == 2 / 3
+    assert math.isnan(win_rate(_trades((0, 1, NAN, 1.0, NAN))))
+
+
+def test_empty_inputs():
+    metrics = performance_metrics([], _trades())
+
+    assert metrics["final_equity"] == 0.0 and metrics["max_drawdown"] == 0.0
+    assert metrics["exposure"] == 0.0 and metrics["num_trades"] == 0
+    assert math.isnan(metrics["sharpe"]) and math.isnan(metrics["win_rate"])
+
+
+def test_backtest_over_gaps_gives_finite_metrics():
+    df = make_bars(3000, seed=3, gaps=True)
+    entry = df["close"] < df["open"]
+    exit = df["close"] > df["open"]
+    trades, _ = run_backtest(df, entry, exit, columnar=True)
+
+    equity = equity_curve(df["close"], trades)
+    metrics = performance_metrics(df["close"], pd.DataFrame(trades))
+
+    assert np.isfinite(equity).all()
+    assert all(np.isfinite(metrics[name]) for name in ("final_equity", "max_drawdown", "sharpe", "sortino"))
+    assert metrics["final_equity"] == equity[-1]
@@ -0,0 +1,52 @@
+from nlp.nl_to_struct import nl_to_struct, nl_to_struct_many
+
+
+PRESET = """
+Buy when price closes above the 20-day moving average.
+Buy when volume is above 1M.
+Exit when RSI 14 is below 30.
+"""
+
+CROSSING = """
+Enter when close crosses above the 10-day moving average.
+Exit when close crosses below the 10-day moving average.
+"""
+
+
+def _operand(kind, name, args=None):
+    op = {"type": "operand", "kind": kind, "name": name}
+    if args is not None:
+        op["args"] = args
+    return op
+
+
+def test_preset_translation():
+    assert nl_to_struct(PRESET) == {
+        "entry": [
+            {"type": "comparison", "left": _operand("identifier", "close"), "op": ">",
+             "right": _operand("indicator", "SMA", ["close", 20])},
+            {"type": "comparison", "left": _operand("identifier", "volume"), "op": ">", "right": 1000000.0},
+        ],
+        "exit": [
+            {"type": "comparison", "left": _operand("indicator", "RSI", ["close", 14]), "op": "<", "right": 30.0},
+        ],
+    }
+
+
+def test_many_matches_one_by_one():
+    texts = [PRESET, CROSSING, PRESET.upper(), "", "Exit when RSI 14 is below 30. Exit when RSI 14 is below 30."]
+
+    assert nl_to_struct_many(texts) == [nl_to_struct(text) for text in texts]
+    assert nl_to_struct_many(iter(texts[:2])) == [nl_to_struct(PRESET), nl_to_struct(CROSSING)]
+
+
+def test_memoized_sentences_are_not_shared():
+    # Every call gets its own dicts, even for sentences served from the memo
+    first, second = nl_to_struct_many([CROSSING, CROSSING])
+
+    first["entry"][0]["right"]["args"].append(99)
+    first["exit"].clear()
+
+    assert second == nl_to_struct(CROSSING)
+    assert second["entry"][0]["right"]["args"] == ["close", 10]
+    assert len(second["exit"]) == 1
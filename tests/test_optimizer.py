@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from engine.interpreter import evaluate_ast
+from parser.ast_nodes import BooleanNode
+from parser.optimizer import optimize_strategy
+from parser.parser import parse_strategy_text
+
+
+STRATEGIES = [
+    """
+    ENTRY:
+    close > 1000 OR close > 1010
+    close > 1000 AND close > 990 AND NOT NOT volume > 1000000
+    RSI(close, 14) > 100 OR close < open
+    close > close
+    EXIT:
+    close > 1010 AND close < 990
+    RSI(close, 14) <= 100 AND close[1] > close
+    CROSS(close, "ABOVE", close) OR SMA(close, 5) < SMA(close, 5)
+    close[1] > close
+    """,
+    """
+    ENTRY:
+    3 > 2 AND close > open
+    EXIT:
+    2 > 3 OR RSI(close, 7) < 0 OR NOT close > open
+    """,
+    """
+    ENTRY:
+    close > open
+    3 > 2
+    EXIT:
+    close < open AND 2 > 3
+    """,
+    """
+    ENTRY:
+    NOT 3 > 2 OR CROSS(close, "ABOVE", 1000)
+    NOT NOT NOT close > open AND close[1] > close[1]
+    EXIT:
+    CROSS(990, "BELOW", close) AND NOT 2 > 3
+    RSI(close, 2) < 0 OR RSI(close, 2) >= 0 AND close > 1010 AND close > 1005
+    """,
+]
+
+
+def test_foldable_block_becomes_constant(bars):
+    strategy = parse_strategy_text("ENTRY:\n3 > 2 OR close > open\nEXIT:\nNOT 3 > 2")
+
+    optimized, _ = optimize_strategy(strategy)
+    signals = evaluate_ast(optimized, bars)
+
+    assert optimized.entry.rules == [BooleanNode(True)]
+    assert signals["entry"].all() and not signals["exit"].any()
+
+
+@pytest.mark.parametrize("text", STRATEGIES)
+def test_optimized_signals_match(bars, text):
+    strategy = parse_strategy_text(text)
+
+    optimized, report = optimize_strategy(strategy)
+    expected = evaluate_ast(strategy, bars)
+    actual = evaluate_ast(optimized, bars)
+
+    assert optimized != strategy
+    for name in ("entry", "exit"):
+        assert np.array_equal(actual[name], expected[name])
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+from backtest.panel import run_panel, run_panel_backtest, to_panel
+from backtest.simulator import run_backtest
+from codegen.cache import EvaluatorCache
+from conftest import make_bars
+from parser.parser import parse_strategy_text
+
+
+STRATEGY = parse_strategy_text("""
+ENTRY:
+CROSS(SMA(close, 5), "ABOVE", SMA(close, 20))
+EXIT:
+RSI(close, 14) > 60
+""")
+
+SYMBOLS = ["AAA", "BBB", "CCC", "DDD"]
+
+
+def _frames(n=800):
+    return {sym: make_bars(n, seed=i) for i, sym in enumerate(SYMBOLS)}
+
+
+def _panel(frames):
+    return pd.concat({field: pd.DataFrame({sym: df[field] for sym, df in frames.items()})
+                      for field in ("open", "high", "low", "close", "volume")}, axis=1)
+
+
+def test_panel_backtest_matches_per_symbol():
+    frames = _frames()
+    panel = _panel(frames)
+    rng = np.random.default_rng(0)
+    entry = pd.DataFrame(rng.random((800, 4)) < 0.05, columns=SYMBOLS)
+    exit = pd.DataFrame(rng.random((800, 4)) < 0.05, columns=SYMBOLS)
+
+    results = run_panel_backtest(panel, entry, exit)
+
+    for sym, df in frames.items():
+        assert results[sym] == run_backtest(df, entry[sym], exit[sym])
+
+
+def test_run_panel_matches_per_symbol_evaluation():
+    frames = _frames()
+    evaluate = EvaluatorCache(maxsize=1).get(STRATEGY)
+
+    results = run_panel(evaluate, _panel(frames))
+
+    for sym, df in frames.items():
+        signals = evaluate(df)
+        assert results[sym] == run_backtest(df, signals["entry"], signals["exit"])
+
+
+def test_to_panel_from_arrays_and_long_frames():
+    frames = _frames(50)
+    wide = _panel(frames)
+    arrays = {field: np.stack([frames[sym][field].to_numpy() for sym in SYMBOLS])
+              for field in ("open", "high", "low", "close", "volume")}
+    long = pd.concat(frames, names=["symbol", "time"])
+
+    pd.testing.assert_frame_equal(to_panel(arrays, symbols=SYMBOLS), wide)
+    pd.testing.assert_frame_equal(to_panel(long).reindex(columns=wide.columns), wide, check_names=False)
@@ -0,0 +1,111 @@
+import pytest
+
+from dsl.tokenizer import tokenize_fast, tokenize_text
+from parser.ast_nodes import (
+    CompareNode,
+    IdentifierNode,
+    LogicalOpNode,
+    NumberNode,
+)
+from parser.parser import parse_strategy, parse_strategy_text
+from parser.token_stream import TokenStream
+
+
+TEXTS = [
+    'ENTRY:\nCROSS(close, "ABOVE", SMA(close, 10)) AND volume > 1000000\nNOT close[1] < open\nEXIT:\nRSI(close, 14) > 70',
+    "ENTRY:\n(close > 1 OR close < 2) AND NOT (open >= 3)\nclose == HIGHEST(high, 5)",
+    "EXIT:\nMACD_SIGNAL(close, 12, 26, 9) <= 0",
+]
+
+ERRORS = [
+    "ENTRY:\nclose >",
+    'ENTRY:\nCROSS(close, "SIDEWAYS", open)',
+    "ENTRY:\nclose[x] > 1",
+    "ENTRY:\nclose[1.5] > 1",
+    "ENTRY:\nFOO(close) > 1",
+    "ENTRY:\n)",
+]
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_token_arrays_and_token_list_parse_alike(text):
+    tokens = tokenize_fast(text)
+    ast = parse_strategy(TokenStream(tokens))
+
+    assert repr(ast) == repr(parse_strategy(TokenStream(tokenize_text(text))))
+
+    # The parser read the arrays without building token objects
+    assert tokens._tokens is None
+
+
+@pytest.mark.parametrize("text", ERRORS)
+def test_errors_match_token_list_parse(text):
+
+    with pytest.raises(SyntaxError) as fast:
+        parse_strategy_text(text)
+
+    with pytest.raises(SyntaxError) as slow:
+        parse_strategy(TokenStream(tokenize_text(text)))
+
+    assert str(fast.value) == str(slow.value)
+
+
+
+@pytest.mark.parametrize("tokenize", [tokenize_fast, tokenize_text])
+def test_match_and_expect_return_tokens(tokenize):
+    ts = TokenStream(tokenize("ENTRY:\nclose[2] > 1"))
+
+    assert ts.match("IDENT", "EXIT") is None
+    entry = ts.match("IDENT", "ENTRY")
+    colon = ts.expect("COLON")
+
+    assert (entry.type, entry.value, entry.line, entry.col) == ("IDENT", "ENTRY", 1, 1)
+    assert (colon.type, colon.value) == ("COLON", ":")
+    assert ts.match_value("NEWLINE") is None
+    assert ts.expect_value("IDENT") == "close"
+
+    with pytest.raises(SyntaxError, match="Expected RBRACK"):
+        ts.expect("RBRACK")
+
+
+CLOSE_GT_OPEN = CompareNode(IdentifierNode("close"), ">", IdentifierNode("open"))
+HIGH_GT_LOW = CompareNode(IdentifierNode("high"), ">", IdentifierNode("low"))
+
+
+def _not(node):
+    return LogicalOpNode("NOT", None, node)
+
+
+def _entry_rules(text):
+    return parse_strategy_text("ENTRY:\n" + text).entry.rules
+
+
+def test_prefix_not():
+    assert _entry_rules("NOT close > open") == [_not(CLOSE_GT_OPEN)]
+    assert _entry_rules("NOT NOT close > open") == [_not(_not(CLOSE_GT_OPEN))]
+
+
+def test_not_binds_to_the_next_term():
+    assert _entry_rules("NOT close > open AND high > low") == [
+        LogicalOpNode("AND", _not(CLOSE_GT_OPEN), HIGH_GT_LOW)
+    ]
+    assert _entry_rules("close > open OR NOT (high > low AND low > 1)") == [
+        LogicalOpNode("OR", CLOSE_GT_OPEN, _not(LogicalOpNode(
+            "AND", HIGH_GT_LOW, CompareNode(IdentifierNode("low"), ">", NumberNode(1.0)))))
+    ]
+
+
+@pytest.mark.parametrize("text", [
+    "close > open NOT high > low",
+    "close > open\nNOT high > low",
+])
+def test_not_after_a_complete_rule_starts_a_new_rule(text):
+    # NOT is not an infix operator, so it can't swallow the previous rule
+    assert _entry_rules(text) == [CLOSE_GT_OPEN, _not(HIGH_GT_LOW)]
+
+
+@pytest.mark.parametrize("text", ["NOT", "close > open AND NOT", "close > open OR (NOT)"])
+def test_dangling_not_is_a_syntax_error(text):
+
+    with pytest.raises(SyntaxError):
+        parse_strategy_text("ENTRY:\n" + text)
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from engine.interpreter import evaluate_ast
+from engine.planner import evaluate_planned
+from parser.optimizer import optimize_strategy
+from parser.parser import parse_strategy_text
+
+
+STRATEGIES = [
+    """
+    ENTRY:
+    RSI(close, 14) < 30 AND close[2] < open AND CROSS(SMA(close, 5), "ABOVE", SMA(close, 20))
+    volume > 1000000 AND NOT close > open AND EMA(close, 12) > EMA(close, 26)
+    EXIT:
+    CROSS(close, "BELOW", SMA(close, 10)) OR RSI(close, 7) > 70 OR close[5] > close
+    """,
+    """
+    ENTRY:
+    close >= HIGHEST(high, 20) AND (MACD(close, 12, 26) > 0 OR close[1] < open[1])
+    EXIT:
+    (close <= LOWEST(low, 10) AND ATR(high, low, close, 14) > 5) OR STDDEV(close, 20) > 2
+    """,
+    """
+    ENTRY:
+    3 > 2 AND CROSS(close, "ABOVE", 1000) AND NOT close[1] > 1000
+    NOT 2 > 3 AND RSI(close, 2) < 50 AND NOT RSI(close, 3) <= RSI(close, 2)
+    EXIT:
+    2 > 3 OR CROSS(990, "BELOW", close) OR CROSS(1000, "ABOVE", 990)
+    NOT NOT close < open AND close > SMA(close, 3)
+    """,
+]
+
+
+@pytest.mark.parametrize("optimize", [False, True])
+@pytest.mark.parametrize("text", STRATEGIES)
+def test_planned_matches_interpreter(bars, text, optimize):
+    strategy = parse_strategy_text(text)
+    if optimize:
+        strategy, _ = optimize_strategy(strategy)
+    bars = bars.round(2)
+
+    expected = evaluate_ast(strategy, bars)
+    actual = evaluate_planned(strategy, bars)
+
+    for name in ("entry", "exit"):
+        assert np.array_equal(actual[name], expected[name])
+
+
+def test_shared_cache_does_not_leak_partial_values(bars):
+    # A short-circuited term must not leave row-subset values in the cache
+    cache = {}
+    strategy = parse_strategy_text(STRATEGIES[0])
+
+    evaluate_planned(strategy, bars, cache=cache)
+    later = evaluate_ast(strategy, bars, cache=cache)
+    fresh = evaluate_ast(strategy, bars)
+
+    for name in ("entry", "exit"):
+        assert np.array_equal(later[name], fresh[name])
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import make_bars, random_strategy_text
+from engine.interpreter import evaluate_ast
+from engine.scanner import UniverseScanner
+from parser.ast_nodes import (
+    BooleanNode,
+    EntryBlockNode,
+    ExitBlockNode,
+    LogicalOpNode,
+    StrategyNode,
+)
+from parser.parser import parse_strategy_text
+
+
+STRATEGY = parse_strategy_text("""
+ENTRY:
+CROSS(SMA(close, 5), "ABOVE", SMA(close, 20)) AND close[2] < open
+RSI(close, 14) < 30
+EXIT:
+CROSS(close, "BELOW", SMA(close, 10)) OR RSI(close, 7) > 70
+""")
+
+SYMBOLS = [f"S{i}" for i in range(6)]
+FIELDS = ("open", "high", "low", "close")
+
+
+def _universe(n=600):
+    return {sym: make_bars(n, seed=i, gaps=True) for i, sym in enumerate(SYMBOLS)}
+
+
+def _assert_matches_interpreter(strategy, universe):
+    expected = {sym: evaluate_ast(strategy, df) for sym, df in universe.items()}
+    scanner = UniverseScanner(strategy, SYMBOLS)
+
+    n = len(universe[SYMBOLS[0]])
+    for t in range(n):
+        bar = {f: np.array([universe[sym][f].iat[t] for sym in SYMBOLS]) for f in FIELDS}
+        decision = scanner.on_bar(bar)
+
+        for name in ("entry", "exit"):
+            want = [bool(expected[sym][name][t]) for sym in SYMBOLS]
+            assert decision[name].tolist() == want, (name, t)
+
+
+def test_scanner_matches_interpreter_per_symbol():
+    _assert_matches_interpreter(STRATEGY, _universe())
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_random_strategies_over_gaps(seed):
+    rng = np.random.default_rng(seed)
+    universe = {sym: df.round(2) for sym, df in _universe(250).items()}
+
+    for _ in range(4):
+        _assert_matches_interpreter(parse_strategy_text(random_strategy_text(rng)), universe)
+
+
+def test_scan_accepts_frames_in_any_symbol_order():
+    universe = _universe(200)
+    expected = {sym: evaluate_ast(STRATEGY, df) for sym, df in universe.items()}
+    scanner = UniverseScanner(STRATEGY, SYMBOLS)
+
+    for t in range(200):
+        frame = pd.DataFrame({f: [universe[sym][f].iat[t] for sym in SYMBOLS] for f in FIELDS},
+                             index=SYMBOLS).iloc[::-1]
+        hits = scanner.scan(frame, block="exit")
+
+        assert hits == [sym for sym in SYMBOLS if expected[sym]["exit"][t]]
+
+
+def test_not_of_boolean_constant():
+    # BooleanNode steps as a Python bool, and ~True == -2 is truthy
+    strategy = StrategyNode(
+        entry=EntryBlockNode(rules=[LogicalOpNode("NOT", None, BooleanNode(True))]),
+        exit=ExitBlockNode(rules=[LogicalOpNode("AND", BooleanNode(True),
+                                                LogicalOpNode("NOT", None, BooleanNode(False)))]),
+    )
+    scanner = UniverseScanner(strategy, SYMBOLS)
+    bar = {f: np.ones(len(SYMBOLS)) for f in FIELDS}
+
+    decision = scanner.on_bar(bar)
+
+    assert not decision["entry"].any()
+    assert decision["exit"].all()
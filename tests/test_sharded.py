@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from engine.interpreter import evaluate_ast, required_history
+from engine.sharded import evaluate_sharded, shard_bounds, shard_warmup
+from parser.parser import parse_strategy_text
+
+from conftest import make_bars, random_strategy_text
+
+
+STRATEGY = parse_strategy_text("""
+ENTRY:
+CROSS(SMA(close, 5), "ABOVE", SMA(close, 20)) AND close[2] < HIGHEST(high, 10)
+RSI(close, 14) < 30 AND volume > 1000000
+EXIT:
+CROSS(EMA(close, 5), "BELOW", MACD_SIGNAL(close, 6, 13, 4))
+ATR(high, low, close, 7) > 1.5 OR BB_UPPER(close, 10, 2) < close
+""")
+
+
+def test_shard_bounds():
+    assert shard_bounds(10, 3) == [0, 3, 6, 10]
+    assert shard_bounds(2, 5) == [0, 1, 2]
+    assert shard_bounds(0, 4) == [0, 0]
+
+
+def test_warmup_covers_history_and_smoothing():
+    rsi = parse_strategy_text("ENTRY:\nRSI(close, 14) < 30")
+    sma = parse_strategy_text('ENTRY:\nCROSS(close[3], "ABOVE", SMA(close, 20))')
+
+    # RSI: one bar of diff plus ~500 bars for 13/14 ** k to vanish
+    assert 490 < shard_warmup(rsi) < 510
+    assert shard_warmup(sma) == required_history(sma) == 20
+
+
+@pytest.mark.parametrize("shards", [1, 2, 7, 64])
+def test_sharded_signals_match_serial(bars, shards):
+    serial = evaluate_ast(STRATEGY, bars)
+    sharded = evaluate_sharded(STRATEGY, bars, workers=1, shards=shards)
+
+    for name in ("entry", "exit"):
+        assert sharded[name].index.equals(bars.index)
+        assert np.array_equal(sharded[name].to_numpy(), serial[name])
+
+
+def test_process_pool_matches_serial():
+    bars = make_bars(40_000, seed=3, gaps=True)
+    columns = {name: bars[name].to_numpy() for name in bars}
+
+    serial = evaluate_ast(STRATEGY, columns)
+    sharded = evaluate_sharded(STRATEGY, columns, workers=2, shards=4)
+
+    for name in ("entry", "exit"):
+        assert np.array_equal(sharded[name], serial[name])
+
+
+def test_strategy_without_columns():
+    signals = evaluate_sharded(parse_strategy_text("ENTRY:\n1 < 2\nEXIT:\n2 < 1"), make_bars(100), workers=2, shards=3)
+
+    assert signals["entry"].all() and not signals["exit"].any()
+
+
+# Ties between rolling sums on cent prices: sums and smoothers restarted
+# at a shard's warm-up round differently and flip some of them
+TIES = parse_strategy_text("""
+ENTRY:
+SMA(close, 3) >= SMA(close, 6) OR STDDEV(close, 3) == 0
+EXIT:
+SMA(close, 4) == SMA(close, 2) OR BB_LOWER(SMA(RSI(close, 3), 4), 5, 1) <= STDDEV(close, 4)
+""")
+
+
+@pytest.mark.parametrize("shards", [7, 50, 333])
+def test_rolling_sums_are_exact(shards):
+    bars = make_bars(5000, seed=4, gaps=True).round(2)
+    serial = evaluate_ast(TIES, bars)
+
+    exact = evaluate_sharded(TIES, bars, workers=1, shards=shards)
+    restarted = evaluate_sharded(TIES, bars, workers=1, shards=shards, exact=False)
+
+    for name in ("entry", "exit"):
+        assert np.array_equal(exact[name].to_numpy(), serial[name])
+
+    assert any(not np.array_equal(restarted[name].to_numpy(), serial[name]) for name in ("entry", "exit"))
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_random_strategies_over_gaps(seed):
+    rng = np.random.default_rng(seed)
+    bars = make_bars(1500, seed=seed, gaps=True).round(2)
+
+    for _ in range(6):
+        strategy = parse_strategy_text(random_strategy_text(rng))
+        serial = evaluate_ast(strategy, bars)
+        sharded = evaluate_sharded(strategy, bars, workers=1, shards=int(rng.integers(2, 40)))
+
+        for name in ("entry", "exit"):
+            assert np.array_equal(sharded[name].to_numpy(), serial[name])
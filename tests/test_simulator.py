@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.simulator import run_backtest, trade_records, trade_table
+from conftest import make_bars
+
+
+def _signals(n, seed, density):
+    rng = np.random.default_rng(seed)
+    return rng.random(n) < density, rng.random(n) < density
+
+
+@pytest.mark.parametrize("seed,density", [(0, 0.02), (1, 0.2), (2, 0.7), (3, 0.0)])
+def test_vectorized_matches_loop(bars, seed, density):
+    entry, exit = _signals(len(bars), seed, density)
+    entry, exit = pd.Series(entry, index=bars.index), pd.Series(exit, index=bars.index)
+
+    expected = run_backtest(bars, entry, exit, mode="loop")
+    actual = run_backtest(bars, entry, exit)
+
+    # NaN closes make NaN trades; repr compares them as equal
+    assert repr(actual) == repr(expected)
+
+
+def test_position_open_at_end_exits_on_last_bar():
+    df = make_bars(10)
+    entry = pd.Series(False, index=df.index)
+    entry.iloc[[0, 7]] = True
+    exit = pd.Series(False, index=df.index)
+    exit.iloc[[0, 3]] = True
+
+    for mode in ("loop", "vectorized"):
+        trades, metrics = run_backtest(df, entry, exit, mode=mode)
+        assert [(t["entry_index"], t["exit_index"]) for t in trades] == [(0, 3), (7, 9)]
+        assert metrics["num_trades"] == 2
+
+
+def test_columnar_round_trip(bars):
+    entry, exit = _signals(len(bars), 4, 0.1)
+
+    records, _ = run_backtest(bars, entry, exit)
+    table, _ = run_backtest(bars, entry, exit, columnar=True)
+
+    assert repr(trade_records(table)) == repr(records)
+    assert repr(trade_table(records).tolist()) == repr(table.tolist())
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        run_backtest(make_bars(5), np.zeros(5, bool), np.zeros(5, bool), mode="fast")
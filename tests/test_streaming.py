@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from conftest import make_bars, random_strategy_text
+from engine.interpreter import evaluate_ast
+from engine.streaming import StreamingEvaluator
+from parser.parser import parse_strategy_text
+
+
+STRATEGY = parse_strategy_text("""
+ENTRY:
+CROSS(SMA(close, 5), "ABOVE", SMA(close, 20)) AND close[2] < open
+RSI(close, 14) < 30 AND NOT volume < 1000000
+EXIT:
+CROSS(close, "BELOW", SMA(close, 10)) OR RSI(close, 7) > 70
+""")
+
+
+# Each flipped decisions over NaN gaps before the ewm step followed pandas
+# exactly (alpha via the centre of mass, the com == 1 weight update)
+GAP_REGRESSIONS = [
+    "ENTRY:\nRSI(close, 2) < 50",
+    "ENTRY:\nRSI(close, 3) <= RSI(close, 2)",
+    "ENTRY:\nRSI(close, 14) <= RSI(close, 2)",
+    'ENTRY:\nCROSS(SMA(RSI(close, 2), 3), "ABOVE", RSI(close, 2))',
+]
+
+
+def _stream(strategy, bars):
+    stream = StreamingEvaluator(strategy)
+    decisions = [stream.on_bar(bar) for bar in bars.to_dict("records")]
+
+    return {name: np.array([d[name] for d in decisions]) for name in ("entry", "exit")}
+
+
+def _assert_matches_batch(strategy, bars):
+    expected = evaluate_ast(strategy, bars)
+    actual = _stream(strategy, bars)
+
+    for name in ("entry", "exit"):
+        assert np.array_equal(actual[name], expected[name])
+
+
+def test_streaming_decisions_match_batch(bars):
+    _assert_matches_batch(STRATEGY, bars)
+
+
+@pytest.mark.parametrize("text", GAP_REGRESSIONS)
+def test_rsi_over_gaps(text):
+    _assert_matches_batch(parse_strategy_text(text), make_bars(3000, seed=5, gaps=True))
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_random_strategies_over_gaps(seed):
+    rng = np.random.default_rng(seed)
+    bars = make_bars(600, seed=seed, gaps=True).round(2)
+
+    for _ in range(8):
+        text = random_strategy_text(rng)
+        strategy = parse_strategy_text(text)
+
+        expected = evaluate_ast(strategy, bars)
+        actual = _stream(strategy, bars)
+
+        for name in ("entry", "exit"):
+            assert np.array_equal(actual[name], expected[name]), text
+
+
+def test_every_indicator_is_streamed():
+    strategy = parse_strategy_text("""
+    ENTRY:
+    EMA(close, 12) > SMA(close, 20) AND STDDEV(close, 20) < ATR(high, low, close, 14)
+    close >= HIGHEST(high, 20) OR close <= LOWEST(low, 20) OR BB_UPPER(close, 20, 2) < close
+    EXIT:
+    MACD(close, 12, 26) < MACD_SIGNAL(close, 12, 26, 9) OR MACD_HIST(close, 12, 26, 9) > 1
+    BB_LOWER(close, 20, 2) > close OR BB_MIDDLE(close, 20) > close
+    """)
+
+    _assert_matches_batch(strategy, make_bars(1500, seed=3, gaps=True))
+
+
+def test_warm_up_returns_last_decision(bars):
+    expected = evaluate_ast(STRATEGY, bars)
+
+    decision = StreamingEvaluator(STRATEGY).warm_up(bars)
+
+    assert decision == {"entry": bool(expected["entry"][-1]), "exit": bool(expected["exit"][-1])}
@@ -0,0 +1,61 @@
+import pytest
+
+from nlp.nl_to_struct import nl_to_struct
+from nlp.struct_to_ast import struct_to_ast
+from nlp.struct_to_dsl import struct_to_dsl
+from parser.ast_nodes import node_key
+from parser.parser import parse_strategy_text
+
+
+def _op(kind, name, **fields):
+    return dict(type="operand", kind=kind, name=name, **fields)
+
+
+CLOSE = _op("identifier", "close")
+SMA20 = _op("indicator", "sma", args=["close", 20])
+
+STRUCTS = [
+    nl_to_struct("Buy when price closes above the 20-day moving average. Buy when volume is above 1M. "
+                 "Exit when RSI 14 is below 30."),
+    nl_to_struct("Enter when close crosses above the 10-day moving average. "
+                 "Exit when close crosses below the 10-day moving average."),
+    {
+        "entry": [
+            {"type": "comparison", "left": _op("lookback", "high", offset=2), "op": ">=", "right": 1.5},
+            {"type": "cross", "left": _op("indicator", "ema", args=[CLOSE, 12]), "direction": "above",
+             "right": _op("indicator", "MACD_SIGNAL", args=["close", 12, 26, 9])},
+        ],
+        "exit": [
+            {"type": "comparison", "left": _op("indicator", "SMA", args=[SMA20, 5]), "op": "==", "right": "open"},
+            {"type": "comparison", "left": CLOSE, "op": "<", "right": SMA20},
+        ],
+    },
+    {"exit": [{"type": "comparison", "left": _op("indicator", "ATR", args=["high", "low", "close", 14]),
+               "op": "<=", "right": 3}]},
+]
+
+INVALID = [
+    {},
+    {"entry": [{"type": "comparison", "left": CLOSE, "op": "=>", "right": 1}]},
+    {"entry": [{"type": "comparison", "left": _op("indicator", "FOO", args=["close"]), "op": ">", "right": 1}]},
+    {"entry": [{"type": "cross", "left": CLOSE, "direction": "sideways", "right": SMA20}]},
+]
+
+
+@pytest.mark.parametrize("struct", STRUCTS)
+def test_matches_parsed_dsl(struct):
+    direct = struct_to_ast(struct)
+    parsed = parse_strategy_text(struct_to_dsl(struct))
+
+    assert repr(direct) == repr(parsed)
+    assert node_key(direct) == node_key(parsed)
+
+
+@pytest.mark.parametrize("struct", INVALID)
+def test_invalid_structs_raise_syntax_error_like_the_parser(struct):
+
+    with pytest.raises(SyntaxError):
+        parse_strategy_text(struct_to_dsl(struct))
+
+    with pytest.raises(SyntaxError):
+        struct_to_ast(struct)
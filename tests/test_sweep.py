@@ -0,0 +1,42 @@
+import numpy as np
+
+from backtest.simulator import run_backtest
+from backtest.sweep import run_sweep, expand_grid
+from codegen.cache import EvaluatorCache
+from engine import kernels
+from parser.parser import parse_strategy_text
+
+from conftest import make_bars
+
+
+TEMPLATE = """
+ENTRY:
+CROSS(SMA(close, {fast}), "ABOVE", SMA(close, {slow}))
+RSI(close, {rsi}) < 25
+EXIT:
+CROSS(SMA(close, {fast}), "BELOW", SMA(close, {slow}))
+"""
+
+GRID = {"fast": [3, 5, 8, 13], "slow": [20, 30, 50], "rsi": [7, 14]}
+
+
+def test_rsi_family_matches_rsi():
+    close = make_bars(20_000, gaps=True)["close"].to_numpy()
+
+    for period, values in kernels.rsi_family(close, [2, 3, 14]).items():
+        assert np.array_equal(values, kernels.rsi(close, period), equal_nan=True)
+
+
+def test_sweep_matches_single_runs():
+    # Cent-rounded prices make SMA ties common
+    df = make_bars(200_000, seed=1)
+    df["close"] = df["close"].round(2)
+
+    table = run_sweep(TEMPLATE, GRID, df)
+    evaluators = EvaluatorCache()
+
+    for row, params in zip(table.to_dict("records"), expand_grid(GRID)):
+        signals = evaluators.get(parse_strategy_text(TEMPLATE.format(**params)))(df)
+        _, metrics = run_backtest(df, signals["entry"], signals["exit"])
+
+        assert {k: row[k] for k in metrics} == metrics, params
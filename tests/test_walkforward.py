@@ -0,0 +1,74 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from backtest.simulator import run_backtest
+from backtest.walkforward import run_walk_forward, walk_forward_windows
+from codegen.cache import EvaluatorCache
+from parser.parser import parse_strategy_text
+from store.shared_columns import SharedColumns, attach_columns
+
+from conftest import make_bars
+
+
+STRATEGY = parse_strategy_text(
+    'ENTRY:\nclose > SMA(close, 20) AND RSI(close, 14) < 60\nEXIT:\nCROSS(close, "BELOW", SMA(close, 50))'
+)
+
+
+def test_windows():
+    assert walk_forward_windows(10, 4, 2) == [(0, 4, 4, 6), (2, 6, 6, 8), (4, 8, 8, 10)]
+    assert walk_forward_windows(10, 4, 2, anchored=True) == [(0, 4, 4, 6), (0, 6, 6, 8), (0, 8, 8, 10)]
+    assert walk_forward_windows(10, 4, 3, step=5) == [(0, 4, 4, 7)]
+
+
+def test_pool_matches_in_process():
+    bars = make_bars(20_000)
+
+    serial = run_walk_forward(STRATEGY, bars, 2000, 500, workers=1)
+    pooled = run_walk_forward(STRATEGY, bars, 2000, 500, workers=2)
+
+    assert len(serial) == 36
+    pd.testing.assert_frame_equal(serial, pooled)
+
+
+def test_window_matches_backtest_of_its_slice():
+    bars = make_bars(8_000)
+    table = run_walk_forward(STRATEGY, bars, 2000, 1000, workers=1)
+
+    train_start, _, test_start, test_end = walk_forward_windows(len(bars), 2000, 1000)[3]
+    window = bars.iloc[train_start:test_end].reset_index(drop=True)
+    signals = EvaluatorCache().get(STRATEGY)(window)
+
+    test = slice(test_start - train_start, None)
+    _, metrics = run_backtest(window.iloc[test].reset_index(drop=True),
+                              signals["entry"].iloc[test].reset_index(drop=True),
+                              signals["exit"].iloc[test].reset_index(drop=True))
+
+    assert {k: table.loc[3, f"test_{k}"] for k in metrics} == metrics
+
+
+def test_concurrent_in_process_runs_do_not_interfere():
+    a, b = make_bars(6_000, seed=1), make_bars(6_000, seed=2)
+
+    with ThreadPoolExecutor(2) as pool:
+        results = list(pool.map(lambda df: run_walk_forward(STRATEGY, df, 1000, 500, workers=1), [a, b, a, b]))
+
+    pd.testing.assert_frame_equal(results[0], run_walk_forward(STRATEGY, a, 1000, 500, workers=1))
+    pd.testing.assert_frame_equal(results[1], run_walk_forward(STRATEGY, b, 1000, 500, workers=1))
+    pd.testing.assert_frame_equal(results[0], results[2])
+
+
+def test_shared_columns_round_trip():
+    values = np.arange(10, dtype=float)
+
+    with SharedColumns({"x": values}) as shared:
+        blocks, arrays = attach_columns(shared.layout)
+
+        assert np.array_equal(arrays["x"], values)
+        assert not arrays["x"].flags.writeable
+
+        del arrays
+        for block in blocks:
+            block.close()
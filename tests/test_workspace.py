@@ -0,0 +1,56 @@
+import numpy as np
+
+from engine.interpreter import evaluate_ast
+from engine.workspace import Workspace
+from parser.parser import parse_strategy_text
+
+
+RULES = [
+    'CROSS(SMA(close, 5), "ABOVE", EMA(close, 12))',
+    "close[3] < LOWEST(low, 10) AND RSI(close, 14) < 30",
+    "MACD_HIST(close, 6, 13, 4) > 0 OR BB_LOWER(close, 20, 2) > close",
+    "ATR(high, low, close, 7) > 1.5",
+]
+
+
+def strategy(rules):
+    return parse_strategy_text("ENTRY:\n" + "\n".join(rules[:-1]) + "\nEXIT:\n" + rules[-1])
+
+
+def cached_arrays(ws):
+    return {key for key in ws.interpreter.cache if key[0] != "id"}
+
+
+def test_signals_match_interpreter_across_edits(bars):
+    ws = Workspace(bars)
+    rules = list(RULES)
+
+    for period in (20, 30, 20):
+        rules[1] = f"close[3] < LOWEST(low, {period}) AND RSI(close, 14) < 30"
+        edited = strategy(rules)
+        expected = evaluate_ast(edited, bars)
+
+        for name, values in ws.signals(edited).items():
+            assert np.array_equal(values.to_numpy(), expected[name])
+
+    assert (ws.computed, ws.reused) == (0, 4)
+
+
+def test_rule_dependencies_cover_interpreter_cache(bars):
+    ws = Workspace(bars)
+    ws.signals(strategy(RULES))
+
+    assert cached_arrays(ws) == set(ws._refs)
+
+
+def test_edit_session_memory_is_bounded(bars):
+    ws = Workspace(bars, max_rules=4)
+
+    for period in range(2, 60):
+        ws.signals(strategy(RULES[:-1] + [f"SMA(close, {period}) > EMA(close, {period + 1})"]))
+
+        assert len(ws) <= 4
+        assert cached_arrays(ws) == set(ws._refs)
+
+    # Only the arrays of the last four rules are left
+    assert len(cached_arrays(ws)) < 20